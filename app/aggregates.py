@@ -0,0 +1,40 @@
+import numpy as np
+
+# Statistik yang dihitung sekali untuk setiap metrik x Group x tahun
+AGG_STATS = ['mean', 'sum', 'count']
+
+
+def build_group_cube(df, group_col='Group', time_col='year'):
+    """Menghitung kubus agregat (Group, tahun) x (metrik, statistik) dalam satu kali groupby."""
+    metrics = [
+        col for col in df.select_dtypes(include='number').columns
+        if col != time_col
+    ]
+    cube = df.groupby([group_col, time_col], observed=True, sort=True)[metrics].agg(AGG_STATS)
+    return cube
+
+
+def cube_series(cube, metric, stat='mean', groups=None):
+    """Irisan long-format (Group, year, metric) dari kubus, siap dipakai px.line."""
+    series = cube[(metric, stat)]
+    if groups is not None:
+        series = series[series.index.get_level_values(0).isin(groups)]
+    return series.rename(metric).reset_index()
+
+
+def cube_pivot(cube, metric, stat='mean'):
+    """Tabel tahun x Group untuk satu metrik (mis. untuk mencari titik crossover)."""
+    return cube[(metric, stat)].unstack(level=0)
+
+
+def cube_value(cube, group, year, metric, stat='mean', default=np.nan):
+    """Nilai tunggal untuk KPI; `default` jika kombinasi Group/tahun tidak ada."""
+    try:
+        return cube.at[(group, year), (metric, stat)]
+    except KeyError:
+        return default
+
+
+def cube_years(cube):
+    """Daftar tahun yang tersedia di kubus."""
+    return cube.index.get_level_values(-1).unique().sort_values()
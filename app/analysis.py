@@ -0,0 +1,140 @@
+"""Inti analisis tanpa Streamlit: dipakai oleh dashboard, laporan PDF dan CLI batch."""
+from itertools import permutations
+
+import pandas as pd
+
+from aggregates import build_group_cube, cube_pivot, cube_series, cube_value
+from cleaning import (CRITICAL_COLUMNS, END_YEAR, GROUP_REGISTRY, KEY_COLUMNS, START_YEAR,
+                      assign_groups, clean_energy_frame, countries_for)
+from crossover import CrossoverTable
+from forecasting import forecast_many
+from ingest import read_energy_columns
+from tensor_store import TensorStore
+
+GROWTH_METRICS = ['solar_consumption', 'wind_consumption']
+GROWTH_BASE_YEAR = 2012
+GROWTH_COLUMNS = ['country', 'Group', 'Source', 'Growth_TWh']
+
+
+class EmptyDataError(ValueError):
+    """Tidak ada baris tersisa setelah pembersihan (negara/rentang tahun tidak lengkap)."""
+
+
+# --- 1. SELEKSI BLOK/NEGARA ---
+
+def resolve_target(target, registry=None):
+    """Nama blok di registry -> anggotanya; selain itu dianggap satu negara."""
+    registry = GROUP_REGISTRY if registry is None else registry
+    return list(registry[target]) if target in registry else [target]
+
+
+def selection_registry(targets, registry=None):
+    """Registry kecil untuk satu analisis: setiap target (blok atau negara) menjadi satu Group."""
+    return {target: resolve_target(target, registry) for target in targets}
+
+
+# --- 2. DATA ---
+
+def load_clean_data(file_path, groups, registry=None, chunksize=None):
+    """Membaca & membersihkan data untuk kelompok terpilih.
+
+    FileNotFoundError / MissingColumnsError dari ingest diteruskan apa adanya;
+    EmptyDataError jika tidak ada baris yang lolos pembersihan. `chunksize` memaksa
+    ingest streaming (otomatis untuk file besar, lihat ingest.STREAM_THRESHOLD_BYTES).
+    """
+    df = read_energy_columns(file_path, KEY_COLUMNS, countries_for(groups, registry), START_YEAR, END_YEAR,
+                             chunksize=chunksize)
+    df = clean_energy_frame(df, groups, interpolate_cols=['gdp'], dropna_cols=CRITICAL_COLUMNS, registry=registry)
+    if df.empty:
+        raise EmptyDataError(f"no rows left after cleaning for groups {list(groups)} ({START_YEAR}-{END_YEAR})")
+    return df
+
+
+# --- 3. KOMPUTASI ---
+
+def crossover_table(cube, metric='fossil_fuel_consumption', stat='sum', store=None):
+    """Semua persilangan antar Group untuk satu metrik kubus (lihat crossover.py)."""
+    return CrossoverTable.from_pivot(cube_pivot(cube, metric, stat), metric, store)
+
+
+def crossover_year(cube, leader, laggard, metric='fossil_fuel_consumption', stat='sum'):
+    """Tahun pertama `leader` menyalip `laggard` pada suatu metrik; None jika tidak pernah menyalip
+    (termasuk jika `leader` sudah di atas sejak tahun pertama)."""
+    pivot = cube_pivot(cube, metric, stat)
+    if leader not in pivot.columns or laggard not in pivot.columns:
+        return None
+    return CrossoverTable.from_pivot(pivot[[leader, laggard]], metric).first_overtake(leader, laggard)
+
+
+def growth_label(metric):
+    """'solar_consumption' -> 'Solar' (label Source di plot pertumbuhan)."""
+    return metric.replace('_consumption', '').title()
+
+
+def growth_table(df, base_year=GROWTH_BASE_YEAR, end_year=None, metrics=GROWTH_METRICS):
+    """Pertumbuhan absolut per negara antara dua tahun, format long (country, Group, Source, Growth_TWh).
+
+    Dihitung lewat TensorStore.growth_frame, implementasi yang sama dengan plot dashboard; negara
+    tanpa data di salah satu tahun tidak diikutkan.
+    """
+    store = TensorStore.from_frame(df, metrics=list(metrics))
+    end_year = int(store.years[-1]) if end_year is None else end_year
+    try:
+        return store.growth_frame(metrics, base_year, end_year, label=growth_label)
+    except KeyError:
+        # Tahun dasar/akhir di luar rentang data seleksi ini
+        return pd.DataFrame(columns=GROWTH_COLUMNS)
+
+
+def run_analysis(df, targets, registry=None, store=None, max_workers=1):
+    """Analisis lengkap satu seleksi blok/negara: agregat, crossover, pertumbuhan dan proyeksi.
+
+    Mengembalikan dict berisi tabel (DataFrame) dan ringkasan yang bisa di-serialize ke JSON.
+    """
+    selection = selection_registry(targets, registry)
+    groups = list(selection)
+    frame = df[df['country'].isin(countries_for(groups, selection))]
+    frame = frame.assign(Group=assign_groups(frame['country'], groups, selection))
+    if frame.empty:
+        raise EmptyDataError(f"no rows for targets {list(targets)}")
+
+    cube = build_group_cube(frame)
+    latest_year = int(frame['year'].max())
+
+    forecast_df, status_df = forecast_many(
+        cube_series(cube, 'fossil_share_energy', 'mean'), 'fossil_share_energy',
+        order=(1, 1, 0), store=store, max_workers=max_workers,
+    )
+    mapes = status_df.set_index('series_id')['mape']
+
+    table = crossover_table(cube)
+    crossovers = [
+        {'leader': leader, 'laggard': laggard, 'metric': 'fossil_fuel_consumption',
+         'year': table.first_overtake(leader, laggard)}
+        for leader, laggard in permutations(groups, 2)
+    ]
+    summary = {
+        'targets': list(targets),
+        'members': selection,
+        'latest_year': latest_year,
+        'groups': {
+            group: {
+                'fossil_share_energy': float(cube_value(cube, group, latest_year, 'fossil_share_energy')),
+                'fossil_fuel_consumption': float(cube_value(cube, group, latest_year, 'fossil_fuel_consumption', 'sum', default=0.0)),
+                'low_carbon_share_energy': float(cube_value(cube, group, latest_year, 'low_carbon_share_energy')),
+                'forecast_mape': float(mapes.get(group, float('nan'))),
+            }
+            for group in groups
+        },
+        'crossovers': crossovers,
+    }
+
+    group_series = cube.copy()
+    group_series.columns = [f'{metric}_{stat}' for metric, stat in group_series.columns]
+    return {
+        'group_series': group_series.reset_index(),
+        'growth': growth_table(frame),
+        'forecast': forecast_df,
+        'forecast_status': status_df,
+        'summary': summary,
+    }
@@ -0,0 +1,406 @@
+"""API JSON lokal (asyncio, tanpa dependensi tambahan) untuk angka G7 vs BRICS tanpa merender Streamlit.
+
+Memakai logika yang sama dengan app.py (shared_data, aggregates, crossover, forecasting).
+Hasil dihitung sekali per versi dataset; respons di-cache per (versi, endpoint, parameter, format)
+dan membawa ETag/Last-Modified untuk request kondisional (304).
+
+Contoh (dari root repo):
+    python app/api.py --data data/owid-energy-data.csv --port 8765
+
+    GET /api/version
+    GET /api/series?metric=fossil_share_energy&stat=mean&group=G7
+    GET /api/growth?metric=solar_consumption&start=2012&end=2022&by=delta&n=10
+    GET /api/crossovers?leader=BRICS&laggard=G7
+    GET /api/forecast?group=BRICS
+
+Respons JSON di-gzip jika klien mengirim Accept-Encoding: gzip; Arrow IPC (stream) lewat
+?format=arrow atau Accept: application/vnd.apache.arrow.stream.
+"""
+import argparse
+import asyncio
+import email.utils
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlsplit
+
+from aggregates import cube_series, cube_years
+from analysis import GROWTH_BASE_YEAR, GROWTH_METRICS, crossover_table
+from cleaning import END_YEAR
+from forecasting import forecast_many
+from ingest import file_fingerprint
+from lazy_imports import lazy_import
+from model_store import default_store
+from refresh import clean_frame, served_version
+from shared_data import dashboard_cube
+from tensor_store import TensorStore
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MAX_CACHED_RESPONSES = 1024
+# Respons lebih kecil dari ini tidak di-gzip (header gzip lebih mahal dari penghematannya)
+GZIP_MIN_BYTES = 512
+MAX_HEADER_BYTES = 64 * 1024
+KEEPALIVE_TIMEOUT = 15.0
+REFRESH_SECONDS = float(os.environ.get("ENERGY_API_REFRESH", 30))
+
+logger = logging.getLogger("energy.api")
+
+pa = lazy_import("pyarrow", section="core")
+
+STATUS_TEXT = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class BadRequest(ValueError):
+    """Parameter query tidak valid (dijawab 400)."""
+
+
+# --- 1. HASIL PER VERSI DATASET ---
+
+class DatasetResults:
+    """Agregat, pertumbuhan, crossover dan proyeksi untuk satu versi dataset (read-only)."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        # Refresh inkremental (refresh.py) dijalankan di sini jika CSV berubah
+        self.version = served_version(file_path, background=False)
+        self.last_modified = int(os.stat(file_path).st_mtime)
+        df_clean = clean_frame(file_path, self.version)
+        self.cube = dashboard_cube(df_clean, self.version)
+        self.store = TensorStore.from_frame(df_clean)
+        self.crossovers = crossover_table(self.cube, 'fossil_fuel_consumption', 'sum', store=default_store())
+        self.forecast, self.forecast_status = forecast_many(
+            cube_series(self.cube, 'fossil_share_energy', 'mean'), 'fossil_share_energy',
+            order=(1, 1, 0), store=default_store(),
+        )
+        self.groups = [str(group) for group in self.cube.index.get_level_values(0).unique()]
+        self.years = [int(year) for year in cube_years(self.cube)]
+
+    def _group_filter(self, params):
+        groups = [g for g in params.get("group", "").split(",") if g]
+        unknown = sorted(set(groups) - set(self.groups))
+        if unknown:
+            raise BadRequest(f"unknown group(s): {', '.join(unknown)}")
+        return groups or None
+
+    def version_info(self):
+        return {
+            "version": self.version[:16],
+            "last_modified": email.utils.formatdate(self.last_modified, usegmt=True),
+            "groups": self.groups,
+            "years": [self.years[0], self.years[-1]] if self.years else [],
+            "metrics": sorted({metric for metric, _ in self.cube.columns}),
+            "endpoints": sorted(ENDPOINTS),
+        }
+
+    def series(self, params):
+        metric, stat = params.get("metric", "fossil_share_energy"), params.get("stat", "mean")
+        if (metric, stat) not in self.cube.columns:
+            raise BadRequest(f"unknown metric/stat {metric!r}/{stat!r}")
+        frame = cube_series(self.cube, metric, stat, self._group_filter(params))
+        return frame.rename(columns={metric: "value"}).assign(metric=metric, stat=stat)
+
+    def growth(self, params):
+        metric = params.get("metric", GROWTH_METRICS[0])
+        if metric not in self.store.metric_index:
+            raise BadRequest(f"unknown metric {metric!r}")
+        try:
+            start = int(params.get("start", GROWTH_BASE_YEAR))
+            end = int(params.get("end", self.years[-1] if self.years else END_YEAR))
+            n = int(params.get("n", 10))
+            if n < 1:
+                raise BadRequest(f"n must be >= 1, got {n}")
+            if end < start:
+                raise BadRequest(f"end ({end}) must not be before start ({start})")
+            ranking = self.store.top_n(metric, start, end, n=n, by=params.get("by", "delta"))
+        except KeyError as exc:
+            raise BadRequest(str(exc.args[0])) from None
+        except ValueError as exc:
+            raise BadRequest(str(exc)) from None
+        groups = dict(zip(self.store.entities, self.store.groups)) if self.store.groups is not None else {}
+        return ranking.assign(Group=ranking["entity"].map(groups), metric=metric, start=start, end=end)
+
+    def crossovers_frame(self, params):
+        leader, laggard = params.get("leader") or None, params.get("laggard") or None
+        unknown = sorted({entity for entity in (leader, laggard) if entity is not None} - set(self.groups))
+        if unknown:
+            raise BadRequest(f"unknown entity(s): {', '.join(unknown)}")
+        events = self.crossovers.overtakes(leader, laggard)
+        return events.assign(metric=self.crossovers.metric)
+
+    def forecast_frame(self, params):
+        groups = self._group_filter(params)
+        forecast = self.forecast if groups is None else self.forecast[self.forecast["series_id"].isin(groups)]
+        kinds = [k for k in params.get("kind", "").split(",") if k]
+        if kinds:
+            forecast = forecast[forecast["kind"].isin(kinds)]
+        mape = self.forecast_status.set_index("series_id")["mape"]
+        return forecast.rename(columns={"series_id": "Group"}).assign(mape=lambda f: f["Group"].map(mape))
+
+
+ENDPOINTS = {
+    "/api/series": DatasetResults.series,
+    "/api/growth": DatasetResults.growth,
+    "/api/crossovers": DatasetResults.crossovers_frame,
+    "/api/forecast": DatasetResults.forecast_frame,
+}
+
+
+# --- 2. SERIALISASI & CACHE RESPONS ---
+
+def _json_body(results, path, params, frame):
+    meta = json.dumps({"version": results.version[:16], "endpoint": path, "params": params})
+    return f'{meta[:-1]}, "rows": {frame.to_json(orient="records", date_format="iso")}}}'.encode()
+
+
+def _arrow_body(results, path, frame):
+    table = pa.Table.from_pandas(frame.reset_index(drop=True), preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                           b"version": results.version[:16].encode(), b"endpoint": path.encode()})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def render_body(results, handler, path, params, fmt, use_gzip):
+    """(body, encoding) untuk satu cache miss; dijalankan di thread executor, bukan event loop."""
+    if handler is None:
+        body = json.dumps(results.version_info()).encode()
+    else:
+        frame = handler(results, params)
+        body = _arrow_body(results, path, frame) if fmt == "arrow" else _json_body(results, path, params, frame)
+    if use_gzip and len(body) >= GZIP_MIN_BYTES:
+        return gzip.compress(body, compresslevel=6), "gzip"
+    return body, None
+
+
+def etag_for(version, path, params, fmt):
+    digest = hashlib.sha1(json.dumps([version, path, sorted(params.items()), fmt]).encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+class ResponseCache:
+    """LRU respons siap kirim: (body, encoding) per ETag."""
+
+    def __init__(self, max_entries=MAX_CACHED_RESPONSES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+# --- 3. SERVER ---
+
+def _not_modified(headers, etag, last_modified):
+    """`etag` = ETag representasi yang akan dikirim (varian gzip punya ETag sendiri)."""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return email.utils.parsedate_to_datetime(if_modified_since).timestamp() >= last_modified
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class ApiServer:
+    """Server HTTP/1.1 minimal di atas asyncio: GET/HEAD, keep-alive, satu koroutin per koneksi."""
+
+    def __init__(self, file_path, refresh_seconds=REFRESH_SECONDS):
+        self.file_path = file_path
+        self.refresh_seconds = refresh_seconds
+        self.results = None
+        self.cache = ResponseCache()
+        self.requests = 0
+
+    async def load(self):
+        """Hitung hasil versi terbaru di thread terpisah; versi lama tetap dilayani sampai selesai."""
+        results = await asyncio.get_running_loop().run_in_executor(None, DatasetResults, self.file_path)
+        if self.results is None or results.version != self.results.version:
+            # Pergantian referensi bersifat atomik bagi koroutin lain
+            self.results = results
+            self.cache.clear()
+            logger.info("serving dataset version %s", results.version[:16])
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                version = await asyncio.get_running_loop().run_in_executor(None, file_fingerprint, self.file_path)
+                if self.results is None or version != self.results.version:
+                    await self.load()
+            except Exception:
+                # Loop refresh tidak boleh mati: versi lama tetap dilayani, dicoba lagi di putaran berikutnya
+                logger.exception("refresh failed, keeping version %s",
+                                 self.results.version[:16] if self.results else None)
+
+    async def respond(self, method, target, headers):
+        """(status, header tambahan, body) untuk satu request.
+
+        Cache hit dan 304 dijawab langsung di event loop; cache miss (frame, serialisasi, gzip)
+        dihitung di thread executor agar koneksi lain tetap dilayani.
+        """
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+        results = self.results
+        if results is None:
+            return 503, {"Retry-After": "5"}, b'{"error": "dataset not loaded"}'
+
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        fmt = params.pop("format", None) or ("arrow" if ARROW_MEDIA_TYPE in headers.get("accept", "") else "json")
+        if url.path == "/api/version":
+            handler = None
+        elif url.path in ENDPOINTS:
+            handler = ENDPOINTS[url.path]
+        else:
+            return 404, {}, json.dumps({"error": f"unknown endpoint {url.path}"}).encode()
+        if fmt not in ("json", "arrow"):
+            return 400, {}, json.dumps({"error": f"unknown format {fmt!r}"}).encode()
+
+        etag = etag_for(results.version, url.path, params, fmt)
+        use_gzip = fmt == "json" and "gzip" in headers.get("accept-encoding", "")
+        common = {
+            "ETag": f'{etag[:-1]}-gz"' if use_gzip else etag,
+            "Last-Modified": email.utils.formatdate(results.last_modified, usegmt=True),
+            "Cache-Control": "no-cache",
+            "Vary": "Accept, Accept-Encoding",
+        }
+        if _not_modified(headers, common["ETag"], results.last_modified):
+            return 304, common, b""
+
+        key = (etag, use_gzip)
+        entry = self.cache.get(key)
+        if entry is None:
+            try:
+                entry = await asyncio.get_running_loop().run_in_executor(
+                    None, render_body, results, handler, url.path, params, fmt, use_gzip)
+            except BadRequest as exc:
+                return 400, {}, json.dumps({"error": str(exc)}).encode()
+            self.cache.put(key, entry)
+
+        body, encoding = entry
+        extra = {**common, "Content-Type": ARROW_MEDIA_TYPE if fmt == "arrow" else "application/json"}
+        if encoding:
+            extra["Content-Encoding"] = encoding
+        return 200, extra, body
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._send(writer, 400, {}, b"", "GET", keep_alive=False)
+                    break
+
+                headers, size = {}, 0
+                while True:
+                    line = await reader.readline()
+                    size += len(line)
+                    if line in (b"\r\n", b"\n", b"") or size > MAX_HEADER_BYTES:
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                self.requests += 1
+                try:
+                    status, extra, body = await self.respond(method, target, headers)
+                except Exception:
+                    logger.exception("unhandled error for %s %s", method, target)
+                    status, extra, body = 500, {}, b'{"error": "internal server error"}'
+                await self._send(writer, status, extra, body, method, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send(self, writer, status, extra, body, method, keep_alive):
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}"]
+        if status >= 400 and "Content-Type" not in extra:
+            extra = {**extra, "Content-Type": "application/json"}
+        for name, value in extra.items():
+            lines.append(f"{name}: {value}")
+        lines.append(f"Content-Length: {len(body) if status != 304 else 0}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if method != "HEAD" and status != 304:
+            writer.write(body)
+        await writer.drain()
+
+    async def serve(self, host="127.0.0.1", port=8765, ready=None):
+        await self.load()
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER_BYTES)
+        refresh = asyncio.create_task(self._refresh_loop()) if self.refresh_seconds > 0 else None
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if refresh is not None:
+                refresh.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="data/owid-energy-data.csv")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--refresh", type=float, default=REFRESH_SECONDS,
+                        help="detik antar pengecekan versi dataset (0 = nonaktif)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+
+    start = time.perf_counter()
+
+    def ready(server):
+        addresses = ", ".join(f"http://{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+        logger.info("ready in %.1fs on %s", time.perf_counter() - start, addresses)
+
+    try:
+        asyncio.run(ApiServer(args.data, args.refresh).serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
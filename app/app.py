@@ -1,18 +1,26 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.io as pio
-from statsmodels.tsa.arima.model import ARIMA
+import os
+import time
 import warnings
 
+from aggregates import cube_series, cube_value
+from analysis import GROWTH_BASE_YEAR, EmptyDataError, crossover_table
+from chart_payload import optimize_figure, payload_report
+from cleaning import END_YEAR
+from figures import FIGURE_BUILDERS
+from forecasting import forecast_many
+from ingest import MissingColumnsError
+from lazy_imports import import_section
+from model_store import default_store
+from moments import CORR_METRICS, YearMoments
+import perf
+from refresh import clean_frame, refresh_status, served_version
+from shared_data import dashboard_cube
+from tensor_store import TensorStore
+
 # Abaikan peringatan konvergensi model ARIMA saat runtime Streamlit
 warnings.filterwarnings('ignore')
 
-# Set Plotly template for professional look
-pio.templates.default = "plotly_white"
-
 # Dictionary for Indonesian Texts
 ID_TEXTS = {
     # General & Layout
@@ -32,6 +40,12 @@ ID_TEXTS = {
     "SIDEBAR_TOOLS_FOCUS": "Fokus: Time Series Analysis, Data Storytelling",
     "SIDEBAR_TOOLS_DATA": "Data: OWID Energy Data (2000-2022)",
     "SIDEBAR_CONTACT_CAPTION": "Kontak & Profil",
+    "SIDEBAR_PERF_TOGGLE": "⏱️ Panel Performa",
+    "SIDEBAR_PERF_HELP": "Instrumentasi aktif untuk seluruh server jika dijalankan dengan ENERGY_PERF=1; toggle ini hanya menampilkan panel di sesi Anda.",
+    "INFO_REFRESH_IN_PROGRESS": "🔄 Data baru terdeteksi dan sedang diproses; dashboard memakai versi sebelumnya sampai selesai.",
+    "WARNING_REFRESH_FAILED": "⚠️ Data baru gagal diproses ({error}); dashboard tetap memakai versi sebelumnya. Proses diulang otomatis saat file berubah lagi.",
+    "PERF_PANEL_TITLE": "⏱️ Performa per Tahap",
+    "PERF_PANEL_CAPTION": "Waktu, puncak memori seluruh proses (tracemalloc) dan cache hit per tahap sejak server dimulai. Kolom overlapped: pengukuran yang berjalan bersamaan dengan sesi lain, sehingga puncak memorinya ikut menghitung alokasi sesi tersebut.",
 
     # Executive Summary
     "EXEC_TITLE": "Ringkasan Eksekutif: Pergeseran Kekuatan Energi",
@@ -43,6 +57,7 @@ ID_TEXTS = {
     "EXEC_DELTA_3": "Akselerasi Kuat",
     "EXEC_CAPTION_1": "G7 memiliki pangsa fosil rata-rata yang lebih rendah.",
     "EXEC_CAPTION_2": "BRICS telah melampaui G7 dalam total konsumsi fosil sekitar tahun **{}**.",
+    "EXEC_CAPTION_2_NO_CROSSOVER": "Tidak ada titik crossover BRICS melampaui G7 dalam total konsumsi fosil pada rentang data.",
     "EXEC_CAPTION_3": "BRICS mendominasi pertumbuhan kapasitas EBT baru.",
 
     # Deep Dive
@@ -55,9 +70,11 @@ ID_TEXTS = {
     # Plot 2: Fossil Absolute Trend
     "PLOT_2_HEADER": "2. Total Konsumsi Energi Fosil (TWh): BRICS Melampaui G7",
     "PLOT_2_INSIGHT": "Insight: BRICS telah meningkatkan **volume absolut** konsumsi fosil secara masif, **melampaui G7 sekitar tahun {}** untuk mendukung industrialisasi.",
+    "PLOT_2_INSIGHT_NO_CROSSOVER": "Insight: Pada rentang data ini tidak terdeteksi tahun ketika BRICS menyalip G7 dalam **volume absolut** konsumsi fosil.",
 
     # Plot 3: Renewable Growth
-    "PLOT_3_HEADER": "3. Pertumbuhan Absolut Energi Surya & Angin (2012-2022)",
+    "PLOT_3_HEADER": "3. Pertumbuhan Absolut Energi Surya & Angin ({start}-{end})",
+    "PLOT_3_SLIDER": "Rentang tahun",
     "PLOT_3_INSIGHT": "Insight: **China (BRICS)** adalah mesin pertumbuhan energi terbarukan absolut, jauh melampaui negara-negara G7.",
 
     # Plot 4: Energy Efficiency
@@ -80,7 +97,13 @@ ID_TEXTS = {
     "PLOT_6_NARRATIVE_2": "Proyeksi Jangka Panjang: Model memprediksi **penurunan Pangsa Fosil G7 berlanjut hingga 2030**, sementara BRICS menunjukkan **penurunan yang lebih landai** atau stabil, menyoroti tantangan besar dalam mencapai target dekarbonisasi global.",
     
     # NEW SECTION: Theoretical Grounding
-    "THEORY_TITLE": "7. Pengembangan Teori: Sintesis dari Perspektif Internasional",
+    "PLOT_7_HEADER": "7. Korelasi Variabel Kunci Transisi Energi ({start}-{end})",
+    "PLOT_7_SCOPE": "Cakupan",
+    "PLOT_7_SCOPE_ALL": "Semua",
+    "PLOT_7_SLIDER": "Rentang tahun",
+    "PLOT_7_INSIGHT": "Insight: Korelasi positif kuat antara **Konsumsi Fosil Absolut** dan **GDP/Populasi** menunjukkan besarnya permintaan energi yang didorong pertumbuhan ekonomi; pangsa fosil dan pangsa rendah karbon berkorelasi negatif kuat.",
+
+    "THEORY_TITLE": "8. Pengembangan Teori: Sintesis dari Perspektif Internasional",
     "THEORY_SUBTITLE": "Hasil analisis ini sejalan dengan tiga narasi utama dalam literatur transisi energi global:",
     
     "THEORY_POINT_1_TITLE": "1. Dekopling (Decoupling) dan Efisiensi",
@@ -112,6 +135,12 @@ EN_TEXTS = {
     "SIDEBAR_TOOLS_FOCUS": "Focus: Time Series Analysis, Data Storytelling",
     "SIDEBAR_TOOLS_DATA": "Data: OWID Energy Data (2000-2022)",
     "SIDEBAR_CONTACT_CAPTION": "Contact & Profiles",
+    "SIDEBAR_PERF_TOGGLE": "⏱️ Performance Panel",
+    "SIDEBAR_PERF_HELP": "Instrumentation is enabled for the whole server by starting it with ENERGY_PERF=1; this toggle only shows the panel in your session.",
+    "INFO_REFRESH_IN_PROGRESS": "🔄 New data detected and being processed; the dashboard uses the previous version until it is ready.",
+    "WARNING_REFRESH_FAILED": "⚠️ The new data could not be processed ({error}); the dashboard keeps using the previous version. It is retried automatically when the file changes again.",
+    "PERF_PANEL_TITLE": "⏱️ Performance by Stage",
+    "PERF_PANEL_CAPTION": "Wall time, process-wide peak memory (tracemalloc) and cache hits per stage since the server started. overlapped column: measurements that ran concurrently with other sessions, so their peak memory includes those sessions' allocations.",
 
     # Executive Summary
     "EXEC_TITLE": "Executive Summary: Shifting Energy Power",
@@ -123,6 +152,7 @@ EN_TEXTS = {
     "EXEC_DELTA_3": "Strong Acceleration",
     "EXEC_CAPTION_1": "G7 has a lower average fossil fuel share.",
     "EXEC_CAPTION_2": "BRICS surpassed G7 in total fossil fuel consumption around the year **{}**.",
+    "EXEC_CAPTION_2_NO_CROSSOVER": "No crossover of BRICS overtaking G7 in total fossil fuel consumption within the data range.",
     "EXEC_CAPTION_3": "BRICS dominates new renewable energy capacity growth.",
 
     # Deep Dive
@@ -135,9 +165,11 @@ EN_TEXTS = {
     # Plot 2: Fossil Absolute Trend
     "PLOT_2_HEADER": "2. Total Fossil Energy Consumption (TWh): BRICS Surpasses G7",
     "PLOT_2_INSIGHT": "Insight: BRICS has massively increased the **absolute volume** of fossil consumption, **surpassing G7 around {}** to support industrialization.",
+    "PLOT_2_INSIGHT_NO_CROSSOVER": "Insight: No year in this data range where BRICS overtakes G7 in the **absolute volume** of fossil consumption was detected.",
 
     # Plot 3: Renewable Growth
-    "PLOT_3_HEADER": "3. Absolute Growth of Solar & Wind Energy (2012-2022)",
+    "PLOT_3_HEADER": "3. Absolute Growth of Solar & Wind Energy ({start}-{end})",
+    "PLOT_3_SLIDER": "Year range",
     "PLOT_3_INSIGHT": "Insight: **China (BRICS)** is the engine of absolute renewable energy growth, significantly outpacing G7 nations.",
 
     # Plot 4: Energy Efficiency
@@ -160,7 +192,13 @@ EN_TEXTS = {
     "PLOT_6_NARRATIVE_2": "Long-Term Projection: The model predicts **G7's Fossil Share decline continues until 2030**, while BRICS shows a **flatter** or stable decline, highlighting the significant challenge in meeting global decarbonization targets.",
     
     # NEW SECTION: Theoretical Grounding
-    "THEORY_TITLE": "7. Theory Development: A Synthesis from an International Perspective",
+    "PLOT_7_HEADER": "7. Correlation between Key Energy Transition Variables ({start}-{end})",
+    "PLOT_7_SCOPE": "Scope",
+    "PLOT_7_SCOPE_ALL": "All",
+    "PLOT_7_SLIDER": "Year range",
+    "PLOT_7_INSIGHT": "Insight: The strong positive correlation between **Absolute Fossil Consumption** and **GDP/Population** highlights the energy demand driven by economic growth; fossil share and low-carbon share show the expected strong negative correlation.",
+
+    "THEORY_TITLE": "8. Theory Development: A Synthesis from an International Perspective",
     "THEORY_SUBTITLE": "This analysis aligns with three major narratives in global energy transition literature:",
 
     "THEORY_POINT_1_TITLE": "1. Decoupling and Efficiency",
@@ -183,154 +221,134 @@ def get_texts(lang_choice):
 
 # --- 1. DATA LOADING AND CLEANING FUNCTIONS ---
 
-@st.cache_data
-def load_and_clean_data(file_path, texts):
-    """Memuat, membersihkan, dan menyiapkan data untuk analisis G7 vs BRICS."""
-    
-    # 1. Definisi Parameter (TETAP)
-    g7_countries = ['United States', 'Canada', 'Germany', 'United Kingdom', 'France', 'Italy', 'Japan']
-    brics_countries = ['Brazil', 'Russia', 'India', 'China', 'South Africa']
-    target_countries = g7_countries + brics_countries
-    start_year = 2000
-    end_year = 2022
-    
-    key_columns = [
-        'country', 'year', 'gdp', 'population', 
-        'fossil_share_energy', 'low_carbon_share_energy', 
-        'solar_consumption', 'wind_consumption', 
-        'energy_per_gdp', 'fossil_fuel_consumption',
-        'renewables_consumption'
-    ]
+@st.cache_resource(max_entries=4)
+def load_and_clean_data(dataset_version, file_path):
+    """Memuat, membersihkan, dan menyiapkan data untuk analisis G7 vs BRICS.
 
-    try:
-        df = pd.read_csv(file_path)
-    except FileNotFoundError:
-        st.error(texts["ERROR_FILE_NOT_FOUND"].format(file_path=file_path))
-        return None, end_year 
-
-    # 2. Filter Negara Target dan Tahun
-    df_filtered = df[
-        (df['country'].isin(target_countries)) & 
-        (df['year'] >= start_year) & 
-        (df['year'] <= end_year)
-    ].copy()
-
-    # Cek ketersediaan kolom
-    missing_cols = [col for col in key_columns if col not in df_filtered.columns]
-    if missing_cols:
-        st.error(texts["ERROR_COLUMNS"].format(missing_cols=', '.join(missing_cols)))
-        return None, end_year
-
-    # 3. Seleksi Kolom Kunci & Interpolasi
-    df_clean = df_filtered[key_columns].copy()
-    df_clean['gdp'] = df_clean.groupby('country')['gdp'].transform(lambda x: x.interpolate(method='linear'))
-
-    # 4. Membuat Kolom Kelompok Negara
-    def assign_group(country):
-        return 'G7' if country in g7_countries else 'BRICS'
-    df_clean['Group'] = df_clean['country'].apply(assign_group)
-
-    # 5. Membuang sisa NaN pada kolom utama
-    subset_cols = ['gdp', 'fossil_share_energy', 'low_carbon_share_energy', 'energy_per_gdp', 'fossil_fuel_consumption']
-    df_clean.dropna(subset=subset_cols, inplace=True)
-    
-    if df_clean.empty:
-        st.error(texts["WARNING_CLEAN_DATA"])
-        return None, end_year
-        
-    return df_clean, end_year
+    Logika ada di analysis.py (tanpa Streamlit); error dilempar dan ditampilkan oleh main().
+    Frame dibaca dari lapisan Arrow ter-mmap (shared_data.py): read-only dan dibagi tanpa
+    salinan oleh semua sesi di proses ini maupun replika lain di host yang sama. Versi
+    ditentukan refresh.py, yang hanya membersihkan ulang negara yang berubah.
+    """
+    perf.note_cache_miss()
+    return clean_frame(file_path, dataset_version), END_YEAR
+
+
+@st.cache_resource(max_entries=4)
+def load_group_cube(dataset_version, _df_clean):
+    """Kubus agregat Group x tahun, dihitung sekali per versi dataset (per host)."""
+    perf.note_cache_miss()
+    return dashboard_cube(_df_clean, dataset_version)
+
+
+@st.cache_resource(max_entries=4)
+def load_fossil_share_forecast(dataset_version, _cube):
+    """Validasi & proyeksi ARIMA pangsa fosil per Group, dihitung sekali per versi dataset.
+
+    Frame hasil hanya dibaca (figure builder & metrik MAPE), jadi dibagi semua sesi tanpa salinan.
+    """
+    perf.note_cache_miss()
+    return forecast_many(
+        cube_series(_cube, 'fossil_share_energy', 'mean'), 'fossil_share_energy',
+        order=(1, 1, 0), store=default_store(),
+    )
+
+
+@st.cache_resource(max_entries=4)
+def load_crossovers(dataset_version, _cube):
+    """Semua persilangan antar Group pada total konsumsi fosil, dihitung sekali per versi dataset."""
+    perf.note_cache_miss()
+    return crossover_table(_cube, 'fossil_fuel_consumption', 'sum', store=default_store())
+
+
+@st.cache_resource(max_entries=4)
+def load_tensor_store(dataset_version, _df_clean):
+    """Tensor negara x tahun x metrik (read-only, dibagi semua sesi) untuk query jendela waktu."""
+    perf.note_cache_miss()
+    return TensorStore.from_frame(_df_clean)
+
+
+@st.cache_resource(max_entries=4)
+def load_correlation_moments(dataset_version, _store):
+    """Momen kumulatif per tahun & Group untuk heatmap korelasi; rentang tahun/blok dijawab tanpa corr() ulang."""
+    perf.note_cache_miss()
+    return YearMoments.from_store(_store, CORR_METRICS)
 
 # --- 2. VISUALIZATION FUNCTIONS ---
 
-def plot_fossil_share_trend(df, texts):
+@st.cache_resource(max_entries=64)
+def get_figure(view, dataset_version, _data, *params):
+    """Figure Plotly yang di-cache per (view, versi dataset, parameter view); tidak bergantung bahasa.
+
+    Figure dikompakkan (LTTB, float32, Scattergl di atas ambang titik) sebelum di-cache;
+    laporan ukuran payload ikut dikembalikan.
+    """
+    perf.note_cache_miss()
+    start = time.perf_counter()
+    fig = optimize_figure(FIGURE_BUILDERS[view](_data, *params))
+    return fig, payload_report(fig, time.perf_counter() - start)
+
+
+def show_chart(view, dataset_version, data, *params):
+    """Render figure dari cache dan catat ukuran payload-nya untuk panel 'Chart Payload'."""
+    with perf.stage(f"figure:{view}", cached=True):
+        fig, report = get_figure(view, dataset_version, data, *params)
+    st.session_state.setdefault('chart_payloads', {})[view] = report
+    with perf.stage(f"render:{view}"):
+        st.plotly_chart(fig, use_container_width=True)
+
+# Setiap section dirender di fragment sendiri: interaksi di dalam satu section hanya
+# menjalankan ulang section tersebut, dan figure diambil dari cache.
+
+@st.fragment
+def plot_fossil_share_trend(cube, dataset_version, texts):
     """Plot 1: Tren Pangsa Fosil (Persentase)"""
     st.header(texts["PLOT_1_HEADER"])
-    df_group_trend = df.groupby(['Group', 'year'])['fossil_share_energy'].mean().reset_index()
-    # Plotly titles and labels remain English for clarity in the visual component
-    fig = px.line(df_group_trend, x='year', y='fossil_share_energy', color='Group', labels={'fossil_share_energy': 'Fossil Share (%)', 'year': 'Year'}, markers=True, color_discrete_map={'G7': '#347C98', 'BRICS': '#E36414'})
-    fig.update_layout(title_text="Average Fossil Energy Share Trend (2000-2022)", title_x=0.5, yaxis_title="Fossil Share (%)")
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart('fossil_share_trend', dataset_version, cube)
     st.markdown(texts["PLOT_1_INSIGHT"])
     st.markdown("---")
 
-def plot_fossil_absolute_trend(df, latest_year, crossover_year, texts):
+@st.fragment
+def plot_fossil_absolute_trend(cube, dataset_version, crossover_year, texts):
     """Plot 2: Konsumsi Fosil Absolut (TWh) - Executive Grade"""
     st.header(texts["PLOT_2_HEADER"])
-    df_fossil_absolute_trend = df.groupby(['Group', 'year'])['fossil_fuel_consumption'].sum().reset_index()
-    # Plotly titles and labels remain English
-    fig = px.line(df_fossil_absolute_trend, x='year', y='fossil_fuel_consumption', color='Group', labels={'fossil_fuel_consumption': 'Total Fossil Consumption (TWh)', 'year': 'Year'}, markers=True, line_shape='spline', color_discrete_map={'G7': '#347C98', 'BRICS': '#E36414'})
-    if crossover_year and crossover_year > df['year'].min():
-        fig.add_vline(x=crossover_year, line_dash="dash", line_color="#7A7A7A", annotation_text=f"Crossover ({int(crossover_year)})", annotation_position="top left", annotation_font_color="#7A7A7A")
-    fig.update_layout(title_text="Total Fossil Energy Consumption (TWh)", title_x=0.5, yaxis_tickformat=',.2s', hovermode="x unified")
-    st.plotly_chart(fig, use_container_width=True)
-    st.markdown(texts["PLOT_2_INSIGHT"].format(int(crossover_year)))
+    show_chart('fossil_absolute_trend', dataset_version, cube, crossover_year)
+    if crossover_year is None:
+        st.markdown(texts["PLOT_2_INSIGHT_NO_CROSSOVER"])
+    else:
+        st.markdown(texts["PLOT_2_INSIGHT"].format(int(crossover_year)))
     st.markdown("---")
 
 
-def plot_renewable_growth(df, texts):
+@st.fragment
+def plot_renewable_growth(store, dataset_version, texts):
     """Plot 3: Pertumbuhan Energi Terbarukan Absolut (Solar & Wind)"""
-    st.header(texts["PLOT_3_HEADER"])
-    df_growth = df[(df['year'] == 2012) | (df['year'] == df['year'].max())].copy()
-    df_pivot = df_growth.pivot_table(index=['country', 'Group'], columns='year', values=['solar_consumption', 'wind_consumption']).reset_index()
-    
-    # Perbaikan Syntax (Handling multi-level columns after pivot)
-    df_pivot.columns = ['_'.join(map(str, col)).strip('_') if col[1] != '' else col[0] for col in df_pivot.columns.values]
-    
-    latest_year = df['year'].max()
-    df_pivot['Solar_Growth_TWh'] = df_pivot[f'solar_consumption_{latest_year}'] - df_pivot['solar_consumption_2012']
-    df_pivot['Wind_Growth_TWh'] = df_pivot[f'wind_consumption_{latest_year}'] - df_pivot['wind_consumption_2012']
-    
-    df_growth_melt = df_pivot.melt(id_vars=['country', 'Group'], value_vars=['Solar_Growth_TWh', 'Wind_Growth_TWh'], var_name='Source', value_name='Growth_TWh')
-    df_growth_melt['Source'] = df_growth_melt['Source'].str.replace('_Growth_TWh', '')
-
-    # Plotly titles and labels remain English
-    fig = px.bar(
-        df_growth_melt.sort_values(['Growth_TWh'], ascending=False),
-        x='country',
-        y='Growth_TWh',
-        color='Source',
-        facet_col='Source',
-        facet_col_wrap=2,
-        labels={'Growth_TWh': 'Consumption Growth (TWh)', 'country': 'Country'},
-        text_auto='.3s',
-        color_discrete_map={'Solar': '#FFC300', 'Wind': '#4CAF50'}
+    first_year, last_year = int(store.years[0]), int(store.years[-1])
+    header = st.empty()
+    # Slider hanya menjalankan ulang fragment ini; selisih dihitung lewat indexing tensor
+    start_year, end_year = st.slider(
+        texts["PLOT_3_SLIDER"], min_value=first_year, max_value=last_year,
+        value=(max(first_year, min(GROWTH_BASE_YEAR, last_year)), last_year), key='growth_years',
     )
-    fig.update_layout(title_text="Absolute Growth of Solar and Wind Energy (2012-2022)", title_x=0.5, yaxis_title="Growth (TWh)")
-    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
-    st.plotly_chart(fig, use_container_width=True)
+    header.header(texts["PLOT_3_HEADER"].format(start=start_year, end=end_year))
+    show_chart('renewable_growth', dataset_version, store, start_year, end_year)
     st.markdown(texts["PLOT_3_INSIGHT"])
     st.markdown("---")
 
 
-def plot_energy_efficiency(df, texts):
+@st.fragment
+def plot_energy_efficiency(cube, dataset_version, texts):
     """Plot 4: Efisiensi Energi (Energy per GDP)"""
     st.header(texts["PLOT_4_HEADER"])
-    df_efficiency_trend = df.groupby(['Group', 'year'])['energy_per_gdp'].mean().reset_index()
-    # Plotly titles and labels remain English
-    fig = px.line(df_efficiency_trend, x='year', y='energy_per_gdp', color='Group', labels={'energy_per_gdp': 'Energy per GDP (koe/$) - Lower is More Efficient', 'year': 'Year'}, markers=True, color_discrete_map={'G7': '#347C98', 'BRICS': '#E36414'})
-    fig.update_layout(title_text="Energy Intensity Trend (Energy per GDP)", title_x=0.5, yaxis_title="Energy Intensity (koe/$)")
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart('energy_efficiency', dataset_version, cube)
     st.markdown(texts["PLOT_4_INSIGHT"])
     st.markdown("---")
 
-def plot_low_carbon_share(df, texts):
+@st.fragment
+def plot_low_carbon_share(cube, dataset_version, texts):
     """Plot 5: Pangsa Energi Rendah Karbon (The Sustainability Test)"""
     st.header(texts["PLOT_5_HEADER"])
-    df_low_carbon = df.groupby(['Group', 'year'])['low_carbon_share_energy'].mean().reset_index()
-    
-    # Plotly titles and labels remain English
-    fig = px.line(
-        df_low_carbon,
-        x='year',
-        y='low_carbon_share_energy',
-        color='Group',
-        title='Low Carbon Energy Share (%)',
-        labels={'low_carbon_share_energy': 'Low Carbon Energy Share (%)', 'year': 'Year'},
-        markers=True,
-        color_discrete_map={'G7': '#347C98', 'BRICS': '#E36414'}
-    )
-    fig.update_layout(title_x=0.5, yaxis_title="Low Carbon Share (%)", yaxis_range=[0, df_low_carbon['low_carbon_share_energy'].max() * 1.1])
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart('low_carbon_share', dataset_version, cube)
 
     st.markdown(texts["PLOT_5_INSIGHT_1"])
     st.markdown(texts["PLOT_5_INSIGHT_2"])
@@ -338,91 +356,24 @@ def plot_low_carbon_share(df, texts):
     st.markdown("---")
 
 
-def plot_fossil_share_forecast_arima(df, texts):
+@st.fragment
+def plot_fossil_share_forecast_arima(cube, dataset_version, texts):
     """Plot 6: Prediksi Pangsa Fosil Rata-rata (Menggunakan Model ARIMA) hingga 2030."""
     
     st.header(texts["PLOT_6_HEADER"])
     
-    df_fossil_share = df.groupby(['Group', 'year'])['fossil_share_energy'].mean().reset_index()
-    
-    test_size = 3
-    
-    ts_g7_train = df_fossil_share[df_fossil_share['Group'] == 'G7'].set_index('year')['fossil_share_energy'][:-test_size]
-    ts_g7_test = df_fossil_share[df_fossil_share['Group'] == 'G7'].set_index('year')['fossil_share_energy'][-test_size:]
-    
-    ts_brics_train = df_fossil_share[df_fossil_share['Group'] == 'BRICS'].set_index('year')['fossil_share_energy'][:-test_size]
-    ts_brics_test = df_fossil_share[df_fossil_share['Group'] == 'BRICS'].set_index('year')['fossil_share_energy'][-test_size:]
-    
-    forecast_periods = 8 
+    # Model sudah dilatih oleh forecasting engine; section ini hanya membaca hasilnya
+    with perf.stage("forecast", cached=True):
+        forecast_df, status_df = load_fossil_share_forecast(dataset_version, cube)
 
-    mape_g7, mape_brics = 999, 999
-    
-    try:
-        # G7
-        model_g7 = ARIMA(ts_g7_train, order=(1, 1, 0)).fit()
-        g7_pred_test = model_g7.predict(start=ts_g7_test.index.min(), end=ts_g7_test.index.max())
-        forecast_g7 = model_g7.predict(start=ts_g7_train.index.max() + 1, end=ts_g7_train.index.max() + forecast_periods)
-        mape_g7 = mean_absolute_percentage_error(ts_g7_test, g7_pred_test) * 100
-
-        # BRICS
-        model_brics = ARIMA(ts_brics_train, order=(1, 1, 0)).fit()
-        brics_pred_test = model_brics.predict(start=ts_brics_test.index.min(), end=ts_brics_test.index.max())
-        forecast_brics = model_brics.predict(start=ts_brics_train.index.max() + 1, end=ts_brics_train.index.max() + forecast_periods)
-        mape_brics = mean_absolute_percentage_error(ts_brics_test, brics_pred_test) * 100
-
-    except Exception as e:
-        st.warning(texts["PLOT_6_WARNING_ARIMA"].format(e=e))
-        forecast_g7 = pd.Series([ts_g7_train.iloc[-1]] * forecast_periods, index=range(ts_g7_train.index.max() + 1, ts_g7_train.index.max() + forecast_periods + 1))
-        forecast_brics = pd.Series([ts_brics_train.iloc[-1]] * forecast_periods, index=range(ts_brics_train.index.max() + 1, ts_brics_train.index.max() + forecast_periods + 1))
-
-
-    # Gabungkan data untuk visualisasi
-    df_g7_plot = pd.concat([ts_g7_train, ts_g7_test, forecast_g7]).rename('G7').to_frame().reset_index().rename(columns={'index': 'year'})
-    df_brics_plot = pd.concat([ts_brics_train, ts_brics_test, forecast_brics]).rename('BRICS').to_frame().reset_index().rename(columns={'index': 'year'})
-    
-    df_combined_plot = pd.merge(df_g7_plot, df_brics_plot, on='year', how='outer').melt(
-        id_vars='year', var_name='Group', value_name='Fossil_Share_Pct'
-    )
-    
-    df_combined_plot['Type'] = np.select(
-        [
-            df_combined_plot['year'] <= ts_g7_test.index.max(),
-            df_combined_plot['year'] > ts_g7_test.index.max()
-        ],
-        [
-            'Historical & Validation', # Tetap English di kolom dataframe
-            'Projection (ARIMA)'      # Tetap English di kolom dataframe
-        ],
-        default='Historical & Validation'
-    )
-    
-    # --- PLOTLY INTERAKTIF (Labels and Titles are English) ---
-    fig = go.Figure()
-
-    for group, color in [('G7', '#347C98'), ('BRICS', '#E36414')]:
-        df_hist = df_combined_plot[(df_combined_plot['Group'] == group) & (df_combined_plot['Type'] == 'Historical & Validation')]
-        fig.add_trace(go.Scatter(x=df_hist['year'], y=df_hist['Fossil_Share_Pct'], 
-                                 mode='lines+markers', name=f'{group} (Historical)', 
-                                 line=dict(color=color, width=3)))
-
-    for group, color in [('G7', '#347C98'), ('BRICS', '#E36414')]:
-        df_pred = df_combined_plot[(df_combined_plot['Group'] == group) & (df_combined_plot['Type'] == 'Projection (ARIMA)')]
-        fig.add_trace(go.Scatter(x=df_pred['year'], y=df_pred['Fossil_Share_Pct'], 
-                                 mode='lines+markers', name=f'{group} (Projection)', 
-                                 line=dict(color=color, dash='dash', width=2), 
-                                 marker=dict(symbol='diamond')))
-
-    fig.update_layout(
-        title='Projected Average Fossil Share (%) until 2030',
-        xaxis_title='Year',
-        yaxis_title='Average Fossil Share (%)',
-        title_x=0.5, 
-        yaxis_range=[df_combined_plot['Fossil_Share_Pct'].min() * 0.9, df_combined_plot['Fossil_Share_Pct'].max() * 1.1],
-        hovermode="x unified",
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    for failed in status_df[status_df['status'] == 'failed'].itertuples():
+        st.warning(texts["PLOT_6_WARNING_ARIMA"].format(e=f"{failed.series_id}: {failed.error}"))
+
+    mape_by_group = status_df.set_index('series_id')['mape'].fillna(999)
+    mape_g7 = mape_by_group.get('G7', 999)
+    mape_brics = mape_by_group.get('BRICS', 999)
+
+    show_chart('fossil_share_forecast', dataset_version, forecast_df)
 
     col_mape_g7, col_mape_brics = st.columns(2)
     with col_mape_g7:
@@ -434,6 +385,27 @@ def plot_fossil_share_forecast_arima(df, texts):
     st.markdown(texts["PLOT_6_NARRATIVE_2"])
     st.markdown("---")
 
+@st.fragment
+def plot_correlation_heatmap(year_moments, dataset_version, texts):
+    """Plot 7: Korelasi Variabel Kunci (dari engine momen inkremental)"""
+    first_year, last_year = int(year_moments.years[0]), int(year_moments.years[-1])
+    header = st.empty()
+    col_scope, col_years = st.columns([1, 2])
+    with col_scope:
+        scope = st.radio(
+            texts["PLOT_7_SCOPE"], ['All', *year_moments.labels], horizontal=True, key='corr_scope',
+            format_func=lambda label: texts["PLOT_7_SCOPE_ALL"] if label == 'All' else label,
+        )
+    with col_years:
+        start_year, end_year = st.slider(
+            texts["PLOT_7_SLIDER"], min_value=first_year, max_value=last_year,
+            value=(first_year, last_year), key='corr_years',
+        )
+    header.header(texts["PLOT_7_HEADER"].format(start=start_year, end=end_year))
+    show_chart('correlation_heatmap', dataset_version, year_moments, scope, start_year, end_year)
+    st.markdown(texts["PLOT_7_INSIGHT"])
+    st.markdown("---")
+
 # --- 3. THEORETICAL GROUNDING ---
 def add_theoretical_grounding(texts):
     """Menambahkan bagian yang membahas konteks teoritis dari jurnal internasional."""
@@ -457,7 +429,35 @@ def add_theoretical_grounding(texts):
     st.markdown("---")
 
 
-# --- 4. STREAMLIT APP LAYOUT ---
+# --- 4. PERFORMANCE PANEL ---
+
+def show_perf_panel(texts):
+    """Panel sidebar: ringkasan per tahap + teks OpenMetrics; juga ditulis ke ENERGY_PERF_METRICS jika di-set."""
+    store_stats = default_store().stats()
+    gauges = {
+        "energy_model_store_hits": store_stats["hits"],
+        "energy_model_store_misses": store_stats["misses"],
+        "energy_model_store_bytes": store_stats["bytes"],
+    }
+    metrics_path = os.environ.get("ENERGY_PERF_METRICS")
+    if metrics_path:
+        perf.write_openmetrics(metrics_path, gauges)
+
+    with st.sidebar.expander(texts["PERF_PANEL_TITLE"], expanded=True):
+        st.caption(texts["PERF_PANEL_CAPTION"])
+        rows = sorted(perf.summary(), key=lambda row: row["last_ms"], reverse=True)
+        st.dataframe(
+            [{k: round(v, 2) if isinstance(v, float) else v for k, v in row.items() if k != "total_ms"} for row in rows],
+            use_container_width=True, hide_index=True,
+        )
+        st.code(perf.openmetrics(gauges), language="text")
+
+
+# --- 5. STREAMLIT APP LAYOUT ---
+
+def _set_language():
+    st.session_state.language = st.session_state.lang_selector
+
 
 def main():
     # Load default language or state
@@ -473,16 +473,16 @@ def main():
     with st.sidebar:
         # Language Selector
         st.subheader("🌐 Language / Bahasa")
-        lang_choice = st.radio(
+        # on_change mengganti bahasa sebelum rerun, jadi tidak perlu st.rerun() kedua kalinya;
+        # figure & data diambil dari cache, hanya teks yang berubah
+        st.radio(
             "Pilih Bahasa / Choose Language",
             ('Bahasa Indonesia', 'English'),
             key='lang_selector',
             index=0 if st.session_state.language == 'Bahasa Indonesia' else 1,
-            horizontal=True
+            horizontal=True,
+            on_change=_set_language,
         )
-        if lang_choice != st.session_state.language:
-            st.session_state.language = lang_choice
-            st.rerun() # Rerun to apply new language texts
 
         st.markdown("---")
         st.title(texts["SIDEBAR_TITLE"])
@@ -498,6 +498,10 @@ def main():
         st.caption(texts["SIDEBAR_CONTACT_CAPTION"])
         st.markdown("https://www.linkedin.com/in/m-feby-khoiru-sidqi")
         st.markdown("https://github.com/mfebykhoirusidqi/World-Energy-Consumption")
+        st.markdown("---")
+        # Toggle per sesi hanya menampilkan panel; instrumentasi diatur untuk seluruh proses lewat ENERGY_PERF=1
+        show_perf = st.toggle(texts["SIDEBAR_PERF_TOGGLE"], value=False, key='perf_panel',
+                              disabled=not perf.enabled(), help=texts["SIDEBAR_PERF_HELP"])
         
     
     st.title(texts["APP_TITLE"])
@@ -506,23 +510,35 @@ def main():
 
     # Load Data 
     file_path = "data/owid-energy-data.csv" 
-    data_tuple = load_and_clean_data(file_path, texts)
-    
-    if data_tuple[0] is None:
-        return 
-        
-    df_clean, latest_year = data_tuple
+    try:
+        with perf.stage("fingerprint"):
+            # Jika CSV berubah, versi lama tetap dilayani selama refresh berjalan di latar
+            dataset_version = served_version(file_path)
+        with perf.stage("load_data", cached=True):
+            df_clean, latest_year = load_and_clean_data(dataset_version, file_path)
+    except FileNotFoundError:
+        st.error(texts["ERROR_FILE_NOT_FOUND"].format(file_path=file_path))
+        return
+    except MissingColumnsError as e:
+        st.error(texts["ERROR_COLUMNS"].format(missing_cols=', '.join(e.missing_cols)))
+        return
+    except EmptyDataError:
+        st.error(texts["WARNING_CLEAN_DATA"])
+        return
+    refresh_state = refresh_status()
+    if refresh_state["running"]:
+        st.info(texts["INFO_REFRESH_IN_PROGRESS"])
+    elif refresh_state["error"]:
+        st.warning(texts["WARNING_REFRESH_FAILED"].format(error=refresh_state["error"]))
+
+    with perf.stage("group_cube", cached=True):
+        cube = load_group_cube(dataset_version, df_clean)
 
-    # --- HITUNG METRIK KUNCI UNTUK RINGKASAN ---
-    df_fossil_absolute_trend = df_clean.groupby(['Group', 'year'])['fossil_fuel_consumption'].sum().reset_index()
-    df_crossover = df_fossil_absolute_trend.pivot(index='year', columns='Group', values='fossil_fuel_consumption').reset_index()
-    crossover_year_series = df_crossover[df_crossover['BRICS'] > df_crossover['G7']]['year']
-    crossover_year = int(crossover_year_series.min()) if not crossover_year_series.empty else latest_year
+    # --- HITUNG METRIK KUNCI UNTUK RINGKASAN (dibaca dari kubus agregat) ---
+    with perf.stage("crossover", cached=True):
+        crossover_year = load_crossovers(dataset_version, cube).first_overtake('BRICS', 'G7')
     
-    brics_cons_2022 = df_fossil_absolute_trend[
-        (df_fossil_absolute_trend['Group'] == 'BRICS') & 
-        (df_fossil_absolute_trend['year'] == latest_year)
-    ]['fossil_fuel_consumption'].sum()
+    brics_cons_2022 = cube_value(cube, 'BRICS', latest_year, 'fossil_fuel_consumption', 'sum', default=0.0)
 
     # --- RINGKASAN EKSEKUTIF ---
     st.header(texts["EXEC_TITLE"])
@@ -531,7 +547,7 @@ def main():
     
     with col1:
         st.subheader(texts["EXEC_SUBHEADER_1"])
-        g7_share = df_clean[(df_clean['Group'] == 'G7') & (df_clean['year'] == latest_year)]['fossil_share_energy'].mean()
+        g7_share = cube_value(cube, 'G7', latest_year, 'fossil_share_energy')
         st.metric(label=f"G7 ({latest_year})", value=f"{g7_share:.1f}%", delta=texts["EXEC_DELTA_1"])
         st.caption(texts["EXEC_CAPTION_1"])
         
@@ -539,11 +555,14 @@ def main():
         st.subheader(texts["EXEC_SUBHEADER_2"])
         # Format dalam ribu TWh (K TWh)
         st.metric(label=f"BRICS ({latest_year})", value=f"{brics_cons_2022/1000:,.1f}K TWh", delta=texts["EXEC_DELTA_2"])
-        st.caption(texts["EXEC_CAPTION_2"].format(crossover_year))
+        if crossover_year is None:
+            st.caption(texts["EXEC_CAPTION_2_NO_CROSSOVER"])
+        else:
+            st.caption(texts["EXEC_CAPTION_2"].format(crossover_year))
         
     with col3:
         st.subheader(texts["EXEC_SUBHEADER_3"])
-        brics_low_carbon = df_clean[(df_clean['Group'] == 'BRICS') & (df_clean['year'] == latest_year)]['low_carbon_share_energy'].mean()
+        brics_low_carbon = cube_value(cube, 'BRICS', latest_year, 'low_carbon_share_energy')
         st.metric(label="Low Carbon Share", value=f"BRICS: {brics_low_carbon:.1f}%", delta=texts["EXEC_DELTA_3"])
         st.caption(texts["EXEC_CAPTION_3"])
 
@@ -553,16 +572,34 @@ def main():
     st.header(texts["DEEP_DIVE_TITLE"])
     
     # Semua plot kini menggunakan string dari dictionary 'texts'
-    plot_fossil_share_trend(df_clean, texts)
-    plot_energy_efficiency(df_clean, texts)
-    plot_fossil_absolute_trend(df_clean, latest_year, crossover_year, texts)
-    plot_renewable_growth(df_clean, texts)
-    plot_low_carbon_share(df_clean, texts) 
-    plot_fossil_share_forecast_arima(df_clean, texts)
+    # import_section: dependensi berat tiap section dicatat di laporan waktu import
+    with import_section("plot_1"), perf.stage("plot_1"):
+        plot_fossil_share_trend(cube, dataset_version, texts)
+    with import_section("plot_4"), perf.stage("plot_4"):
+        plot_energy_efficiency(cube, dataset_version, texts)
+    with import_section("plot_2"), perf.stage("plot_2"):
+        plot_fossil_absolute_trend(cube, dataset_version, crossover_year, texts)
+    with import_section("plot_3"), perf.stage("plot_3"):
+        plot_renewable_growth(load_tensor_store(dataset_version, df_clean), dataset_version, texts)
+    with import_section("plot_5"), perf.stage("plot_5"):
+        plot_low_carbon_share(cube, dataset_version, texts) 
+    with import_section("plot_6"), perf.stage("plot_6"):
+        plot_fossil_share_forecast_arima(cube, dataset_version, texts)
+    with import_section("plot_7"), perf.stage("plot_7"):
+        store = load_tensor_store(dataset_version, df_clean)
+        plot_correlation_heatmap(load_correlation_moments(dataset_version, store), dataset_version, texts)
     
     # --- TEORI BARU DAN KESIMPULAN DI SINI ---
     add_theoretical_grounding(texts)
+
+    # Ukuran payload tiap chart (JSON mentah/gzip, waktu build & serialisasi di server)
+    with st.expander("Chart Payload"):
+        payloads = st.session_state.get('chart_payloads', {})
+        st.dataframe([dict(view=view, **report) for view, report in payloads.items()], use_container_width=True)
     
+    if show_perf and perf.enabled():
+        show_perf_panel(texts)
+
     st.success(texts["SUCCESS_MESSAGE"])
 
 if __name__ == "__main__":
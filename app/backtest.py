@@ -0,0 +1,242 @@
+"""Backtesting walk-forward (expanding window) untuk banyak seri, origin dan keluarga model.
+
+Contoh (dari root repo):
+    python app/backtest.py --metrics fossil_share_energy low_carbon_share_energy --origins 5 --horizon 3
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from cleaning import END_YEAR, START_YEAR, interpolate_by_entity
+from fast_arima import can_fast_path, forecast_batch
+from forecasting import get_pool
+from lazy_imports import lazy_import
+from xgb_forecast import predict_matrix as predict_xgb_global
+
+# Model yang dievaluasi jika tidak ditentukan: nama -> (keluarga, parameter)
+DEFAULT_MODELS = {
+    'naive': ('naive', {}),
+    'arima_110': ('arima', {'order': (1, 1, 0)}),
+    'arima_210': ('arima', {'order': (2, 1, 0)}),
+    'arima_100': ('arima', {'order': (1, 0, 0)}),
+    # n_jobs=1: paralelisme sudah di tingkat (model, origin) lewat pool proses
+    'xgb_global': ('xgb_global', {'n_jobs': 1}),
+}
+METRICS = ['mape', 'smape', 'rmse']
+SCORE_COLUMNS = ['model', 'series_id', 'horizon', 'n', 'mape', 'smape', 'rmse']
+# Minimal panjang histori (tahun) sebelum origin pertama
+MIN_TRAIN = 8
+MIN_PARALLEL_TASKS = 4
+
+arima_model = lazy_import('statsmodels.tsa.arima.model', section='forecast')
+
+
+# --- 1. KELUARGA MODEL ---
+# Setiap model menerima histori (n_series, n_tahun) yang boleh berisi NaN
+# dan mengembalikan prediksi (n_series, horizon); NaN jika seri tidak bisa diprediksi.
+
+def _last_valid(history):
+    valid = ~np.isnan(history)
+    idx = history.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+    last = history[np.arange(len(history)), idx]
+    return np.where(valid.any(axis=1), last, np.nan)
+
+
+def predict_naive(history, horizon):
+    """Random walk: nilai valid terakhir diulang untuk semua horizon."""
+    return np.repeat(_last_valid(history)[:, None], horizon, axis=1)
+
+
+def _trimmed(series):
+    """Seri tanpa NaN awal/akhir; NaN di tengah diisi interpolasi linear."""
+    valid = np.flatnonzero(~np.isnan(series))
+    if len(valid) == 0:
+        return series[:0]
+    part = series[valid[0]:valid[-1] + 1]
+    if np.isnan(part).any():
+        part = pd.Series(part).interpolate('linear').to_numpy()
+    return part
+
+
+def predict_arima(history, horizon, order=(1, 1, 0)):
+    """Fast path NumPy untuk seri lengkap, statsmodels untuk sisanya (NaN, orde lain, gagal konvergen)."""
+    order = tuple(order)
+    predicted = np.full((len(history), horizon), np.nan)
+    pending = np.ones(len(history), dtype=bool)
+    if can_fast_path(order):
+        # Seri dikelompokkan menurut tahun valid pertama agar seri yang mulai belakangan tetap batch
+        first_valid = np.argmax(~np.isnan(history), axis=1)
+        for start in np.unique(first_valid):
+            rows = np.flatnonzero(first_valid == start)
+            fast, ok = forecast_batch(history[rows, start:], order, horizon)
+            predicted[rows[ok]] = fast[ok]
+            pending[rows[ok]] = False
+
+    for i in np.flatnonzero(pending):
+        series = _trimmed(history[i])
+        if len(series) <= sum(order) + 2:
+            continue
+        # Tahun kosong di akhir histori: prediksi tetap dimulai setelah origin, bukan setelah tahun valid terakhir
+        n_trailing = int(np.argmax(~np.isnan(history[i, ::-1])))
+        try:
+            # Lihat forecasting._fit_arima: modul di-load sebelum filter warning dipasang
+            arima = arima_model.ARIMA
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                forecast = arima(series, order=order).fit().forecast(horizon + n_trailing)
+            predicted[i] = np.asarray(forecast)[n_trailing:]
+        except Exception:
+            # Seri yang gagal dilatih dihitung sebagai prediksi hilang (coverage < 1)
+            pass
+    return predicted
+
+
+MODEL_FAMILIES = {
+    'naive': predict_naive,
+    'arima': predict_arima,
+    'xgb_global': predict_xgb_global,
+}
+
+
+# --- 2. METRIK (vektor atas seri x origin x horizon) ---
+
+def error_metrics(actual, predicted, axis=None):
+    """MAPE & sMAPE (persen) dan RMSE, mengabaikan sel NaN; `axis` seperti np.nanmean."""
+    actual = np.asarray(actual, dtype=np.float64)
+    predicted = np.asarray(predicted, dtype=np.float64)
+    error = predicted - actual
+    with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        ape = np.abs(error / actual)
+        ape[~np.isfinite(ape)] = np.nan
+        sape = 2 * np.abs(error) / (np.abs(actual) + np.abs(predicted))
+        sape[~np.isfinite(sape)] = np.nan
+        return {
+            'n': np.sum(~np.isnan(error), axis=axis),
+            'mape': np.nanmean(ape, axis=axis) * 100,
+            'smape': np.nanmean(sape, axis=axis) * 100,
+            'rmse': np.sqrt(np.nanmean(error ** 2, axis=axis)),
+        }
+
+
+# --- 3. ENGINE ---
+
+def series_matrix(df, value_col, id_col='country', time_col='year'):
+    """Frame long -> (series_ids, years, matriks seri x tahun) dengan NaN untuk tahun yang hilang."""
+    wide = df.pivot_table(index=id_col, columns=time_col, values=value_col, observed=True, dropna=False)
+    years = np.arange(int(wide.columns.min()), int(wide.columns.max()) + 1)
+    wide = wide.reindex(columns=years)
+    return list(wide.index), years, wide.to_numpy(dtype=np.float64)
+
+
+def _run_task(task):
+    name, family, params, origin, history, horizon = task
+    return name, origin, MODEL_FAMILIES[family](history, horizon, **params)
+
+
+def backtest(df, value_col, id_col='country', time_col='year', models=None, n_origins=5, horizon=3,
+             min_train=MIN_TRAIN, max_workers=None):
+    """Evaluasi rolling-origin: setiap model dilatih ulang di tiap origin dan memprediksi `horizon` tahun.
+
+    Semua seri diproses sekaligus per (model, origin); pasangan (model, origin) dibagi ke pool proses.
+    Mengembalikan (leaderboard, scores): leaderboard per model dan skor per (model, seri, horizon).
+    """
+    models = DEFAULT_MODELS if models is None else models
+    series_ids, years, values = series_matrix(df, value_col, id_col, time_col)
+    length = values.shape[1]
+    n_origins = min(n_origins, length - horizon - min_train + 1)
+    if n_origins < 1:
+        raise ValueError(f"need at least {min_train + horizon} years, got {length}")
+
+    # Origin k: latih pada kolom [:cut], uji pada [cut:cut+horizon]
+    cuts = [length - n_origins - horizon + 1 + k for k in range(n_origins)]
+    actual = np.stack([values[:, cut:cut + horizon] for cut in cuts], axis=1)
+    tasks = [
+        (name, family, params, k, values[:, :cut], horizon)
+        for name, (family, params) in models.items()
+        for k, cut in enumerate(cuts)
+    ]
+    if len(tasks) < MIN_PARALLEL_TASKS or max_workers == 1:
+        outputs = map(_run_task, tasks)
+    else:
+        outputs = get_pool(max_workers).map(_run_task, tasks)
+
+    predicted = {name: np.full_like(actual, np.nan) for name in models}
+    for name, origin, prediction in outputs:
+        predicted[name][:, origin, :] = prediction
+
+    scores, board = [], []
+    for name, pred in predicted.items():
+        # Skor per seri x langkah horizon (rata-rata atas origin)
+        per_step = error_metrics(actual, pred, axis=1)
+        n_series = len(series_ids)
+        scores.append(pd.DataFrame({
+            'model': name,
+            'series_id': np.repeat(series_ids, horizon),
+            'horizon': np.tile(np.arange(1, horizon + 1), n_series),
+            **{key: per_step[key].ravel() for key in ['n'] + METRICS},
+        }))
+        # Leaderboard: metrik per seri (atas origin & horizon), lalu dirata-rata antar seri
+        per_series = error_metrics(actual.reshape(n_series, -1), pred.reshape(n_series, -1), axis=1)
+        observed = ~np.isnan(actual)
+        board.append({
+            'model': name,
+            **{key: float(np.nanmean(per_series[key])) if np.isfinite(per_series[key]).any() else np.nan
+               for key in METRICS},
+            'coverage': float((~np.isnan(pred) & observed).sum() / max(1, observed.sum())),
+            'series': n_series,
+            'origins': n_origins,
+            'horizon': horizon,
+        })
+
+    leaderboard = pd.DataFrame(board).sort_values(['smape', 'rmse'], na_position='last').reset_index(drop=True)
+    leaderboard.insert(0, 'rank', np.arange(1, len(leaderboard) + 1))
+    return leaderboard, pd.concat(scores, ignore_index=True)[SCORE_COLUMNS]
+
+
+# --- 4. CLI ---
+
+def load_panel(file_path, metrics, countries=None):
+    """Panel negara x tahun untuk metrik terpilih (interpolasi per negara, tanpa membuang baris)."""
+    from ingest import read_energy_columns, read_entities
+
+    countries = read_entities(file_path) if countries is None else countries
+    df = read_energy_columns(file_path, ['country', 'year', *metrics], countries, START_YEAR, END_YEAR)
+    return interpolate_by_entity(df, metrics)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='data/owid-energy-data.csv')
+    parser.add_argument('--metrics', nargs='+', default=['fossil_share_energy'])
+    parser.add_argument('--countries', nargs='+', default=None, help='default: semua entitas di file')
+    parser.add_argument('--models', nargs='+', default=list(DEFAULT_MODELS), choices=list(DEFAULT_MODELS))
+    parser.add_argument('--origins', type=int, default=5)
+    parser.add_argument('--horizon', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default=None, help='folder untuk leaderboard.csv & scores.parquet')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    panel = load_panel(args.data, args.metrics, args.countries)
+    # Satu seri = negara x metrik; semua metrik dievaluasi dalam satu panel
+    long = panel.melt(id_vars=['country', 'year'], value_vars=args.metrics, var_name='metric')
+    long['series_id'] = long['country'].astype(str) + '|' + long['metric']
+    leaderboard, scores = backtest(long, 'value', id_col='series_id', models={m: DEFAULT_MODELS[m] for m in args.models},
+                                   n_origins=args.origins, horizon=args.horizon, max_workers=args.workers)
+
+    print(leaderboard.to_string(index=False, float_format=lambda v: f'{v:,.3f}'))
+    print(f"\n{leaderboard['series'].iloc[0]:,} seri x {len(args.models)} model dalam {time.perf_counter() - start:.1f} detik")
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+        leaderboard.to_csv(os.path.join(args.output, 'leaderboard.csv'), index=False)
+        scores.to_parquet(os.path.join(args.output, 'scores.parquet'), engine='pyarrow', index=False)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
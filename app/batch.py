@@ -0,0 +1,133 @@
+"""Analisis batch tanpa Streamlit untuk banyak seleksi blok/negara.
+
+Setiap argumen --analyses adalah satu seleksi yang dipisah koma (blok di GROUP_REGISTRY
+atau nama negara). Contoh (dari root repo):
+    python app/batch.py --analyses G7,BRICS G7,Indonesia China,India --workers 4
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from analysis import load_clean_data, run_analysis, selection_registry
+from model_store import default_store
+
+TABLES = ['group_series', 'growth', 'forecast', 'forecast_status']
+
+# Data bersih per worker: dimuat sekali oleh initializer, dipakai semua analisis di proses itu
+_WORKER_DATA = None
+
+
+def _json_safe(value):
+    """NaN/inf -> None agar summary.json valid."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    return value
+
+
+def _slug(targets):
+    return re.sub(r"[^A-Za-z0-9]+", "_", "_vs_".join(targets)).strip("_")
+
+
+def parse_selection(text):
+    return [target.strip() for target in text.split(",") if target.strip()]
+
+
+def write_analysis(result, output_dir):
+    """Tabel ke Parquet, ringkasan ke JSON; satu folder per analisis."""
+    os.makedirs(output_dir, exist_ok=True)
+    for name in TABLES:
+        result[name].to_parquet(os.path.join(output_dir, f"{name}.parquet"), engine="pyarrow", index=False)
+    with open(os.path.join(output_dir, "summary.json"), "w") as fh:
+        json.dump(_json_safe(result["summary"]), fh, indent=2)
+    return output_dir
+
+
+def _init_worker(file_path, groups, registry):
+    global _WORKER_DATA
+    # Snapshot Parquet sudah ditulis oleh proses induk; di sini hanya dibaca (memory-mapped)
+    _WORKER_DATA = load_clean_data(file_path, groups, registry)
+
+
+def _run_one(task):
+    targets, output_root = task
+    start = time.perf_counter()
+    output_dir = os.path.join(output_root, _slug(targets))
+    try:
+        result = run_analysis(_WORKER_DATA, targets, store=default_store())
+        write_analysis(result, output_dir)
+        status, error = "ok", None
+    except Exception as e:
+        status, error = "failed", f"{type(e).__name__}: {e}"
+    return {"targets": list(targets), "output": output_dir, "status": status, "error": error,
+            "seconds": time.perf_counter() - start}
+
+
+def run_batch(file_path, selections, output_root="batch_output", max_workers=None):
+    """Menjalankan semua analisis lintas core CPU; mengembalikan manifest (juga ditulis ke manifest.json)."""
+    start = time.perf_counter()
+    registry = {}
+    for targets in selections:
+        registry.update(selection_registry(targets))
+    groups = list(registry)
+
+    # Muat sekali di proses induk: error data langsung terlihat & snapshot Parquet siap untuk worker
+    load_clean_data(file_path, groups, registry)
+    load_seconds = time.perf_counter() - start
+
+    tasks = [(tuple(targets), output_root) for targets in selections]
+    workers = max(1, min(len(tasks), max_workers or os.cpu_count()))
+    if workers == 1:
+        _init_worker(file_path, groups, registry)
+        runs = list(map(_run_one, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(file_path, groups, registry)) as pool:
+            runs = list(pool.map(_run_one, tasks))
+
+    elapsed = time.perf_counter() - start
+    completed = sum(run["status"] == "ok" for run in runs)
+    manifest = {
+        "data": os.path.abspath(file_path),
+        "workers": workers,
+        "analyses": len(runs),
+        "completed": completed,
+        "load_seconds": load_seconds,
+        "total_seconds": elapsed,
+        "analyses_per_minute": completed / elapsed * 60 if elapsed > 0 else None,
+        "runs": runs,
+    }
+    os.makedirs(output_root, exist_ok=True)
+    with open(os.path.join(output_root, "manifest.json"), "w") as fh:
+        json.dump(_json_safe(manifest), fh, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="data/owid-energy-data.csv")
+    parser.add_argument("--analyses", nargs="+", default=["G7,BRICS"],
+                        help="seleksi dipisah koma, mis. G7,BRICS atau China,India")
+    parser.add_argument("--output", default="batch_output")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    manifest = run_batch(args.data, [parse_selection(text) for text in args.analyses], args.output, args.workers)
+    for run in manifest["runs"]:
+        mark = "✅" if run["status"] == "ok" else "❌"
+        print(f"{mark} {' vs '.join(run['targets'])}: {run['output']} ({run['seconds']:.2f} s) {run['error'] or ''}")
+    print(f"{manifest['completed']}/{manifest['analyses']} analisis, "
+          f"{manifest['analyses_per_minute']:.1f} analisis/menit dengan {manifest['workers']} worker")
+    return 0 if manifest["completed"] == manifest["analyses"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import gzip
+import time
+
+import numpy as np
+
+from lazy_imports import lazy_import
+
+# Di atas jumlah titik ini trace per figure dirender dengan WebGL (Scattergl)
+GL_POINT_THRESHOLD = 5000
+# Jumlah titik maksimum per trace setelah downsampling LTTB
+MAX_POINTS_PER_TRACE = 2000
+
+# Properti line yang tidak didukung Scattergl
+_GL_LINE_SHAPES = {'linear', 'hv', 'vh', 'hvh', 'vhv'}
+
+go = lazy_import("plotly.graph_objects", section="plots")
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indeks titik yang dipertahankan (termasuk titik awal & akhir)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Titik acuan bucket berikutnya = rata-rata bucket tersebut
+        nxt_start, nxt_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[nxt_start:nxt_end].mean()
+        avg_y = np.nanmean(y[nxt_start:nxt_end]) if nxt_end > nxt_start else y[-1]
+
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.nanargmax(area)) if np.isfinite(area).any() else start
+        selected[i + 1] = prev
+    return selected
+
+
+def _compact_x(x):
+    """Tahun/bilangan bulat -> int16/int32, selain itu float32 (dikirim Plotly sebagai typed array)."""
+    x = np.asarray(x)
+    if x.dtype.kind in 'iu':
+        if x.size == 0 or (x.min() >= np.iinfo(np.int16).min and x.max() <= np.iinfo(np.int16).max):
+            return x.astype(np.int16)
+        return x.astype(np.int32)
+    if x.dtype.kind == 'f':
+        return x.astype(np.float32)
+    return x
+
+
+def _even_step(x):
+    """Langkah x jika x berjarak sama (mis. tahun berurutan), selain itu None."""
+    if len(x) < 3 or x.dtype.kind not in 'iuf':
+        return None
+    steps = np.diff(x)
+    return steps[0].item() if np.all(steps == steps[0]) and steps[0] != 0 else None
+
+
+def _scatter_points(fig):
+    total = 0
+    for trace in fig.data:
+        if trace.type in ('scatter', 'scattergl') and trace.y is not None:
+            total += len(trace.y)
+    return total
+
+
+def optimize_figure(fig, max_points=MAX_POINTS_PER_TRACE, gl_threshold=GL_POINT_THRESHOLD):
+    """Downsampling LTTB per trace, array float32/int16, dan Scattergl jika titik total melebihi ambang."""
+    use_gl = _scatter_points(fig) > gl_threshold
+    traces = []
+    for trace in fig.data:
+        if trace.type not in ('scatter', 'scattergl') or trace.x is None or trace.y is None or len(trace.x) != len(trace.y):
+            if trace.type in ('bar',) and trace.y is not None and np.asarray(trace.y).dtype.kind == 'f':
+                trace.y = np.asarray(trace.y, dtype=np.float32)
+            traces.append(trace)
+            continue
+
+        x = np.asarray(trace.x)
+        y = np.asarray(trace.y, dtype=np.float64)
+        if len(x) > max_points and x.dtype.kind in 'iuf':
+            keep = lttb(x, y, max_points)
+            x, y = x[keep], y[keep]
+
+        props = trace.to_plotly_json()
+        props.pop('type', None)
+        props['y'] = y.astype(np.float32)
+        # Sumbu x berjarak sama (tahun) dikirim sebagai x0 + dx, bukan array per trace
+        step = _even_step(x)
+        if step is not None:
+            props.pop('x', None)
+            props['x0'] = x[0].item()
+            props['dx'] = step
+        else:
+            props['x'] = _compact_x(x)
+        if use_gl:
+            line = dict(props.get('line') or {})
+            if line.get('shape') not in (None, *_GL_LINE_SHAPES):
+                line['shape'] = 'linear'
+            props['line'] = line
+            traces.append(go.Scattergl(props, skip_invalid=True))
+        else:
+            traces.append(go.Scatter(props))
+
+    optimized = go.Figure(data=traces, layout=fig.layout)
+    return optimized
+
+
+def payload_report(fig, build_seconds=None):
+    """Ukuran JSON figure (mentah & gzip), waktu serialisasi, jumlah titik dan mode render."""
+    start = time.perf_counter()
+    payload = fig.to_json().encode()
+    serialize_seconds = time.perf_counter() - start
+    return {
+        'traces': len(fig.data),
+        'points': _scatter_points(fig),
+        'webgl': any(trace.type == 'scattergl' for trace in fig.data),
+        'bytes': len(payload),
+        'gzip_bytes': len(gzip.compress(payload, compresslevel=6)),
+        'build_ms': None if build_seconds is None else build_seconds * 1000,
+        'serialize_ms': serialize_seconds * 1000,
+    }
@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+
+# Registry negara -> kelompok. Blok kustom bisa ditambahkan lewat register_group().
+GROUP_REGISTRY = {
+    'G7': ['United States', 'Canada', 'Germany', 'United Kingdom', 'France', 'Italy', 'Japan'],
+    'BRICS': ['Brazil', 'Russia', 'India', 'China', 'South Africa'],
+    'Indonesia': ['Indonesia'],
+    'World': ['World'],
+}
+DEFAULT_GROUP = 'Other'
+
+# Parameter analisis yang dipakai dashboard, laporan PDF dan pipeline batch
+START_YEAR = 2000
+END_YEAR = 2022
+KEY_COLUMNS = [
+    'country', 'year', 'gdp', 'population',
+    'fossil_share_energy', 'low_carbon_share_energy',
+    'solar_consumption', 'wind_consumption',
+    'energy_per_gdp', 'fossil_fuel_consumption',
+    'renewables_consumption'
+]
+# Kolom yang wajib terisi setelah interpolasi
+CRITICAL_COLUMNS = ['gdp', 'fossil_share_energy', 'low_carbon_share_energy', 'energy_per_gdp', 'fossil_fuel_consumption']
+
+
+def register_group(name, countries, registry=None):
+    """Menambahkan (atau mengganti) blok negara kustom di registry."""
+    registry = GROUP_REGISTRY if registry is None else registry
+    registry[name] = list(countries)
+    return registry
+
+
+def countries_for(groups, registry=None):
+    """Daftar negara anggota dari kelompok-kelompok yang dipilih (urutan dipertahankan)."""
+    registry = GROUP_REGISTRY if registry is None else registry
+    return [country for group in groups for country in registry[group]]
+
+
+def country_group_map(groups=None, registry=None):
+    """Dictionary negara -> kelompok; jika negara ada di beberapa blok, blok pertama yang dipakai."""
+    registry = GROUP_REGISTRY if registry is None else registry
+    groups = list(registry) if groups is None else groups
+    mapping = {}
+    for group in groups:
+        for country in registry[group]:
+            mapping.setdefault(country, group)
+    return mapping
+
+
+def assign_groups(countries, groups=None, registry=None, default=DEFAULT_GROUP):
+    """Label kelompok sebagai Categorical: pemetaan dilakukan per kategori, lalu di-take lewat kode."""
+    groups = list(GROUP_REGISTRY if registry is None else registry) if groups is None else groups
+    mapping = country_group_map(groups, registry)
+
+    countries = countries.astype('category')
+    categories = countries.cat.categories
+    group_per_category = np.asarray(categories.map(mapping).fillna(default), dtype=object)
+    codes = countries.cat.codes.to_numpy()
+
+    labels = np.where(codes >= 0, group_per_category.take(np.maximum(codes, 0)), None)
+    return pd.Series(
+        pd.Categorical(labels, categories=list(dict.fromkeys(list(groups) + [default]))),
+        index=countries.index,
+    )
+
+
+def interpolate_by_entity(df, columns=None, entity_col='country', time_col='year'):
+    """Interpolasi linear per entitas untuk banyak kolom sekaligus, tanpa lambda per grup.
+
+    Hasilnya sama dengan groupby(entity)[col].transform(lambda x: x.interpolate('linear')):
+    NaN di awal tetap NaN, NaN di akhir diisi nilai valid terakhir. Selalu mengembalikan
+    frame baru; frame input tidak pernah diubah.
+    """
+    if columns is None:
+        columns = [
+            col for col in df.select_dtypes(include='number').columns
+            if col != time_col
+        ]
+    columns = list(columns)
+    if df.empty or not columns:
+        return df.copy()
+
+    entity_codes = df[entity_col].astype('category').cat.codes.to_numpy()
+    order = np.lexsort((df[time_col].to_numpy(), entity_codes))
+    keys = entity_codes[order]
+
+    values = df[columns].to_numpy(dtype=np.float64)[order]
+    valid = ~np.isnan(values)
+    positions = np.where(valid, np.arange(len(values), dtype=np.float64)[:, None], np.nan)
+
+    # Posisi nilai valid sebelum/sesudah setiap sel, dibatasi dalam entitas yang sama
+    position_frame = pd.DataFrame(positions)
+    prev_pos = position_frame.groupby(keys).ffill().to_numpy()
+    next_pos = position_frame.groupby(keys).bfill().to_numpy()
+
+    prev_idx = np.nan_to_num(prev_pos, nan=0).astype(np.intp)
+    next_idx = np.nan_to_num(next_pos, nan=0).astype(np.intp)
+    prev_val = np.take_along_axis(values, prev_idx, axis=0)
+    next_val = np.take_along_axis(values, next_idx, axis=0)
+
+    span = next_pos - prev_pos
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = np.where(span > 0, (np.arange(len(values))[:, None] - prev_pos) / span, 0.0)
+    filled = prev_val + (next_val - prev_val) * weight
+    filled = np.where(np.isnan(next_pos), prev_val, filled)
+    filled = np.where(np.isnan(prev_pos), np.nan, filled)
+    filled = np.where(valid, values, filled)
+
+    result = np.empty_like(filled)
+    result[order] = filled
+    out = df.copy()
+    for i, col in enumerate(columns):
+        out[col] = result[:, i].astype(df[col].dtype, copy=False)
+    return out
+
+
+def add_per_capita(df, column, out_col, population_col='population', scale=1e9):
+    """Fitur per kapita (mis. fossil_energy_per_capita) secara vektor; frame pemanggil tidak diubah."""
+    return df.assign(**{out_col: df[column] / df[population_col] * scale})
+
+
+def add_lag_features(df, column, lags=(1,), entity_col='country', time_col='year'):
+    """Fitur lag per entitas memakai groupby.shift (tanpa loop Python)."""
+    df = df.sort_values([entity_col, time_col])
+    grouped = df.groupby(entity_col, observed=True)[column]
+    for lag in lags:
+        df[f'Lag_{lag}_{column}'] = grouped.shift(lag)
+    return df
+
+
+def clean_energy_frame(df, groups, interpolate_cols=('gdp',), dropna_cols=(), registry=None):
+    """Pipeline pembersihan: interpolasi per negara, kolom Group, lalu buang NaN kritis.
+
+    Frame input tidak diubah: interpolate_by_entity selalu mengembalikan salinan.
+    """
+    df = interpolate_by_entity(df, interpolate_cols)
+    df['Group'] = assign_groups(df['country'], groups, registry)
+    if dropna_cols:
+        df = df.dropna(subset=list(dropna_cols))
+    return df
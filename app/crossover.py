@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+from model_store import model_key
+
+EVENT_COLUMNS = ['leader', 'laggard', 'year']
+SUMMARY_COLUMNS = ['a', 'b', 'first_year', 'last_year', 'crossings', 'current_leader']
+
+
+def _ffill(values):
+    """Forward-fill NaN sepanjang sumbu waktu (axis=1) tanpa loop Python."""
+    valid = ~np.isnan(values)
+    idx = np.where(valid, np.arange(values.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    return np.take_along_axis(values, idx, axis=1)
+
+
+def find_crossovers(matrix, years, entities, pairs=None):
+    """Semua titik persilangan untuk setiap pasangan entitas dalam satu pass vektor.
+
+    matrix: (n_entitas, n_tahun). Selisih setiap pasangan dihitung sekaligus; tahun kosong
+    (NaN) dan seri yang sama persis (selisih 0) mewarisi tanda tahun sebelumnya, sehingga
+    hanya perubahan tanda sungguhan yang tercatat. Mengembalikan frame event
+    (leader, laggard, year): `leader` mulai berada di atas `laggard` pada `year`.
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    years = np.asarray(years)
+    entities = np.asarray(entities, dtype=object)
+    if pairs is None:
+        a, b = np.triu_indices(len(entities), k=1)
+    else:
+        a, b = (np.asarray(side, dtype=np.intp) for side in pairs)
+    if len(a) == 0 or matrix.shape[1] < 2:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+
+    sign = np.sign(matrix[a] - matrix[b])
+    sign[sign == 0] = np.nan
+    sign = _ffill(sign)
+    crossed = sign[:, 1:] * sign[:, :-1] < 0
+    pair_idx, step = np.nonzero(crossed)
+    a_leads = sign[pair_idx, step + 1] > 0
+
+    return pd.DataFrame({
+        'leader': np.where(a_leads, entities[a[pair_idx]], entities[b[pair_idx]]),
+        'laggard': np.where(a_leads, entities[b[pair_idx]], entities[a[pair_idx]]),
+        'year': years[step + 1].astype(np.int64),
+    })
+
+
+class CrossoverTable:
+    """Hasil persilangan satu metrik yang bisa di-query: siapa menyalip siapa, dan kapan."""
+
+    def __init__(self, events, metric=None, latest_order=None):
+        self.events = events.sort_values(['year', 'leader', 'laggard'], kind='stable').reset_index(drop=True)
+        self.metric = metric
+        # Urutan entitas di tahun terakhir (untuk current_leader di summary)
+        self.latest_order = latest_order or {}
+
+    @classmethod
+    def from_matrix(cls, matrix, years, entities, metric=None, store=None):
+        """Membangun tabel dari matriks entitas x tahun; di-cache di ModelStore jika diberikan."""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        last = _ffill(matrix)[:, -1] if matrix.size else np.array([])
+        latest_order = {str(entity): float(value) for entity, value in zip(entities, last)}
+
+        key = None
+        if store is not None:
+            key = model_key('crossover', {'metric': metric, 'entities': [str(e) for e in entities]},
+                            np.asarray(years), matrix)
+            events = store.get(key)
+            if events is not None:
+                return cls(events, metric, latest_order)
+        events = find_crossovers(matrix, years, entities)
+        if store is not None:
+            store.put(key, events)
+        return cls(events, metric, latest_order)
+
+    @classmethod
+    def from_pivot(cls, pivot, metric=None, store=None):
+        """Tabel tahun x entitas (mis. cube_pivot) -> CrossoverTable."""
+        return cls.from_matrix(pivot.to_numpy().T, pivot.index.to_numpy(), list(pivot.columns), metric, store)
+
+    @classmethod
+    def from_store(cls, tensor_store, metric, entities=None, store=None):
+        """Semua entitas di TensorStore untuk satu metrik (mis. 'solar_consumption')."""
+        names = tensor_store.entities if entities is None else list(entities)
+        return cls.from_matrix(tensor_store.series(metric, entities), tensor_store.years, names, metric, store)
+
+    def overtakes(self, leader=None, laggard=None):
+        """Event penyalipan, opsional difilter menurut entitas yang menyalip dan/atau disalip."""
+        events = self.events
+        if leader is not None:
+            events = events[events['leader'] == leader]
+        if laggard is not None:
+            events = events[events['laggard'] == laggard]
+        return events
+
+    def involving(self, entity):
+        return self.events[(self.events['leader'] == entity) | (self.events['laggard'] == entity)]
+
+    def first_overtake(self, leader, laggard):
+        """Tahun pertama `leader` menyalip `laggard`; None jika tidak pernah."""
+        years = self.overtakes(leader, laggard)['year']
+        return int(years.iloc[0]) if len(years) else None
+
+    def last_overtake(self, leader, laggard):
+        years = self.overtakes(leader, laggard)['year']
+        return int(years.iloc[-1]) if len(years) else None
+
+    def summary(self):
+        """Per pasangan (tak berurutan): tahun persilangan pertama/terakhir, jumlah, pemimpin terakhir."""
+        if self.events.empty:
+            return pd.DataFrame(columns=SUMMARY_COLUMNS)
+        leader = self.events['leader'].astype(str).to_numpy()
+        laggard = self.events['laggard'].astype(str).to_numpy()
+        pairs = pd.DataFrame({
+            'a': np.minimum(leader, laggard),
+            'b': np.maximum(leader, laggard),
+            'year': self.events['year'].to_numpy(),
+        })
+        summary = pairs.groupby(['a', 'b'], sort=True)['year'].agg(
+            first_year='min', last_year='max', crossings='size'
+        ).reset_index()
+        a_value = summary['a'].map(self.latest_order)
+        b_value = summary['b'].map(self.latest_order)
+        summary['current_leader'] = np.where(a_value >= b_value, summary['a'], summary['b'])
+        return summary[SUMMARY_COLUMNS]
@@ -0,0 +1,253 @@
+import numpy as np
+
+# Fast path hanya untuk AR(p) / ARIMA(p,1,0) berorde kecil
+MAX_FAST_P = 3
+# Iterasi Newton untuk likelihood eksak (mulai dari estimasi least squares)
+MLE_MAX_ITER = 50
+MLE_TOL = 1e-8
+_FD_STEP = 1e-4
+
+
+def can_fast_path(order):
+    """True jika order bisa diestimasi secara batch oleh fast path (q=0, d<=1, p kecil)."""
+    p, d, q = order
+    return q == 0 and d in (0, 1) and 1 <= p <= MAX_FAST_P
+
+
+def _lag_design(x, p, with_const):
+    """Matriks desain lag (n, T-p, p[+1]) dan target (n, T-p) untuk semua seri sekaligus."""
+    n, length = x.shape
+    lags = [x[:, p - i - 1:length - i - 1] for i in range(p)]
+    if with_const:
+        lags.append(np.ones((n, length - p)))
+    return np.stack(lags, axis=-1), x[:, p:]
+
+
+def _is_stationary(phi):
+    """Cek akar polinomial AR lewat eigenvalue matriks companion, batch untuk semua seri."""
+    n, p = phi.shape
+    if p == 1:
+        return np.abs(phi[:, 0]) < 1
+    companion = np.zeros((n, p, p))
+    companion[:, 0, :] = phi
+    companion[:, np.arange(1, p), np.arange(p - 1)] = 1.0
+    return np.all(np.abs(np.linalg.eigvals(companion)) < 1, axis=1)
+
+
+def _ar_autocov(phi):
+    """Autokovarians gamma_0..gamma_p proses AR(p) stasioner dengan varians inovasi 1, batch (n, p+1)."""
+    n, p = phi.shape
+    system = np.tile(np.eye(p + 1), (n, 1, 1))
+    for k in range(p + 1):
+        for i in range(1, p + 1):
+            system[:, k, abs(k - i)] -= phi[:, i - 1]
+    rhs = np.zeros((n, p + 1, 1))
+    rhs[:, 0] = 1.0
+    return np.linalg.solve(system, rhs)[..., 0]
+
+
+def _profile_loglik(x, phi, with_const):
+    """Log-likelihood Gaussian eksak AR(p) (sigma² dan rata-rata diprofilkan) + rata-rata optimal.
+
+    Sama dengan likelihood state-space statsmodels: p observasi pertama memakai distribusi
+    stasionernya, sisanya residu bersyarat. -inf untuk phi yang tidak stasioner.
+    """
+    n, length = x.shape
+    p = phi.shape[1]
+    loglik = np.full(n, -np.inf)
+    mean = np.zeros(n)
+    stationary = _is_stationary(phi)
+    if not stationary.any():
+        return loglik, mean
+    x, phi = x[stationary], phi[stationary]
+
+    gamma = _ar_autocov(phi)
+    cov = gamma[:, np.abs(np.arange(p)[:, None] - np.arange(p)[None, :])]
+    cov_inv = np.linalg.inv(cov)
+    head = x[:, :p]
+    design, target = _lag_design(x, p, False)
+    resid = target - np.einsum('ntp,np->nt', design, phi)
+
+    # S(mu) = Σ(resid - mu·w)² + (head - mu)' Γ⁻¹ (head - mu), kuadratik dalam mu
+    if with_const:
+        w = 1.0 - phi.sum(axis=1)
+        g = np.einsum('npq,nq->n', cov_inv, head)
+        b = w * resid.sum(axis=1) + g
+        c = (length - p) * w ** 2 + cov_inv.sum(axis=(1, 2))
+        mu = b / c
+        resid = resid - (mu * w)[:, None]
+        head = head - mu[:, None]
+        mean[stationary] = mu
+
+    ssr = np.einsum('nt,nt->n', resid, resid) + np.einsum('np,npq,nq->n', head, cov_inv, head)
+    _, logdet = np.linalg.slogdet(cov)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        loglik[stationary] = -0.5 * length * np.log(ssr / length) - 0.5 * logdet
+    return loglik, mean
+
+
+def _refine_mle(x, phi, with_const):
+    """Newton (turunan beda-hingga, backtracking) dari phi least squares ke MLE eksak, batch.
+
+    Mengembalikan (phi, mean, converged); seri yang tidak konvergen dikembalikan ke statsmodels.
+    """
+    n, p = phi.shape
+    phi = phi.copy()
+    current, _ = _profile_loglik(x, phi, with_const)
+    active = np.isfinite(current)
+    converged = np.zeros(n, dtype=bool)
+    eye = np.eye(p) * _FD_STEP
+
+    for _ in range(MLE_MAX_ITER):
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        xa, pa, fa = x[idx], phi[idx], current[idx]
+
+        def f(delta):
+            return _profile_loglik(xa, pa + delta, with_const)[0]
+
+        plus = np.stack([f(eye[i]) for i in range(p)], axis=1)
+        minus = np.stack([f(-eye[i]) for i in range(p)], axis=1)
+        grad = (plus - minus) / (2 * _FD_STEP)
+        hess = np.empty((len(idx), p, p))
+        for i in range(p):
+            hess[:, i, i] = (plus[:, i] - 2 * fa + minus[:, i]) / _FD_STEP ** 2
+            for j in range(i + 1, p):
+                cross = (f(eye[i] + eye[j]) - f(eye[i] - eye[j]) - f(eye[j] - eye[i]) + f(-eye[i] - eye[j]))
+                hess[:, i, j] = hess[:, j, i] = cross / (4 * _FD_STEP ** 2)
+
+        # Titik beda-hingga di luar daerah stasioner atau Hessian tidak definit negatif -> statsmodels
+        usable = np.isfinite(grad).all(axis=1) & np.isfinite(hess).all(axis=(1, 2))
+        usable[usable] &= np.all(np.linalg.eigvalsh(hess[usable]) < 0, axis=1)
+        step = np.zeros_like(pa)
+        if usable.any():
+            step[usable] = -np.linalg.solve(hess[usable], grad[usable][..., None])[..., 0]
+
+        done = usable & (np.abs(step).max(axis=1) < MLE_TOL)
+        converged[idx[done]] = True
+        active[idx[~usable | done]] = False
+
+        moving = usable & ~done
+        scale = np.ones(len(idx))
+        accepted = ~moving
+        for _ in range(30):
+            if accepted.all():
+                break
+            trial = pa + scale[:, None] * step
+            value, _ = _profile_loglik(xa, trial, with_const)
+            better = ~accepted & (value >= fa - 1e-12)
+            pa[better] = trial[better]
+            fa[better] = value[better]
+            accepted |= better
+            scale[~accepted] *= 0.5
+        active[idx[~accepted]] = False
+        phi[idx], current[idx] = pa, fa
+
+    _, mean = _profile_loglik(x, phi, with_const)
+    return phi, mean, converged
+
+
+def fit_batch(values, order, exact=True):
+    """Estimasi koefisien AR untuk banyak seri sepanjang sama (n, T) secara batch.
+
+    Least squares batch memberi titik awal; dengan exact=True koefisien lalu disempurnakan
+    ke MLE Gaussian eksak (likelihood yang sama dengan ARIMA(...).fit() di statsmodels).
+    Mengembalikan (coef, ok): coef berbentuk (n, p[+1]) dengan konstanta di kolom terakhir untuk d=0,
+    ok=False untuk seri yang tidak bisa ditangani fast path (NaN, singular, non-stasioner, tidak konvergen).
+    """
+    p, d, _ = order
+    values = np.asarray(values, dtype=np.float64)
+    x = np.diff(values, axis=1) if d == 1 else values
+    with_const = d == 0
+    # d=0: seri dipusatkan dulu agar level besar tidak menghabiskan presisi likelihood
+    center = np.nan_to_num(np.nanmean(x, axis=1)) if with_const and x.size else np.zeros(len(x))
+    x = x - center[:, None]
+
+    n_params = p + int(with_const)
+    ok = ~np.isnan(values).any(axis=1) & (x.shape[1] - p > n_params)
+    if x.shape[1] - p <= 0:
+        return np.full((len(values), n_params), np.nan), np.zeros(len(values), dtype=bool)
+
+    design, target = _lag_design(np.nan_to_num(x), p, with_const)
+    xtx = np.einsum('ntp,ntq->npq', design, design)
+    xty = np.einsum('ntp,nt->np', design, target)
+
+    coef = np.full((len(values), n_params), np.nan)
+    well_conditioned = np.abs(np.linalg.det(xtx)) > 1e-12
+    solvable = ok & well_conditioned
+    if solvable.any():
+        coef[solvable] = np.linalg.solve(xtx[solvable], xty[solvable][..., None])[..., 0]
+    ok = solvable.copy()
+    ok[solvable] &= _is_stationary(coef[solvable, :p])
+
+    if exact and ok.any():
+        phi, mean, converged = _refine_mle(x[ok], coef[ok, :p], with_const)
+        refined = coef[ok]
+        refined[:, :p] = phi
+        if with_const:
+            # Konstanta rekursi: c = mu·(1 - Σphi)
+            refined[:, p] = mean * (1.0 - phi.sum(axis=1))
+        coef[ok] = refined
+        ok[ok] = converged
+    if with_const:
+        coef[:, p] += center * (1.0 - coef[:, :p].sum(axis=1))
+    coef[~ok] = np.nan
+    return coef, ok
+
+
+def forecast_batch(values, order, steps, coef=None):
+    """Forecast multi-step rekursif untuk semua seri sekaligus; (forecast (n, steps), ok (n,))."""
+    p, d, _ = order
+    values = np.asarray(values, dtype=np.float64)
+    if coef is None:
+        coef, ok = fit_batch(values, order)
+    else:
+        ok = ~np.isnan(coef).any(axis=1)
+
+    x = np.diff(values, axis=1) if d == 1 else values
+    window = x[:, -p:][:, ::-1].copy()  # window[:, 0] = observasi terakhir
+    phi = coef[:, :p]
+    const = coef[:, p] if d == 0 else 0.0
+
+    predicted = np.empty((len(values), steps))
+    for step in range(steps):
+        nxt = np.einsum('np,np->n', phi, window) + const
+        predicted[:, step] = nxt
+        window = np.concatenate([nxt[:, None], window[:, :-1]], axis=1)
+
+    if d == 1:
+        predicted = values[:, -1:] + np.cumsum(predicted, axis=1)
+    predicted[~ok] = np.nan
+    return predicted, ok
+
+
+def validate_and_forecast_batch(values, order, test_size, horizon):
+    """Validasi hold-out (latih pada T-test_size) + proyeksi dari seluruh histori, batch.
+
+    Mengembalikan (validation, forecast, mape, ok).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    validation, ok_train = forecast_batch(values[:, :-test_size], order, test_size)
+    forecast, ok_full = forecast_batch(values, order, horizon)
+    actual = values[:, -test_size:]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mape = np.mean(np.abs((actual - validation) / actual), axis=1) * 100
+    return validation, forecast, mape, ok_train & ok_full
+
+
+def walk_forward_batch(values, order, n_origins, horizon=1):
+    """Validasi walk-forward: untuk tiap origin, latih ulang lalu prediksi `horizon` langkah.
+
+    Mengembalikan array (n, n_origins, horizon) berisi prediksi (NaN jika fast path gagal)
+    dan array aktual dengan bentuk yang sama.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n, length = values.shape
+    predicted = np.full((n, n_origins, horizon), np.nan)
+    actual = np.full((n, n_origins, horizon), np.nan)
+    for k in range(n_origins):
+        cut = length - n_origins - horizon + 1 + k
+        predicted[:, k, :], _ = forecast_batch(values[:, :cut], order, horizon)
+        actual[:, k, :] = values[:, cut:cut + horizon]
+    return predicted, actual
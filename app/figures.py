@@ -0,0 +1,148 @@
+from aggregates import cube_series, cube_years
+from analysis import GROWTH_BASE_YEAR, GROWTH_METRICS, growth_label
+from lazy_imports import lazy_import
+
+
+def _use_plotly_white(_module):
+    # Set Plotly template for professional look
+    import plotly.io as pio
+    pio.templates.default = "plotly_white"
+
+
+# Plotly baru di-import saat figure pertama dibangun (lihat lazy_imports.py)
+px = lazy_import("plotly.express", section="plots", on_load=_use_plotly_white)
+go = lazy_import("plotly.graph_objects", section="plots", on_load=_use_plotly_white)
+
+GROUP_COLORS = {'G7': '#347C98', 'BRICS': '#E36414'}
+
+# Builder figure di modul ini murni: tidak memanggil Streamlit dan tidak bergantung pada bahasa.
+# Judul & label Plotly tetap dalam bahasa Inggris.
+
+
+def fossil_share_trend_figure(cube):
+    """Plot 1: Tren Pangsa Fosil (Persentase)"""
+    df_group_trend = cube_series(cube, 'fossil_share_energy', 'mean')
+    fig = px.line(df_group_trend, x='year', y='fossil_share_energy', color='Group', labels={'fossil_share_energy': 'Fossil Share (%)', 'year': 'Year'}, markers=True, color_discrete_map=GROUP_COLORS)
+    fig.update_layout(title_text="Average Fossil Energy Share Trend (2000-2022)", title_x=0.5, yaxis_title="Fossil Share (%)")
+    return fig
+
+
+def fossil_absolute_trend_figure(cube, crossover_year):
+    """Plot 2: Konsumsi Fosil Absolut (TWh) - Executive Grade"""
+    df_fossil_absolute_trend = cube_series(cube, 'fossil_fuel_consumption', 'sum')
+    fig = px.line(df_fossil_absolute_trend, x='year', y='fossil_fuel_consumption', color='Group', labels={'fossil_fuel_consumption': 'Total Fossil Consumption (TWh)', 'year': 'Year'}, markers=True, line_shape='spline', color_discrete_map=GROUP_COLORS)
+    if crossover_year and crossover_year > cube_years(cube).min():
+        fig.add_vline(x=crossover_year, line_dash="dash", line_color="#7A7A7A", annotation_text=f"Crossover ({int(crossover_year)})", annotation_position="top left", annotation_font_color="#7A7A7A")
+    fig.update_layout(title_text="Total Fossil Energy Consumption (TWh)", title_x=0.5, yaxis_tickformat=',.2s', hovermode="x unified")
+    return fig
+
+
+def renewable_growth_figure(store, base_year=GROWTH_BASE_YEAR, end_year=None):
+    """Plot 3: Pertumbuhan Energi Terbarukan Absolut (Solar & Wind), dibaca dari TensorStore"""
+    latest_year = int(store.years[-1]) if end_year is None else end_year
+    df_growth_melt = store.growth_frame(GROWTH_METRICS, base_year, latest_year, label=growth_label)
+
+    fig = px.bar(
+        df_growth_melt.sort_values(['Growth_TWh'], ascending=False),
+        x='country',
+        y='Growth_TWh',
+        color='Source',
+        facet_col='Source',
+        facet_col_wrap=2,
+        labels={'Growth_TWh': 'Consumption Growth (TWh)', 'country': 'Country'},
+        text_auto='.3s',
+        color_discrete_map={'Solar': '#FFC300', 'Wind': '#4CAF50'}
+    )
+    fig.update_layout(title_text=f"Absolute Growth of Solar and Wind Energy ({base_year}-{latest_year})", title_x=0.5, yaxis_title="Growth (TWh)")
+    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+    return fig
+
+
+def energy_efficiency_figure(cube):
+    """Plot 4: Efisiensi Energi (Energy per GDP)"""
+    df_efficiency_trend = cube_series(cube, 'energy_per_gdp', 'mean')
+    fig = px.line(df_efficiency_trend, x='year', y='energy_per_gdp', color='Group', labels={'energy_per_gdp': 'Energy per GDP (koe/$) - Lower is More Efficient', 'year': 'Year'}, markers=True, color_discrete_map=GROUP_COLORS)
+    fig.update_layout(title_text="Energy Intensity Trend (Energy per GDP)", title_x=0.5, yaxis_title="Energy Intensity (koe/$)")
+    return fig
+
+
+def low_carbon_share_figure(cube):
+    """Plot 5: Pangsa Energi Rendah Karbon (The Sustainability Test)"""
+    df_low_carbon = cube_series(cube, 'low_carbon_share_energy', 'mean')
+    fig = px.line(
+        df_low_carbon,
+        x='year',
+        y='low_carbon_share_energy',
+        color='Group',
+        title='Low Carbon Energy Share (%)',
+        labels={'low_carbon_share_energy': 'Low Carbon Energy Share (%)', 'year': 'Year'},
+        markers=True,
+        color_discrete_map=GROUP_COLORS
+    )
+    fig.update_layout(title_x=0.5, yaxis_title="Low Carbon Share (%)", yaxis_range=[0, df_low_carbon['low_carbon_share_energy'].max() * 1.1])
+    return fig
+
+
+def fossil_share_forecast_figure(forecast_df, groups=None):
+    """Plot 6: Histori & proyeksi ARIMA pangsa fosil, dibaca dari output forecasting engine."""
+    groups = list(GROUP_COLORS) if groups is None else list(groups)
+    colors = [(group, GROUP_COLORS.get(group, '#7A7A7A')) for group in groups]
+    df_combined_plot = forecast_df[
+        forecast_df['kind'].isin(['history', 'forecast']) & forecast_df['series_id'].isin(groups)
+    ]
+
+    fig = go.Figure()
+
+    for group, color in colors:
+        df_hist = df_combined_plot[(df_combined_plot['series_id'] == group) & (df_combined_plot['kind'] == 'history')]
+        fig.add_trace(go.Scatter(x=df_hist['year'], y=df_hist['value'],
+                                 mode='lines+markers', name=f'{group} (Historical)',
+                                 line=dict(color=color, width=3)))
+
+    for group, color in colors:
+        df_pred = df_combined_plot[(df_combined_plot['series_id'] == group) & (df_combined_plot['kind'] == 'forecast')]
+        fig.add_trace(go.Scatter(x=df_pred['year'], y=df_pred['value'],
+                                 mode='lines+markers', name=f'{group} (Projection)',
+                                 line=dict(color=color, dash='dash', width=2),
+                                 marker=dict(symbol='diamond')))
+
+    fig.update_layout(
+        title='Projected Average Fossil Share (%) until 2030',
+        xaxis_title='Year',
+        yaxis_title='Average Fossil Share (%)',
+        title_x=0.5,
+        yaxis_range=[df_combined_plot['value'].min() * 0.9, df_combined_plot['value'].max() * 1.1],
+        hovermode="x unified",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
+
+def country_trend_figure(df, metric='fossil_share_energy', label='Fossil Share (%)'):
+    """Tren satu metrik per negara (dipakai laporan PDF per blok/negara)."""
+    fig = px.line(df.sort_values(['country', 'year']), x='year', y=metric, color='country', labels={metric: label, 'year': 'Year', 'country': 'Country'}, markers=True)
+    fig.update_layout(title_text=f"{label} by Country", title_x=0.5, yaxis_title=label)
+    return fig
+
+
+def correlation_heatmap_figure(year_moments, scope='All', start_year=None, end_year=None):
+    """Heatmap korelasi variabel kunci, dihitung dari momen kumulatif (moments.YearMoments)"""
+    window = year_moments.window(start_year, end_year)
+    corr = window.total().corr_frame() if scope == 'All' else window.corr_frame(scope)
+    first = int(year_moments.years[0]) if start_year is None else start_year
+    last = int(year_moments.years[-1]) if end_year is None else end_year
+    fig = px.imshow(corr.round(2), text_auto='.2f', color_continuous_scale='RdBu_r', zmin=-1, zmax=1, aspect='auto', labels={'color': 'Correlation Coefficient'})
+    fig.update_layout(title_text=f"Correlation between Key Energy Transition Variables - {scope} ({first}-{last})", title_x=0.5)
+    return fig
+
+
+FIGURE_BUILDERS = {
+    'fossil_share_trend': fossil_share_trend_figure,
+    'fossil_absolute_trend': fossil_absolute_trend_figure,
+    'renewable_growth': renewable_growth_figure,
+    'energy_efficiency': energy_efficiency_figure,
+    'low_carbon_share': low_carbon_share_figure,
+    'fossil_share_forecast': fossil_share_forecast_figure,
+    'country_trend': country_trend_figure,
+    'correlation_heatmap': correlation_heatmap_figure,
+}
@@ -0,0 +1,195 @@
+import atexit
+import os
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from fast_arima import can_fast_path, validate_and_forecast_batch
+from lazy_imports import lazy_import
+from model_store import model_key
+
+# Di bawah ambang ini model dilatih langsung di proses pemanggil (overhead pool tidak sebanding)
+MIN_PARALLEL_SERIES = 8
+
+FORECAST_COLUMNS = ['series_id', 'year', 'value', 'kind']
+STATUS_COLUMNS = ['series_id', 'status', 'method', 'mape', 'n_obs', 'error']
+
+# Satu pool per jumlah worker: pool yang masih dipegang thread lain tidak pernah dimatikan
+_POOLS = {}
+_POOL_LOCK = threading.Lock()
+
+# statsmodels (+ scipy) hanya di-import jika fast path tidak bisa dipakai
+arima_model = lazy_import('statsmodels.tsa.arima.model', section='forecast')
+
+
+def get_pool(max_workers=None):
+    """Pool proses yang dipakai ulang antar panggilan (start-up worker hanya sekali).
+
+    Dipakai juga oleh backtest.py. Setiap jumlah worker punya pool sendiri, sehingga permintaan
+    dengan `max_workers` berbeda tidak mematikan pool yang sedang dipakai thread lain.
+    """
+    workers = max_workers or os.cpu_count()
+    with _POOL_LOCK:
+        pool = _POOLS.get(workers)
+        if pool is None:
+            pool = _POOLS[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+
+def shutdown_pool():
+    with _POOL_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_pool)
+
+
+def mape(actual, predicted):
+    """Mean Absolute Percentage Error dalam persen."""
+    actual = np.asarray(actual, dtype=np.float64)
+    predicted = np.asarray(predicted, dtype=np.float64)
+    return float(np.mean(np.abs((actual - predicted) / actual)) * 100)
+
+
+def _fit_arima(values, order, steps):
+    # Import statsmodels di luar catch_warnings: saat di-import ia memasang filter "always" untuk
+    # ModelWarning yang akan mengalahkan 'ignore' di bawah (warning start_params bocor ke output)
+    arima = arima_model.ARIMA
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        result = arima(values, order=order).fit()
+    return np.asarray(result.forecast(steps), dtype=np.float64)
+
+
+def _result_rows(series_id, years, validation, forecast):
+    last_year = int(years[-1])
+    rows = [(series_id, int(y), float(v), 'validation') for y, v in zip(years[-len(validation):], validation)]
+    rows.extend((series_id, last_year + i + 1, float(v), 'forecast') for i, v in enumerate(forecast))
+    return rows
+
+
+def fit_series(task):
+    """Validasi hold-out + proyeksi untuk satu seri. Kegagalan dikembalikan, tidak ditelan."""
+    series_id, years, values, order, test_size, horizon = task
+    status = {'series_id': series_id, 'status': 'ok', 'method': 'statsmodels', 'mape': np.nan,
+              'n_obs': len(values), 'error': None}
+    rows = []
+    try:
+        if len(values) <= test_size + sum(order):
+            raise ValueError(f"series too short ({len(values)} obs) for order={order}, test_size={test_size}")
+        if np.isnan(values).any():
+            raise ValueError("series contains NaN")
+
+        # 1. Validasi: latih pada data train, prediksi tahun-tahun test
+        validation = _fit_arima(values[:-test_size], order, test_size)
+        status['mape'] = mape(values[-test_size:], validation)
+
+        # 2. Proyeksi: latih ulang pada seluruh histori, prediksi `horizon` tahun ke depan
+        forecast = _fit_arima(values, order, horizon)
+
+        rows = _result_rows(series_id, years, validation, forecast)
+    except Exception as e:
+        status['status'] = 'failed'
+        status['error'] = f"{type(e).__name__}: {e}"
+    return rows, status
+
+
+def fit_fast_batch(tasks, order, test_size, horizon):
+    """Fast path NumPy untuk seri sepanjang sama; hasil None untuk seri yang perlu fallback."""
+    results = [None] * len(tasks)
+    by_length = {}
+    for i, task in enumerate(tasks):
+        by_length.setdefault(len(task[2]), []).append(i)
+
+    for length, idx in by_length.items():
+        if length <= test_size + sum(order):
+            continue
+        values = np.stack([tasks[i][2] for i in idx])
+        validation, forecast, mapes, ok = validate_and_forecast_batch(values, order, test_size, horizon)
+        for row, i in enumerate(idx):
+            if not ok[row]:
+                continue
+            series_id, years = tasks[i][0], tasks[i][1]
+            status = {'series_id': series_id, 'status': 'ok', 'method': 'fast', 'mape': float(mapes[row]),
+                      'n_obs': length, 'error': None}
+            results[i] = (_result_rows(series_id, years, validation[row], forecast[row]), status)
+    return results
+
+
+def _iter_tasks(df, id_col, time_col, value_col, order, test_size, horizon):
+    df = df.sort_values([id_col, time_col])
+    for series_id, part in df.groupby(id_col, observed=True, sort=False):
+        yield (
+            series_id,
+            part[time_col].to_numpy(),
+            part[value_col].to_numpy(dtype=np.float64),
+            tuple(order),
+            test_size,
+            horizon,
+        )
+
+
+def forecast_many(df, value_col, id_col='Group', time_col='year', order=(1, 1, 0),
+                  test_size=3, horizon=8, max_workers=None, store=None, method='auto'):
+    """Melatih ARIMA untuk banyak seri sekaligus (paralel lintas proses).
+
+    method='auto' memakai fast path NumPy (fast_arima) untuk ARIMA(p,d<=1,0) dan jatuh ke
+    statsmodels hanya untuk seri yang tidak bisa ditangani; 'statsmodels' selalu memakai MLE penuh.
+
+    Jika `store` (ModelStore) diberikan, hasil per seri dipakai ulang selama isi seri dan
+    spesifikasi model sama; hanya seri yang berubah yang dilatih.
+
+    Mengembalikan (forecast_df, status_df): forecast_df berisi baris history/validation/forecast
+    dalam format tidy, status_df berisi MAPE dan pesan error per seri.
+    """
+    tasks = list(_iter_tasks(df, id_col, time_col, value_col, order, test_size, horizon))
+    results = [None] * len(tasks)
+
+    # Seri yang datanya & spesifikasi modelnya tidak berubah diambil dari store, tidak dilatih ulang
+    keys = [None] * len(tasks)
+    if store is not None:
+        params = {'order': list(order), 'test_size': test_size, 'horizon': horizon, 'method': method}
+        for i, (series_id, years, values, *_) in enumerate(tasks):
+            keys[i] = model_key('arima', params, years, values)
+            cached = store.get(keys[i])
+            if cached is not None:
+                rows, status = cached
+                results[i] = ([(series_id,) + row[1:] for row in rows], dict(status, series_id=series_id))
+    pending = [i for i, result in enumerate(results) if result is None]
+    fitted = {}
+
+    if method == 'auto' and can_fast_path(order):
+        fast_results = fit_fast_batch([tasks[i] for i in pending], order, test_size, horizon)
+        fitted.update((i, result) for i, result in zip(pending, fast_results) if result is not None)
+
+    fallback = [i for i in pending if i not in fitted]
+    fallback_tasks = [tasks[i] for i in fallback]
+    if len(fallback_tasks) < MIN_PARALLEL_SERIES or max_workers == 1:
+        fitted.update(zip(fallback, map(fit_series, fallback_tasks)))
+    else:
+        chunksize = max(1, len(fallback_tasks) // (4 * (max_workers or os.cpu_count())))
+        fitted.update(zip(fallback, get_pool(max_workers).map(fit_series, fallback_tasks, chunksize=chunksize)))
+
+    for i, result in fitted.items():
+        results[i] = result
+        if store is not None and result[1]['status'] == 'ok':
+            store.put(keys[i], result, evict=False)
+    if store is not None and fitted:
+        store.evict()
+
+    history = df[[id_col, time_col, value_col]].rename(
+        columns={id_col: 'series_id', time_col: 'year', value_col: 'value'}
+    ).assign(kind='history')
+    predicted = pd.DataFrame([row for rows, _ in results for row in rows], columns=FORECAST_COLUMNS)
+    forecast_df = pd.concat([history, predicted], ignore_index=True)
+    forecast_df['year'] = forecast_df['year'].astype('int64')
+    forecast_df['value'] = forecast_df['value'].astype('float64')
+
+    status_df = pd.DataFrame([status for _, status in results], columns=STATUS_COLUMNS)
+    return forecast_df, status_df
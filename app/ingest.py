@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Snapshot turunan disimpan di folder .cache di samping file CSV sumber
+CACHE_DIR_NAME = ".cache"
+HASH_BLOCK_SIZE = 1 << 20
+# File di atas ambang ini dibaca per chunk (streaming) agar puncak memori dibatasi ukuran chunk
+STREAM_THRESHOLD_BYTES = int(float(os.environ.get("ENERGY_STREAM_THRESHOLD_MB", 512)) * 2**20)
+STREAM_CHUNK_ROWS = int(os.environ.get("ENERGY_STREAM_CHUNK_ROWS", 250_000))
+
+
+class MissingColumnsError(KeyError):
+    """Kolom kunci tidak ditemukan di header CSV."""
+
+    def __init__(self, missing_cols):
+        super().__init__(missing_cols)
+        self.missing_cols = list(missing_cols)
+
+
+def cache_dir_for(file_path):
+    """Mengembalikan folder cache untuk file data tertentu."""
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR_NAME)
+
+
+def _write_json_atomic(path, payload):
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w") as fh:
+        json.dump(payload, fh)
+    os.replace(tmp_path, path)
+
+
+def file_fingerprint(file_path):
+    """SHA-256 isi file; dihitung ulang hanya jika mtime/ukuran file berubah."""
+    stat = os.stat(file_path)
+    cache_dir = cache_dir_for(file_path)
+    sidecar = os.path.join(cache_dir, os.path.basename(file_path) + ".fingerprint.json")
+
+    try:
+        with open(sidecar) as fh:
+            cached = json.load(fh)
+        if cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            return cached["sha256"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as fh:
+        for block in iter(lambda: fh.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    sha256 = digest.hexdigest()
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _write_json_atomic(sidecar, {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": sha256})
+    except OSError:
+        # Folder data read-only: fingerprint tetap valid, hanya tidak di-cache
+        pass
+    return sha256
+
+
+def _spec_key(columns, countries, start_year, end_year):
+    spec = json.dumps([list(columns), sorted(countries), int(start_year), int(end_year)])
+    return hashlib.sha256(spec.encode()).hexdigest()[:12]
+
+
+def _column_dtypes(columns):
+    """country -> category, year -> int16, semua metrik -> float32."""
+    dtypes = {}
+    for col in columns:
+        if col == "country":
+            dtypes[col] = "category"
+        elif col == "year":
+            dtypes[col] = "int16"
+        else:
+            dtypes[col] = "float32"
+    return dtypes
+
+
+def _check_columns(file_path, columns):
+    header = pd.read_csv(file_path, nrows=0).columns
+    missing_cols = [col for col in columns if col not in header]
+    if missing_cols:
+        raise MissingColumnsError(missing_cols)
+
+
+def _parse_csv(file_path, columns, countries, start_year, end_year):
+    _check_columns(file_path, columns)
+
+    # Hanya kolom yang dibutuhkan yang di-parse, langsung dengan dtype ketat
+    df = pd.read_csv(file_path, usecols=list(columns), dtype=_column_dtypes(columns))
+    mask = df["country"].isin(countries) & df["year"].between(start_year, end_year)
+    df = df.loc[mask, list(columns)].reset_index(drop=True)
+    df["country"] = df["country"].cat.remove_unused_categories()
+    return df
+
+
+def default_reducer(column):
+    """Cara menggabungkan baris sub-tahunan: konsumsi (TWh) dijumlah, selain itu dirata-rata."""
+    return "sum" if column.endswith("_consumption") else "mean"
+
+
+def stream_energy_columns(file_path, columns, countries, start_year, end_year,
+                          chunksize=STREAM_CHUNK_ROWS, period_col=None, reducers=None):
+    """Membaca CSV per chunk dan mereduksinya ke satu baris per (negara, tahun).
+
+    Setiap chunk difilter (kolom, negara, tahun) lalu dijumlahkan ke akumulator padat
+    negara x tahun x metrik (jumlah & banyaknya nilai valid), sehingga puncak memori
+    ditentukan oleh `chunksize`, bukan ukuran file. Data bulanan/per jam menjadi tahunan
+    menurut `reducers` (default: default_reducer); untuk data tahunan hasilnya sama dengan
+    _parse_csv. `period_col` (mis. 'date') dipakai sebagai sumber tahun jika file tidak
+    memiliki kolom year.
+    """
+    metrics = [col for col in columns if col not in ("country", "year")]
+    source_cols = ["country", period_col or "year", *metrics]
+    _check_columns(file_path, source_cols)
+    reducers = {col: (reducers or {}).get(col, default_reducer(col)) for col in metrics}
+
+    countries = sorted(set(countries))
+    country_index = pd.Index(countries)
+    n_countries, n_years = len(countries), int(end_year) - int(start_year) + 1
+    cells = n_countries * max(n_years, 0)
+    sums = np.zeros((len(metrics), cells))
+    counts = np.zeros((len(metrics), cells), dtype=np.int64)
+    rows_seen = np.zeros(cells, dtype=np.int64)
+
+    dtypes = _column_dtypes(source_cols)
+    if period_col:
+        dtypes[period_col] = "object"
+    for chunk in pd.read_csv(file_path, usecols=source_cols, dtype=dtypes, chunksize=chunksize):
+        if period_col:
+            years = pd.to_datetime(chunk[period_col], errors="coerce").dt.year
+        else:
+            years = chunk["year"]
+        years = years.to_numpy(dtype=np.float64, na_value=np.nan)
+        codes = country_index.get_indexer(chunk["country"])
+        mask = (codes >= 0) & (years >= start_year) & (years <= end_year)
+        if not mask.any():
+            continue
+
+        cell = codes[mask].astype(np.int64) * n_years + (years[mask].astype(np.int64) - int(start_year))
+        rows_seen += np.bincount(cell, minlength=cells)
+        values = chunk[metrics].to_numpy(dtype=np.float64)[mask]
+        valid = ~np.isnan(values)
+        for i in range(len(metrics)):
+            sums[i] += np.bincount(cell, weights=np.where(valid[:, i], values[:, i], 0.0), minlength=cells)
+            counts[i] += np.bincount(cell, weights=valid[:, i], minlength=cells).astype(np.int64)
+
+    present = np.flatnonzero(rows_seen)
+    country_codes, year_offsets = np.divmod(present, max(n_years, 1))
+    df = pd.DataFrame({
+        "country": pd.Categorical.from_codes(country_codes, categories=countries),
+        "year": (year_offsets + int(start_year)).astype("int16"),
+    })
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for i, col in enumerate(metrics):
+            total, n = sums[i, present], counts[i, present]
+            value = total / n if reducers[col] == "mean" else total
+            df[col] = np.where(n > 0, value, np.nan).astype("float32")
+    df = df[list(columns)]
+    df["country"] = df["country"].cat.remove_unused_categories()
+    return df
+
+
+def read_entities(file_path):
+    """Daftar entitas (kolom country) di CSV tanpa mem-parse kolom lain."""
+    countries = pd.read_csv(file_path, usecols=["country"], dtype={"country": "category"})["country"]
+    return countries.cat.categories.tolist()
+
+
+def read_energy_columns(file_path, columns, countries, start_year, end_year, chunksize=None):
+    """Membaca kolom & baris terpilih dari CSV OWID, memakai snapshot Parquet jika masih valid.
+
+    File besar (> STREAM_THRESHOLD_BYTES) atau `chunksize` eksplisit memakai stream_energy_columns.
+    """
+    if chunksize is None and os.path.getsize(file_path) > STREAM_THRESHOLD_BYTES:
+        chunksize = STREAM_CHUNK_ROWS
+    sha256 = file_fingerprint(file_path)
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    spec_key = _spec_key(columns, countries, start_year, end_year)
+    if chunksize:
+        # Hasil streaming sudah direduksi per (negara, tahun): snapshot terpisah dari hasil parse biasa
+        spec_key = f"{spec_key}s"
+    cache_dir = cache_dir_for(file_path)
+    snapshot = os.path.join(cache_dir, f"{stem}-{sha256[:16]}-{spec_key}.parquet")
+
+    if os.path.exists(snapshot):
+        try:
+            return pd.read_parquet(snapshot, engine="pyarrow", memory_map=True)
+        except (OSError, ValueError):
+            # Snapshot rusak/terpotong: parse ulang dari CSV
+            pass
+
+    if chunksize:
+        df = stream_energy_columns(file_path, columns, countries, start_year, end_year, chunksize)
+    else:
+        df = _parse_csv(file_path, columns, countries, start_year, end_year)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Hapus snapshot lama dari versi CSV sebelumnya dengan spesifikasi yang sama
+        for name in os.listdir(cache_dir):
+            if name.startswith(f"{stem}-") and name.endswith(f"-{spec_key}.parquet"):
+                os.remove(os.path.join(cache_dir, name))
+        tmp_path = f"{snapshot}.tmp-{os.getpid()}"
+        df.to_parquet(tmp_path, engine="pyarrow", index=False)
+        os.replace(tmp_path, snapshot)
+    except (OSError, ImportError):
+        pass
+    return df
@@ -0,0 +1,85 @@
+import contextlib
+import contextvars
+import importlib
+import sys
+import threading
+import time
+import types
+
+# Section yang sedang dirender; import berat dicatat atas nama section ini
+_CURRENT_SECTION = contextvars.ContextVar("import_section", default=None)
+_LOCK = threading.RLock()
+_REGISTRY = []
+_IMPORT_TIMES = []
+
+
+class LazyModule(types.ModuleType):
+    """Proxy modul yang baru meng-import modul aslinya saat atribut pertama kali diakses."""
+
+    def __init__(self, name, section, on_load=None):
+        super().__init__(name)
+        self.__dict__["_lazy_section"] = section
+        self.__dict__["_lazy_on_load"] = on_load
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is not None:
+            return module
+        with _LOCK:
+            module = self.__dict__["_lazy_module"]
+            if module is not None:
+                return module
+            name = self.__name__
+            already_loaded = name in sys.modules
+            start = time.perf_counter()
+            module = importlib.import_module(name)
+            on_load = self.__dict__["_lazy_on_load"]
+            if on_load is not None:
+                on_load(module)
+            elapsed = time.perf_counter() - start
+            if not already_loaded:
+                section = _CURRENT_SECTION.get() or self.__dict__["_lazy_section"]
+                _IMPORT_TIMES.append({"section": section, "module": name, "seconds": elapsed})
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name, section="core", on_load=None):
+    """Mendaftarkan modul berat untuk di-import saat pertama dipakai oleh sebuah section."""
+    module = LazyModule(name, section, on_load)
+    _REGISTRY.append(module)
+    return module
+
+
+@contextlib.contextmanager
+def import_section(name):
+    """Menandai section yang sedang dirender agar waktu import tercatat per section."""
+    token = _CURRENT_SECTION.set(name)
+    try:
+        yield
+    finally:
+        _CURRENT_SECTION.reset(token)
+
+
+def load_all():
+    """Memaksa semua modul lazy ter-import (dipakai oleh laporan waktu import / warm-up)."""
+    for module in list(_REGISTRY):
+        with import_section(module.__dict__["_lazy_section"]):
+            module._load()
+
+
+def import_report():
+    """Rincian waktu import: daftar {section, module, seconds} dan total per section."""
+    with _LOCK:
+        rows = list(_IMPORT_TIMES)
+    totals = {}
+    for row in rows:
+        totals[row["section"]] = totals.get(row["section"], 0.0) + row["seconds"]
+    return {"imports": rows, "sections": totals}
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+
+import numpy as np
+
+# Naikkan jika format hasil yang disimpan berubah, agar entri lama tidak terbaca
+STORE_VERSION = 2
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_ROOT = os.path.join("data", ".cache", "models")
+
+
+def model_key(family, params, *arrays):
+    """Kunci cache: hash dari isi seri input, keluarga model dan parameternya (order, horizon, ...)."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([STORE_VERSION, family, params], sort_keys=True, default=str).encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(str(array.dtype).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class ModelStore:
+    """Penyimpanan model/forecast di disk dengan batas ukuran LRU, dipakai lintas rerun & proses."""
+
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.pkl")
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                value = pickle.load(fh)
+        except Exception as exc:
+            # Entri rusak atau dari versi kode lama (AttributeError, ImportError, ...) = miss, lalu dihapus
+            if not isinstance(exc, OSError):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            with self._lock:
+                self.misses += 1
+            return default
+        try:
+            # mtime dipakai sebagai penanda "terakhir dipakai" untuk eviksi LRU
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value, evict=True):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+            with open(tmp_path, "wb") as fh:
+                pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        if evict:
+            self.evict()
+
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _entries(self):
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.endswith(".pkl"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """Hapus entri yang paling lama tidak dipakai sampai total ukuran <= max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return 0
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self):
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+_DEFAULT_STORE = None
+
+
+def default_store():
+    """Store bersama per proses; lokasi/ukuran bisa diatur lewat ENERGY_MODEL_CACHE(_MAX_MB)."""
+    global _DEFAULT_STORE
+    if _DEFAULT_STORE is None:
+        root = os.environ.get("ENERGY_MODEL_CACHE", DEFAULT_ROOT)
+        max_mb = os.environ.get("ENERGY_MODEL_CACHE_MAX_MB")
+        max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+        _DEFAULT_STORE = ModelStore(root, max_bytes)
+    return _DEFAULT_STORE
@@ -0,0 +1,254 @@
+"""Engine momen berjalan: korelasi, kovarians, rata-rata & std yang diperbarui secara inkremental.
+
+Statistik cukup (n, Σx, Σx², Σxy) disimpan per batch (entitas atau blok) untuk setiap pasangan
+metrik, dengan semantik pairwise-complete seperti DataFrame.corr(). Menambah atau membuang satu
+tahun hanya menambah/mengurangi momen tahun itu (O(batch x metrik²)), sehingga jendela bergeser
+dan tahun baru tidak perlu menghitung ulang seluruh jendela. Momen antar batch bisa dijumlahkan:
+korelasi per blok/global didapat dari momen per entitas tanpa membaca data mentah lagi.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+CORR_METRICS = [
+    'fossil_share_energy', 'low_carbon_share_energy',
+    'solar_consumption', 'wind_consumption',
+    'energy_per_gdp', 'fossil_fuel_consumption',
+    'gdp', 'population',
+]
+
+
+def _shift(values, axis=0, keepdims=False):
+    """Rata-rata per metrik (0 jika kosong) sebagai titik pusat momen."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nan_to_num(np.nanmean(values, axis=axis, keepdims=keepdims))
+
+
+def _block_moments(values, shift):
+    """Momen satu blok (batch, tahun, metrik), dijumlahkan atas sumbu tahun -> 4 x (batch, m, m)."""
+    valid = ~np.isnan(values)
+    z = np.where(valid, values - shift, 0.0)
+    v = valid.astype(np.float64)
+    return (
+        np.einsum('btm,btn->bmn', v, v),
+        np.einsum('btm,btn->bmn', z, v),
+        np.einsum('btm,btn->bmn', z * z, v),
+        np.einsum('btm,btn->bmn', z, z),
+    )
+
+
+class Moments:
+    """Momen pairwise per batch: n[b,i,j] = jumlah tahun dengan i & j terisi; sx[b,i,j] = Σx_i pada
+    tahun tersebut (sxx untuk x_i²); sxy[b,i,j] = Σx_i·x_j. Nilai disimpan setelah dikurangi
+    `shift` per metrik agar selisih jumlah kuadrat tetap stabil secara numerik."""
+
+    def __init__(self, n, sx, sxx, sxy, shift, metrics, labels=None):
+        self.n, self.sx, self.sxx, self.sxy = n, sx, sxx, sxy
+        self.shift = shift
+        self.metrics = list(metrics)
+        self.labels = list(range(len(n))) if labels is None else list(labels)
+
+    @classmethod
+    def empty(cls, n_batch, metrics, shift, labels=None):
+        shape = (n_batch, len(metrics), len(metrics))
+        return cls(*(np.zeros(shape) for _ in range(4)), np.asarray(shift, dtype=np.float64), metrics, labels)
+
+    @classmethod
+    def from_values(cls, values, metrics, labels=None, shift=None):
+        """values: (batch, tahun, metrik). `shift` default: rata-rata global per metrik."""
+        values = np.asarray(values, dtype=np.float64)
+        if shift is None:
+            shift = _shift(values.reshape(-1, values.shape[-1]))
+        state = cls.empty(values.shape[0], metrics, shift, labels)
+        return state.add(values)
+
+    @classmethod
+    def from_store(cls, store, metrics=CORR_METRICS, entities=None):
+        """Momen per entitas dari TensorStore (seluruh rentang tahun)."""
+        rows = store._rows(entities)
+        values = store.values[rows][:, :, [store.metric_index[m] for m in metrics]]
+        labels = store.entities if entities is None else list(entities)
+        return cls.from_values(values, metrics, labels)
+
+    # --- Pembaruan inkremental ---
+
+    @property
+    def parts(self):
+        return self.n, self.sx, self.sxx, self.sxy
+
+    def add(self, values):
+        """Menambahkan tahun (batch, tahun, metrik) ke momen, in-place."""
+        for total, part in zip(self.parts, _block_moments(np.asarray(values, dtype=np.float64), self.shift)):
+            total += part
+        return self
+
+    def remove(self, values):
+        """Membuang tahun yang sebelumnya ditambahkan (jendela bergeser), in-place."""
+        for total, part in zip(self.parts, _block_moments(np.asarray(values, dtype=np.float64), self.shift)):
+            total -= part
+        return self
+
+    def copy(self):
+        return Moments(*(array.copy() for array in self.parts), self.shift, self.metrics, self.labels)
+
+    def grouped(self, groups):
+        """Menjumlahkan momen batch menurut label grup (mis. Group per entitas) -> satu batch per grup.
+
+        Batch tanpa grup (None/NaN) tidak diikutkan.
+        """
+        codes, uniques = pd.factorize(pd.Series(list(groups), dtype=object))
+        return self.grouped_codes(codes, list(uniques))
+
+    def grouped_codes(self, codes, labels):
+        """Seperti grouped(), dengan kode grup yang sudah di-factorize: codes[b] = indeks di `labels`, -1 = tanpa grup."""
+        codes = np.asarray(codes, dtype=np.intp)
+        onehot = np.zeros((len(labels), len(codes)))
+        onehot[codes[codes >= 0], np.flatnonzero(codes >= 0)] = 1.0
+        parts = [np.einsum('gb,bmn->gmn', onehot, array) for array in self.parts]
+        return Moments(*parts, self.shift, self.metrics, list(labels))
+
+    def total(self, label='All'):
+        parts = [array.sum(axis=0, keepdims=True) for array in self.parts]
+        return Moments(*parts, self.shift, self.metrics, [label])
+
+    # --- Statistik (batch, m[, m]) ---
+
+    def _pairwise(self, min_periods):
+        n = np.where(self.n >= max(min_periods, 2), self.n, np.nan)
+        sx_t = np.swapaxes(self.sx, 1, 2)
+        cov = (self.sxy - self.sx * sx_t / n) / (n - 1)
+        var_i = (self.sxx - self.sx ** 2 / n) / (n - 1)
+        return cov, var_i, np.swapaxes(var_i, 1, 2)
+
+    def mean(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.diagonal(self.sx, axis1=1, axis2=2) / np.diagonal(self.n, axis1=1, axis2=2) + self.shift
+
+    def var(self, min_periods=2):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.diagonal(self._pairwise(min_periods)[1], axis1=1, axis2=2).clip(min=0)
+
+    def std(self, min_periods=2):
+        return np.sqrt(self.var(min_periods))
+
+    def cov(self, min_periods=2):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._pairwise(min_periods)[0]
+
+    def corr(self, min_periods=2):
+        """Korelasi Pearson pairwise-complete (sama dengan DataFrame.corr()) per batch."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov, var_i, var_j = self._pairwise(min_periods)
+            corr = cov / np.sqrt(var_i * var_j)
+        return np.clip(corr, -1.0, 1.0)
+
+    def corr_frame(self, label=None, min_periods=2):
+        """Matriks korelasi satu batch sebagai DataFrame metrik x metrik."""
+        index = 0 if label is None else self.labels.index(label)
+        return pd.DataFrame(self.corr(min_periods)[index], index=self.metrics, columns=self.metrics)
+
+
+def rolling_moments(values, window, metrics, labels=None):
+    """Generator (indeks tahun terakhir, Moments) untuk setiap jendela `window` tahun.
+
+    Setiap langkah membuang tahun tertua dan menambah tahun baru; objek Moments yang sama
+    diperbarui in-place (salin dengan .copy() jika perlu disimpan).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    state = Moments.from_values(values[:, :window], metrics, labels)
+    yield window - 1, state
+    for end in range(window, values.shape[1]):
+        state.remove(values[:, end - window:end - window + 1])
+        state.add(values[:, end:end + 1])
+        yield end, state
+
+
+def rolling_mean_std(values, window, min_periods=2):
+    """Rata-rata & std (ddof=1) bergulir per (batch, tahun, metrik) lewat selisih jumlah kumulatif."""
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    shift = _shift(values, axis=1, keepdims=True)
+    z = np.where(valid, values - shift, 0.0)
+
+    def windowed(array):
+        csum = np.concatenate([np.zeros_like(array[:, :1]), np.cumsum(array, axis=1)], axis=1)
+        out = csum[:, window:] - csum[:, :-window]
+        pad = np.full_like(array[:, :window - 1], np.nan)
+        return np.concatenate([pad, out], axis=1)
+
+    n = windowed(valid.astype(np.float64))
+    s = windowed(z)
+    ss = windowed(z * z)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(n >= 1, s / n + shift, np.nan)
+        var = np.where(n >= max(min_periods, 2), (ss - s * s / n) / (n - 1), np.nan)
+    return mean, np.sqrt(var.clip(min=0))
+
+
+class YearMoments:
+    """Momen kumulatif per tahun: momen rentang tahun mana pun = prefix[akhir] - prefix[awal-1].
+
+    Dipakai dashboard: slider rentang tahun dan pilihan blok dijawab dengan satu pengurangan
+    array, bukan corr() ulang atas frame mentah. Tahun baru cukup ditambahkan lewat append_year().
+    """
+
+    def __init__(self, prefix, years, shift, metrics, labels):
+        self.prefix = prefix
+        self.years = np.asarray(years)
+        self.shift = shift
+        self.metrics = list(metrics)
+        self.labels = list(labels)
+
+    @classmethod
+    def from_store(cls, store, metrics=CORR_METRICS, groups=None):
+        """Dari TensorStore; `groups` (default store.groups) menggabungkan entitas menjadi batch per blok."""
+        values = store.values[:, :, [store.metric_index[m] for m in metrics]].astype(np.float64)
+        groups = store.groups if groups is None else groups
+        shift = _shift(values.reshape(-1, len(metrics)))
+        # Factorize sekali; kode diteruskan apa adanya (grup None/NaN = -1, tidak diikutkan)
+        codes, labels = (None, store.entities) if groups is None else pd.factorize(pd.Series(list(groups), dtype=object))
+
+        # Satu langkah per tahun, batch atas semua entitas; lalu dijumlah kumulatif atas tahun
+        per_year = []
+        for t in range(values.shape[1]):
+            state = Moments.empty(len(values), metrics, shift).add(values[:, t:t + 1])
+            if codes is not None:
+                state = state.grouped_codes(codes, labels)
+            per_year.append(np.stack(state.parts))
+        prefix = np.cumsum(np.stack(per_year), axis=0) if per_year else np.zeros((0, 4, len(labels), len(metrics), len(metrics)))
+        return cls(prefix, store.years, shift, metrics, list(labels))
+
+    def append_year(self, year, values, groups_codes=None):
+        """Menambah satu tahun baru (batch, metrik) tanpa menghitung ulang tahun sebelumnya.
+
+        `groups_codes`: indeks label (self.labels) per entitas, seperti kode dari from_store.
+        """
+        state = Moments.empty(len(values), self.metrics, self.shift).add(np.asarray(values)[:, None, :])
+        if groups_codes is not None:
+            state = state.grouped_codes(groups_codes, self.labels)
+        parts = np.stack(state.parts)
+        latest = parts + self.prefix[-1] if len(self.prefix) else parts
+        self.prefix = np.concatenate([self.prefix, latest[None]])
+        self.years = np.append(self.years, year)
+
+    def window(self, start_year=None, end_year=None, labels=None):
+        """Moments untuk rentang [start_year, end_year]; `labels` memilih batch (None = semua).
+
+        ValueError jika rentang terbalik atau tidak memuat satu pun tahun di `years`.
+        """
+        if start_year is not None and end_year is not None and end_year < start_year:
+            raise ValueError(f"end_year ({end_year}) must not be before start_year ({start_year})")
+        start = 0 if start_year is None else int(np.searchsorted(self.years, start_year))
+        end = len(self.years) - 1 if end_year is None else int(np.searchsorted(self.years, end_year, side='right')) - 1
+        if start > end:
+            span = f"{self.years[0]}-{self.years[-1]}" if len(self.years) else "no years"
+            raise ValueError(f"range {start_year}-{end_year} contains no year in {span}")
+        parts = self.prefix[end] - (self.prefix[start - 1] if start > 0 else 0)
+        rows = slice(None) if labels is None else [self.labels.index(label) for label in labels]
+        batch_labels = self.labels if labels is None else list(labels)
+        return Moments(*(part[rows] for part in parts), self.shift, self.metrics, batch_labels)
+
+    def nbytes(self):
+        return self.prefix.nbytes
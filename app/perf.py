@@ -0,0 +1,192 @@
+"""Instrumentasi ringan per tahap pipeline: waktu, puncak memori (tracemalloc) dan cache hit.
+
+Nonaktif secara default; aktifkan untuk seluruh proses lewat env ENERGY_PERF=1 (panel di sidebar
+hanya menampilkan hasilnya). Saat nonaktif stage() hanya mengembalikan context manager kosong yang sama.
+
+tracemalloc mengukur memori seluruh proses, bukan per thread/sesi: puncak sebuah tahap mencakup
+alokasi thread lain yang berjalan bersamaan. Record seperti itu ditandai overlap=True, dan puncak
+hanya di-reset jika tidak ada tahap lain yang sedang diukur di thread lain.
+"""
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+MAX_RECORDS = 2000
+
+logger = logging.getLogger("energy.perf")
+
+_ENABLED = os.environ.get("ENERGY_PERF", "").lower() in ("1", "true", "yes", "on")
+if _ENABLED:
+    tracemalloc.start()
+_NULL_STAGE = contextlib.nullcontext()
+_LOCK = threading.Lock()
+_RECORDS = deque(maxlen=MAX_RECORDS)
+_LOCAL = threading.local()
+# Stack tahap aktif per thread (untuk mendeteksi pengukuran yang tumpang tindih)
+_ACTIVE = {}
+
+
+def enabled():
+    return _ENABLED
+
+
+def _stack():
+    stack = getattr(_LOCAL, "stack", None)
+    if stack is None:
+        stack = _LOCAL.stack = []
+    return stack
+
+
+class _Stage:
+    __slots__ = ("name", "cached", "start", "baseline", "peak", "miss", "overlap")
+
+    def __init__(self, name, cached):
+        self.name = name
+        self.cached = cached
+        self.miss = False
+        self.overlap = False
+
+    def __enter__(self):
+        thread_id = threading.get_ident()
+        stack = _stack()
+        with _LOCK:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # Puncak milik stage luar disimpan sebelum reset untuk stage dalam
+                stack[-1].peak = max(stack[-1].peak, peak)
+            others = [frame for tid, frames in _ACTIVE.items() if tid != thread_id for frame in frames]
+            if others:
+                # Semua tahap yang sedang berjalan (di thread mana pun) ikut terkena alokasi thread lain
+                for frame in others + stack:
+                    frame.overlap = True
+                self.overlap = True
+            else:
+                # Reset puncak tidak boleh menghapus pengukuran thread lain yang sedang berjalan
+                tracemalloc.reset_peak()
+            stack.append(self)
+            _ACTIVE[thread_id] = stack
+        self.baseline, self.peak = current, current
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        stack = _stack()
+        with _LOCK:
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            stack.pop()
+            if not stack:
+                _ACTIVE.pop(threading.get_ident(), None)
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, peak)
+        record = {
+            "stage": self.name,
+            "seconds": seconds,
+            "peak_bytes": max(0, peak - self.baseline),
+            "overlap": self.overlap,
+            "cache": ("miss" if self.miss else "hit") if self.cached else None,
+            "error": exc_type.__name__ if exc_type else None,
+            "ts": time.time(),
+        }
+        with _LOCK:
+            _RECORDS.append(record)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(record))
+        return False
+
+
+def stage(name, cached=False):
+    """Context manager pengukur satu tahap. cached=True: catat hit/miss (lihat note_cache_miss)."""
+    if not _ENABLED:
+        return _NULL_STAGE
+    return _Stage(name, cached)
+
+
+def note_cache_miss():
+    """Dipanggil dari dalam fungsi ber-cache: body yang berjalan berarti cache miss untuk stage terdekat."""
+    if not _ENABLED:
+        return
+    for frame in reversed(_stack()):
+        if frame.cached:
+            frame.miss = True
+            return
+
+
+def records():
+    with _LOCK:
+        return list(_RECORDS)
+
+
+def reset():
+    with _LOCK:
+        _RECORDS.clear()
+
+
+def summary():
+    """Agregat per stage: jumlah panggilan, waktu terakhir/rata-rata/maks, puncak memori proses, hit/miss.
+
+    `overlapped` = jumlah pengukuran yang tumpang tindih dengan tahap di thread lain (puncaknya ikut
+    menghitung alokasi thread tersebut).
+    """
+    rows = {}
+    for record in records():
+        row = rows.setdefault(record["stage"], {
+            "stage": record["stage"], "calls": 0, "last_ms": 0.0, "total_ms": 0.0, "max_ms": 0.0,
+            "peak_mb": 0.0, "overlapped": 0, "cache_hits": 0, "cache_misses": 0, "errors": 0,
+        })
+        ms = record["seconds"] * 1000
+        row["calls"] += 1
+        row["last_ms"] = ms
+        row["total_ms"] += ms
+        row["max_ms"] = max(row["max_ms"], ms)
+        row["peak_mb"] = max(row["peak_mb"], record["peak_bytes"] / 2**20)
+        row["overlapped"] += record["overlap"]
+        row["cache_hits"] += record["cache"] == "hit"
+        row["cache_misses"] += record["cache"] == "miss"
+        row["errors"] += record["error"] is not None
+    for row in rows.values():
+        row["mean_ms"] = row["total_ms"] / row["calls"]
+    return list(rows.values())
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def openmetrics(extra_gauges=None):
+    """Ringkasan dalam format teks OpenMetrics untuk di-scrape (mis. lewat textfile collector)."""
+    lines = [
+        "# TYPE energy_stage_seconds summary",
+        "# HELP energy_stage_seconds Wall time per pipeline stage.",
+    ]
+    rows = summary()
+    for row in rows:
+        label = f'stage="{_label(row["stage"])}"'
+        lines.append(f"energy_stage_seconds_count{{{label}}} {row['calls']}")
+        lines.append(f"energy_stage_seconds_sum{{{label}}} {row['total_ms'] / 1000:.6f}")
+    lines += ["# TYPE energy_stage_peak_bytes gauge", "# HELP energy_stage_peak_bytes Process-wide peak traced memory above the stage baseline (includes concurrent stages)."]
+    for row in rows:
+        lines.append(f'energy_stage_peak_bytes{{stage="{_label(row["stage"])}"}} {int(row["peak_mb"] * 2**20)}')
+    lines += ["# TYPE energy_stage_cache counter", "# HELP energy_stage_cache Cache hits and misses per stage."]
+    for row in rows:
+        if row["cache_hits"] or row["cache_misses"]:
+            label = _label(row["stage"])
+            lines.append(f'energy_stage_cache_total{{stage="{label}",result="hit"}} {row["cache_hits"]}')
+            lines.append(f'energy_stage_cache_total{{stage="{label}",result="miss"}} {row["cache_misses"]}')
+    for name, value in (extra_gauges or {}).items():
+        lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def write_openmetrics(path, extra_gauges=None):
+    """Menulis teks OpenMetrics secara atomik (aman dibaca scraper kapan saja)."""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w") as fh:
+        fh.write(openmetrics(extra_gauges))
+    os.replace(tmp_path, path)
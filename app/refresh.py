@@ -0,0 +1,397 @@
+"""Refresh dataset yang sadar perubahan: hanya entitas/tahun yang berubah yang dihitung ulang.
+
+Saat CSV baru diletakkan di tempat yang sama, versi yang dilayani (manifest.json) tetap versi
+lama sampai refresh selesai. Refresh membandingkan snapshot mentah lama dan baru per sel,
+lalu membersihkan ulang (interpolasi per negara) hanya negara yang berubah, menghitung ulang
+sel kubus (Group, tahun) yang terdampak, dan memanaskan forecast; seri yang tidak berubah
+langsung diambil dari ModelStore. Versi baru dipasang dengan satu os.replace pada manifest.
+
+Contoh (dari root repo):
+    python app/refresh.py --data data/owid-energy-data.csv
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from aggregates import build_group_cube, cube_pivot, cube_series
+from analysis import EmptyDataError, crossover_table
+from cleaning import CRITICAL_COLUMNS, END_YEAR, KEY_COLUMNS, START_YEAR, clean_energy_frame, countries_for
+from forecasting import forecast_many
+from ingest import _write_json_atomic, cache_dir_for, file_fingerprint, read_energy_columns
+from model_store import default_store
+from shared_data import DASHBOARD_GROUPS, cube_to_frame, frame_to_cube, shared_layer
+
+REFRESH_DIR_NAME = "refresh"
+KEY_COLS = ['country', 'year']
+# Versi yang disimpan di folder refresh (yang dilayani + sebelumnya, untuk sesi yang masih terbuka)
+KEEP_VERSIONS = 2
+# Lock refresh lintas proses dianggap basi setelah selang ini
+LOCK_STALE_SECONDS = 15 * 60
+# Refresh latar yang gagal dicoba lagi jika CSV berubah lagi, atau setelah selang ini untuk file yang sama
+RETRY_SECONDS = 5 * 60
+
+logger = logging.getLogger("energy.refresh")
+
+_BACKGROUND_LOCK = threading.Lock()
+_BACKGROUND = {"thread": None, "last_report": None, "error": None, "failed_version": None, "failed_at": None}
+
+
+# --- 1. DIFF ---
+
+class DatasetDiff:
+    """Perbedaan dua frame mentah per baris (country, year) dan per sel metrik."""
+
+    def __init__(self, cells, added, removed):
+        self.cells = cells
+        self.added = added
+        self.removed = removed
+
+    @classmethod
+    def between(cls, old, new, keys=KEY_COLS):
+        keys = list(keys)
+        old_i = old.assign(country=old['country'].astype(str)).set_index(keys)
+        new_i = new.assign(country=new['country'].astype(str)).set_index(keys)
+        union = old_i.index.union(new_i.index)
+        in_old, in_new = union.isin(old_i.index), union.isin(new_i.index)
+
+        columns = [col for col in new_i.select_dtypes(include='number').columns if col in old_i.columns]
+        before = old_i.reindex(union)[columns].to_numpy(dtype=np.float64)
+        after = new_i.reindex(union)[columns].to_numpy(dtype=np.float64)
+        same = (before == after) | (np.isnan(before) & np.isnan(after))
+        rows, cols = np.nonzero(~same & (in_old & in_new)[:, None])
+
+        cells = pd.DataFrame({
+            'country': union.get_level_values(0)[rows],
+            'year': union.get_level_values(1)[rows].astype(np.int64),
+            'column': np.asarray(columns, dtype=object)[cols],
+            'old': before[rows, cols],
+            'new': after[rows, cols],
+        })
+        added = union[in_new & ~in_old].to_frame(index=False)
+        removed = union[in_old & ~in_new].to_frame(index=False)
+        return cls(cells, added, removed)
+
+    def empty(self):
+        return self.cells.empty and self.added.empty and self.removed.empty
+
+    def entities(self):
+        return sorted(set(self.cells['country']) | set(self.added['country']) | set(self.removed['country']))
+
+    def years(self):
+        return sorted({int(y) for y in pd.concat([self.cells['year'], self.added['year'], self.removed['year']])})
+
+    def summary(self):
+        return {
+            'cells_changed': len(self.cells),
+            'rows_added': len(self.added),
+            'rows_removed': len(self.removed),
+            'columns_changed': self.cells['column'].value_counts().to_dict(),
+            'entities': self.entities(),
+            'years': self.years(),
+        }
+
+
+# --- 2. PENYIMPANAN VERSI ---
+
+def refresh_dir(file_path):
+    return os.path.join(cache_dir_for(file_path), REFRESH_DIR_NAME)
+
+
+def _version_path(file_path, version, kind):
+    return os.path.join(refresh_dir(file_path), f"{kind}-{version[:16]}.parquet")
+
+
+def read_manifest(file_path):
+    """Versi yang sedang dilayani (None jika belum pernah di-bootstrap)."""
+    try:
+        with open(os.path.join(refresh_dir(file_path), "manifest.json")) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _prune(file_path, keep_versions):
+    keep = {version[:16] for version in keep_versions}
+    directory = refresh_dir(file_path)
+    for name in os.listdir(directory):
+        stem, ext = os.path.splitext(name)
+        if ext in (".parquet", ".json") and "-" in stem and stem.split("-", 1)[0] in ("raw", "clean", "report"):
+            if stem.split("-", 1)[1] not in keep:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+
+class _RefreshLock:
+    """Lock file O_EXCL: satu refresh per host walau ada beberapa replika."""
+
+    def __init__(self, file_path):
+        self.path = os.path.join(refresh_dir(file_path), "refresh.lock")
+        self.acquired = False
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        try:
+            if time.time() - os.stat(self.path).st_mtime > LOCK_STALE_SECONDS:
+                os.remove(self.path)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            self.acquired = True
+        except FileExistsError:
+            self.acquired = False
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.acquired:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        return False
+
+
+# --- 3. PEMBERSIHAN & AGREGAT INKREMENTAL ---
+
+def clean_rows(raw, groups=DASHBOARD_GROUPS, registry=None):
+    """Pembersihan yang sama dengan analysis.load_clean_data, dengan urutan baku (country, year)."""
+    df = clean_energy_frame(raw.copy(), groups, interpolate_cols=['gdp'], dropna_cols=CRITICAL_COLUMNS, registry=registry)
+    return canonical(df)
+
+
+def canonical(df):
+    """Urutan (country, year) dan kategori country terurut: hasil inkremental = hasil penuh."""
+    countries = df['country'].astype(str)
+    df = df.assign(country=pd.Categorical(countries, categories=sorted(countries.unique())))
+    return df.sort_values(KEY_COLS, kind='stable').reset_index(drop=True)
+
+
+def update_clean(old_clean, new_raw, entities, groups=DASHBOARD_GROUPS, registry=None):
+    """Frame bersih baru: negara yang tidak berubah disalin, negara berubah dibersihkan ulang."""
+    entities = set(entities)
+    keep = old_clean[~old_clean['country'].astype(str).isin(entities)]
+    fresh = clean_rows(new_raw[new_raw['country'].astype(str).isin(entities)], groups, registry)
+    keep = keep.assign(country=keep['country'].astype(str))
+    fresh = fresh.assign(country=fresh['country'].astype(str))
+    return canonical(pd.concat([keep, fresh], ignore_index=True))
+
+
+def update_cube(old_cube, new_clean, old_clean, entities):
+    """Hanya sel (Group, tahun) yang barisnya berubah setelah pembersihan yang diagregasi ulang.
+
+    Mengembalikan (kubus baru, jumlah sel yang dihitung ulang).
+    """
+    entities = set(entities)
+    before = old_clean[old_clean['country'].astype(str).isin(entities)]
+    after = new_clean[new_clean['country'].astype(str).isin(entities)]
+    diff = DatasetDiff.between(before, after)
+    touched = pd.concat([diff.cells[KEY_COLS], diff.added, diff.removed], ignore_index=True)
+    if touched.empty:
+        return old_cube, 0
+
+    # Group negara diambil dari kedua versi (negara bisa hilang/muncul)
+    group_of = pd.concat([before, after])[['country', 'Group']].astype(str).drop_duplicates('country')
+    pairs = touched.assign(country=touched['country'].astype(str)).merge(group_of, on='country')
+    pairs = pd.MultiIndex.from_arrays([pairs['Group'], pairs['year'].astype(int)]).unique()
+
+    rows = pd.MultiIndex.from_arrays([new_clean['Group'].astype(str), new_clean['year'].astype(int)])
+    partial = build_group_cube(new_clean[rows.isin(pairs)])
+    index = pd.MultiIndex.from_arrays([old_cube.index.get_level_values(0).astype(str),
+                                       old_cube.index.get_level_values(1).astype(int)])
+    cube = pd.concat([old_cube[~index.isin(pairs)], partial]).sort_index()
+    return cube, len(pairs)
+
+
+def _changed_groups(old_cube, new_cube, metric, stat):
+    before, after = cube_pivot(old_cube, metric, stat), cube_pivot(new_cube, metric, stat)
+    columns = sorted(set(map(str, before.columns)) | set(map(str, after.columns)))
+    before.columns, after.columns = before.columns.astype(str), after.columns.astype(str)
+    before, after = before.reindex(columns=columns), after.reindex(columns=columns)
+    index = before.index.union(after.index)
+    before, after = before.reindex(index).to_numpy(), after.reindex(index).to_numpy()
+    differs = ~((before == after) | (np.isnan(before) & np.isnan(after)))
+    return [group for group, changed in zip(columns, differs.any(axis=0)) if changed]
+
+
+# --- 4. PIPELINE ---
+
+def _publish(file_path, version, raw, clean, cube, report, previous=None):
+    """Tulis artefak versi baru, isi lapisan bersama, lalu tukar manifest secara atomik."""
+    directory = refresh_dir(file_path)
+    os.makedirs(directory, exist_ok=True)
+    for kind, frame in (("raw", raw), ("clean", clean)):
+        path = _version_path(file_path, version, kind)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        frame.to_parquet(tmp_path, engine="pyarrow", index=False)
+        os.replace(tmp_path, path)
+    layer = shared_layer()
+    layer.get_table(version, "clean", lambda: clean)
+    layer.get_table(version, "group_cube", lambda: cube_to_frame(cube))
+
+    _write_json_atomic(os.path.join(directory, f"report-{version[:16]}.json"), report)
+    _write_json_atomic(os.path.join(directory, "manifest.json"), {
+        "version": version,
+        "source_mtime": os.stat(file_path).st_mtime,
+        "published": time.time(),
+        "groups": list(DASHBOARD_GROUPS),
+    })
+    _prune(file_path, [version] + ([previous] if previous else [])[:KEEP_VERSIONS - 1])
+
+
+def _warm_models(cube, store):
+    crossover_table(cube, 'fossil_fuel_consumption', 'sum', store=store)
+    forecast_many(cube_series(cube, 'fossil_share_energy', 'mean'), 'fossil_share_energy', order=(1, 1, 0), store=store)
+
+
+def refresh(file_path, store=None, force_full=False):
+    """Bawa versi yang dilayani ke isi CSV saat ini; mengembalikan laporan invalidasi (dict).
+
+    Tanpa manifest (atau force_full) seluruh data dibangun penuh. Laporan juga disimpan sebagai
+    report-<versi>.json di folder refresh.
+    """
+    store = default_store() if store is None else store
+    start = time.perf_counter()
+    version = file_fingerprint(file_path)
+    manifest = read_manifest(file_path)
+    if manifest is not None and manifest["version"] == version and not force_full:
+        return {"status": "unchanged", "version": version[:16]}
+
+    countries = countries_for(DASHBOARD_GROUPS)
+    new_raw = read_energy_columns(file_path, KEY_COLUMNS, countries, START_YEAR, END_YEAR)
+    previous = None if manifest is None or force_full else manifest["version"]
+    old_raw = old_clean = None
+    if previous is not None:
+        try:
+            old_raw = pd.read_parquet(_version_path(file_path, previous, "raw"), engine="pyarrow")
+            old_clean = pd.read_parquet(_version_path(file_path, previous, "clean"), engine="pyarrow")
+        except (OSError, ValueError):
+            previous = None
+
+    if previous is None:
+        clean = clean_rows(new_raw)
+        if clean.empty:
+            raise EmptyDataError(f"no rows left after cleaning for groups {DASHBOARD_GROUPS}")
+        cube = build_group_cube(clean)
+        report = {"status": "full", "old_version": None, "cube_cells_recomputed": len(cube),
+                  "groups_refit": sorted(map(str, cube.index.get_level_values(0).unique()))}
+    else:
+        diff = DatasetDiff.between(old_raw, new_raw)
+        entities = diff.entities()
+        old_cube = frame_to_cube(shared_layer().get_frame(previous, "group_cube", lambda: cube_to_frame(build_group_cube(old_clean))))
+        clean = update_clean(old_clean, new_raw, entities)
+        if clean.empty:
+            raise EmptyDataError(f"no rows left after cleaning for groups {DASHBOARD_GROUPS}")
+        cube, recomputed = update_cube(old_cube, clean, old_clean, entities)
+        report = {"status": "incremental", "old_version": previous[:16], **diff.summary(),
+                  "cube_cells_recomputed": recomputed, "cube_cells_total": len(cube),
+                  "groups_refit": _changed_groups(old_cube, cube, 'fossil_share_energy', 'mean'),
+                  "crossover_groups_changed": _changed_groups(old_cube, cube, 'fossil_fuel_consumption', 'sum')}
+
+    _warm_models(cube, store)
+    report.update({"version": version[:16], "clean_rows": len(clean), "seconds": round(time.perf_counter() - start, 3)})
+    _publish(file_path, version, new_raw, clean, cube, report, previous)
+    logger.info("dataset refresh %s", json.dumps(report, default=str))
+    return report
+
+
+# --- 5. VERSI YANG DILAYANI (dipakai app.py & api.py) ---
+
+def _background_refresh(file_path, version):
+    try:
+        with _RefreshLock(file_path) as lock:
+            if lock.acquired:
+                _BACKGROUND["last_report"] = refresh(file_path)
+                _BACKGROUND.update(error=None, failed_version=None, failed_at=None)
+    except Exception as exc:
+        # Versi lama tetap dilayani; error ditampilkan dashboard lewat refresh_status()
+        _BACKGROUND.update(error=f"{type(exc).__name__}: {exc}", failed_version=version, failed_at=time.monotonic())
+        logger.exception("background refresh of version %s failed", version[:16])
+
+
+def refresh_in_progress():
+    thread = _BACKGROUND["thread"]
+    return thread is not None and thread.is_alive()
+
+
+def refresh_status():
+    """Status refresh latar: running, laporan terakhir, dan error refresh gagal yang belum tergantikan."""
+    return {"running": refresh_in_progress(), "last_report": _BACKGROUND["last_report"], "error": _BACKGROUND["error"]}
+
+
+def _should_retry(version):
+    """CSV gagal (mis. tersalin setengah) dicoba lagi begitu isinya berubah, atau setelah RETRY_SECONDS."""
+    if _BACKGROUND["failed_version"] != version:
+        return True
+    return time.monotonic() - _BACKGROUND["failed_at"] >= RETRY_SECONDS
+
+
+def _refresh_now(file_path, poll_seconds=0.5):
+    """Refresh sinkron; jika proses lain sedang me-refresh, tunggu manifest-nya."""
+    while True:
+        with _RefreshLock(file_path) as lock:
+            if lock.acquired:
+                refresh(file_path)
+                break
+        time.sleep(poll_seconds)
+        if not os.path.exists(_RefreshLock(file_path).path):
+            break
+    manifest = read_manifest(file_path)
+    if manifest is None:
+        raise OSError(f"refresh manifest for {file_path} could not be written")
+    return manifest
+
+
+def served_version(file_path, background=True):
+    """Versi dataset yang dilayani. Jika CSV berubah, refresh dijalankan di thread latar dan versi
+    lama dikembalikan sampai manifest ditukar. Bootstrap pertama berjalan sinkron."""
+    manifest = read_manifest(file_path)
+    if manifest is None or (not background and file_fingerprint(file_path) != manifest["version"]):
+        return _refresh_now(file_path)["version"]
+
+    current = file_fingerprint(file_path)
+    with _BACKGROUND_LOCK:
+        if current == manifest["version"]:
+            # CSV kembali ke versi yang dilayani: error refresh sebelumnya tidak relevan lagi
+            _BACKGROUND.update(error=None, failed_version=None, failed_at=None)
+        elif not refresh_in_progress() and _should_retry(current):
+            thread = threading.Thread(target=_background_refresh, args=(file_path, current),
+                                      name="energy-refresh", daemon=True)
+            _BACKGROUND["thread"] = thread
+            thread.start()
+    return manifest["version"]
+
+
+def clean_frame(file_path, version, layer=None):
+    """Frame bersih (read-only, ter-mmap) untuk versi yang dilayani."""
+    layer = shared_layer() if layer is None else layer
+    return layer.get_frame(
+        version, "clean", lambda: pd.read_parquet(_version_path(file_path, version, "clean"), engine="pyarrow")
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="data/owid-energy-data.csv")
+    parser.add_argument("--full", action="store_true", help="bangun ulang penuh tanpa diff")
+    args = parser.parse_args(argv)
+
+    with _RefreshLock(args.data) as lock:
+        if not lock.acquired:
+            print("refresh lain sedang berjalan", file=sys.stderr)
+            return 1
+        report = refresh(args.data, force_full=args.full)
+    print(json.dumps(report, indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
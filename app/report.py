@@ -0,0 +1,280 @@
+"""Generator laporan PDF per blok/negara.
+
+Contoh (dari root repo):
+    python app/report.py --targets G7 BRICS Indonesia World --workers 4
+"""
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+
+import pandas as pd
+
+from analysis import resolve_target
+from cleaning import (CRITICAL_COLUMNS, END_YEAR, GROUP_REGISTRY, KEY_COLUMNS, START_YEAR,
+                      clean_energy_frame, countries_for)
+from figures import country_trend_figure, fossil_share_forecast_figure
+from forecasting import forecast_many
+from ingest import read_energy_columns
+from model_store import default_store
+
+IMAGE_WIDTH = 900
+IMAGE_HEIGHT = 500
+IMAGE_CACHE_DIR = os.path.join("reports", ".cache", "images")
+# Batas waktu render per gambar; kaleido bisa menggantung jika Chrome tidak tersedia
+RASTER_TIMEOUT = float(os.environ.get("ENERGY_RASTER_TIMEOUT", 60))
+
+# Satu pool per jumlah worker (seperti forecasting.get_pool); worker dibuat saat dibutuhkan
+_RASTER_POOLS = {}
+_RASTER_LOCK = threading.Lock()
+
+
+# --- 1. RASTERISASI FIGURE (pool kaleido yang dipakai ulang) ---
+
+def _init_raster_worker():
+    """Menyalakan renderer kaleido sekali per worker, bukan sekali per gambar."""
+    try:
+        import kaleido
+        if hasattr(kaleido, "start_sync_server"):
+            # kaleido >= 1.0: browser persisten untuk semua to_image() di proses ini
+            kaleido.start_sync_server(silence_warnings=True)
+        import plotly.graph_objects as go
+        import plotly.io as pio
+        pio.to_image(go.Figure(), format="png", width=10, height=10)
+    except Exception:
+        # Kegagalan dilaporkan per gambar oleh _rasterize
+        pass
+
+
+def _rasterize(task):
+    fig_json, width, height = task
+    import plotly.io as pio
+    try:
+        return pio.to_image(json.loads(fig_json), format="png", width=width, height=height), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _get_raster_pool(max_workers):
+    with _RASTER_LOCK:
+        pool = _RASTER_POOLS.get(max_workers)
+        if pool is None:
+            pool = _RASTER_POOLS[max_workers] = ProcessPoolExecutor(max_workers=max_workers,
+                                                                    initializer=_init_raster_worker)
+        return pool
+
+
+def _reset_raster_pool(max_workers=None):
+    """Mematikan worker kaleido (termasuk yang menggantung) agar batch berikutnya mulai bersih.
+
+    Tanpa `max_workers` semua pool dimatikan.
+    """
+    with _RASTER_LOCK:
+        keys = list(_RASTER_POOLS) if max_workers is None else [max_workers]
+        pools = [pool for pool in (_RASTER_POOLS.pop(key, None) for key in keys) if pool is not None]
+    for pool in pools:
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(_reset_raster_pool)
+
+
+def figure_hash(fig_json, width, height):
+    return hashlib.sha256(f"{width}x{height}:".encode() + fig_json.encode()).hexdigest()
+
+
+def rasterize_figures(figures, width=IMAGE_WIDTH, height=IMAGE_HEIGHT, cache_dir=IMAGE_CACHE_DIR, max_workers=None,
+                      timeout=RASTER_TIMEOUT):
+    """Render banyak figure ke PNG secara paralel; gambar di-cache berdasarkan hash figure.
+
+    Mengembalikan (paths, errors): path PNG per figure (None jika gagal) dan pesan error per figure.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    fig_jsons = [fig.to_json() for fig in figures]
+    paths = [os.path.join(cache_dir, f"{figure_hash(j, width, height)}.png") for j in fig_jsons]
+    errors = [None] * len(figures)
+
+    # Figure identik (mis. dipakai di beberapa laporan) hanya dirender sekali
+    pending = {}
+    for i, path in enumerate(paths):
+        if not os.path.exists(path):
+            pending.setdefault(path, i)
+
+    tasks = [(fig_jsons[i], width, height) for i in pending.values()]
+    rendered = []
+    if tasks:
+        # Render selalu lewat pool agar kaleido yang menggantung bisa dihentikan oleh timeout
+        pool_size = max(1, max_workers or os.cpu_count())
+        workers = min(len(tasks), pool_size)
+        futures = [_get_raster_pool(pool_size).submit(_rasterize, task) for task in tasks]
+        deadline = time.monotonic() + timeout * -(-len(tasks) // workers)
+        for future in futures:
+            try:
+                rendered.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+            except FutureTimeout:
+                rendered.append((None, f"TimeoutError: render melebihi {timeout:.0f} detik"))
+            except Exception as e:
+                rendered.append((None, f"{type(e).__name__}: {e}"))
+        if any(png is None and error.startswith("TimeoutError") for png, error in rendered):
+            _reset_raster_pool(pool_size)
+
+    failed = {}
+    for path, (png, error) in zip(pending, rendered):
+        if png is None:
+            failed[path] = error
+            continue
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "wb") as fh:
+            fh.write(png)
+        os.replace(tmp_path, path)
+
+    for i, path in enumerate(paths):
+        if path in failed:
+            paths[i], errors[i] = None, failed[path]
+    return paths, errors
+
+
+# --- 2. DATA & KONTEN LAPORAN ---
+
+def load_report_data(file_path, targets):
+    """Memuat & membersihkan data sekali untuk semua target laporan."""
+    groups = list(GROUP_REGISTRY)
+    countries = list(dict.fromkeys(countries_for(groups) + [c for t in targets for c in resolve_target(t)]))
+    df = read_energy_columns(file_path, KEY_COLUMNS, countries, START_YEAR, END_YEAR)
+    return clean_energy_frame(df, groups, interpolate_cols=['gdp'], dropna_cols=CRITICAL_COLUMNS)
+
+
+def prepare_reports(df, targets):
+    """Figure & metrik per target; semua proyeksi dilatih dalam satu panggilan forecasting engine."""
+    series = []
+    for target in targets:
+        members = df[df['country'].isin(resolve_target(target))]
+        trend = members.groupby('year', observed=True)['fossil_share_energy'].mean().reset_index()
+        series.append(trend.assign(series_id=target))
+
+    forecast_df, status_df = forecast_many(
+        pd.concat(series, ignore_index=True), 'fossil_share_energy', id_col='series_id',
+        store=default_store(),
+    )
+    mapes = status_df.set_index('series_id')['mape']
+
+    jobs = []
+    for target in targets:
+        members = df[df['country'].isin(resolve_target(target))]
+        jobs.append({
+            "target": target,
+            "members": resolve_target(target),
+            "mape": float(mapes.get(target, float("nan"))),
+            "figures": [
+                country_trend_figure(members),
+                fossil_share_forecast_figure(forecast_df, groups=[target]),
+            ],
+        })
+    return jobs
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_")
+
+
+def write_pdf(job):
+    """Menyusun PDF dengan reportlab (dijalankan di worker terpisah untuk banyak laporan)."""
+    from reportlab.lib.colors import black, blue
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Image, PageBreak, Paragraph, SimpleDocTemplate, Spacer
+
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(name='ReportHeading', fontName='Helvetica-Bold', fontSize=24, spaceAfter=20, alignment=1, textColor=blue))
+    styles.add(ParagraphStyle(name='SubHeading', fontName='Helvetica-Bold', fontSize=16, spaceAfter=10, textColor=black))
+    styles.add(ParagraphStyle(name='BodyTextJustify', fontName='Helvetica', alignment=4, leading=14))
+    styles.add(ParagraphStyle(name='KeyMetric', fontName='Helvetica-Bold', fontSize=12, leading=15, leftIndent=20))
+    styles.add(ParagraphStyle(name='Caption', fontName='Helvetica-Oblique', fontSize=9, spaceBefore=6, spaceAfter=12, alignment=1))
+    styles.add(ParagraphStyle(name='Footer', fontName='Helvetica', fontSize=8, alignment=1))
+
+    target = job["target"]
+    report = SimpleDocTemplate(job["pdf_path"], pagesize=A4, rightMargin=0.8 * inch, leftMargin=0.8 * inch,
+                               topMargin=0.8 * inch, bottomMargin=0.8 * inch)
+    story = [
+        Spacer(1, 2 * inch),
+        Paragraph(f"Laporan Analisis & Proyeksi Energi: {target} ({START_YEAR}-2030)", styles['ReportHeading']),
+        Spacer(1, 0.5 * inch),
+        Paragraph(f"Anggota: {', '.join(job['members'])}", styles['h3']),
+        Spacer(1, 0.2 * inch),
+        Paragraph(f"Tanggal Penerbitan: {datetime.now().strftime('%d %B %Y')}", styles['BodyText']),
+        Paragraph("Sumber Data: Our World in Data (OWID)", styles['BodyText']),
+        PageBreak(),
+        Paragraph("1. Ringkasan Eksekutif", styles['h1']),
+        Paragraph("Metrik Kinerja Model Proyeksi (ARIMA):", styles['SubHeading']),
+        Paragraph(f"&bull; Akurasi Validasi Proyeksi (MAPE): <b>{job['mape']:.2f}%</b>", styles['KeyMetric']),
+        Spacer(1, 18),
+    ]
+
+    sections = [
+        ("2. Tren Pangsa Energi Fosil per Negara", f"Gambar 2.1: Pangsa energi fosil per negara ({target})."),
+        ("3. Proyeksi Pangsa Fosil Hingga 2030", f"Gambar 3.1: Proyeksi rata-rata pangsa energi fosil {target} hingga 2030."),
+    ]
+    for (title, caption), image_path, error in zip(sections, job["images"], job["image_errors"]):
+        story.append(Paragraph(title, styles['h1']))
+        story.append(Spacer(1, 6))
+        if image_path:
+            story.append(Image(image_path, width=6.6 * inch, height=3.7 * inch))
+            story.append(Paragraph(caption, styles['Caption']))
+        else:
+            story.append(Paragraph(f"[Grafik GAGAL dimuat. Pastikan 'kaleido' terinstal. {error or ''}]", styles['BodyText']))
+        story.append(Spacer(1, 18))
+
+    story.append(Paragraph("--- Dokumen Analisis Data Selesai ---", styles['Footer']))
+    report.build(story)
+    return job["pdf_path"]
+
+
+def build_reports(file_path, targets, output_dir="reports", max_workers=None):
+    """Membangun N laporan dari satu dataset: data dimuat sekali, gambar & PDF dibuat paralel."""
+    os.makedirs(output_dir, exist_ok=True)
+    df = load_report_data(file_path, targets)
+    jobs = prepare_reports(df, targets)
+
+    # Semua figure dari semua laporan dirasterisasi dalam satu batch
+    figures = [fig for job in jobs for fig in job["figures"]]
+    paths, errors = rasterize_figures(figures, max_workers=max_workers)
+    offset = 0
+    for job in jobs:
+        n = len(job.pop("figures"))
+        job["images"], job["image_errors"] = paths[offset:offset + n], errors[offset:offset + n]
+        job["pdf_path"] = os.path.join(output_dir, f"Energy_Report_{_slug(job['target'])}.pdf")
+        offset += n
+
+    if len(jobs) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=min(len(jobs), max_workers or os.cpu_count())) as pool:
+            return list(pool.map(write_pdf, jobs))
+    return [write_pdf(job) for job in jobs]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="data/owid-energy-data.csv")
+    parser.add_argument("--targets", nargs="+", default=["G7", "BRICS", "Indonesia"],
+                        help="nama blok di GROUP_REGISTRY atau nama negara")
+    parser.add_argument("--output", default="reports")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    for path in build_reports(args.data, args.targets, args.output, args.workers):
+        print(f"✅ {path}")
+    print(f"{len(args.targets)} laporan dalam {time.perf_counter() - start:.1f} detik")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""Lapisan data read-only bersama untuk semua sesi & proses (replika Streamlit) di satu host.
+
+Frame bersih dan kubus agregat ditulis sekali per versi dataset sebagai file Arrow IPC
+(tanpa kompresi) lalu di-memory-map: kolom numerik dibaca langsung dari page cache OS tanpa
+salinan per proses. Di dalam satu proses, tabel yang sudah dibuka dipakai ulang oleh semua sesi.
+
+Warm-up sebelum replika dijalankan (dari root repo):
+    python app/shared_data.py --data data/owid-energy-data.csv
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from aggregates import build_group_cube, cube_series
+from analysis import crossover_table
+from forecasting import forecast_many
+from lazy_imports import lazy_import
+from model_store import default_store
+
+DEFAULT_ROOT = os.path.join("data", ".cache", "shared")
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+# Jumlah tabel yang dibiarkan terbuka (ter-mmap) per proses
+DEFAULT_MAX_OPEN = 16
+CUBE_SEPARATOR = "|"
+
+pa = lazy_import("pyarrow", section="core")
+
+
+# --- 1. KONVERSI ARROW (tanpa null bitmap agar kolom numerik zero-copy) ---
+
+def frame_to_arrow(df):
+    """DataFrame -> pyarrow.Table; NaN dipertahankan sebagai nilai (bukan null) dan kategori sebagai dictionary."""
+    arrays = []
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            arrays.append(pa.DictionaryArray.from_arrays(
+                pa.array(codes, mask=codes < 0),
+                pa.array(series.cat.categories.to_numpy(dtype=object)),
+            ))
+        else:
+            arrays.append(pa.array(series.to_numpy()))
+    return pa.Table.from_arrays(arrays, names=[str(col) for col in df.columns])
+
+
+def arrow_to_frame(table):
+    """pyarrow.Table -> DataFrame; kolom numerik tetap menunjuk ke buffer Arrow (read-only)."""
+    return table.to_pandas(split_blocks=True, self_destruct=False)
+
+
+def cube_to_frame(cube):
+    """Kubus (Group, tahun) x (metrik, statistik) -> frame datar 'metrik|statistik'."""
+    frame = cube.copy()
+    frame.columns = [CUBE_SEPARATOR.join(col) for col in frame.columns]
+    return frame.reset_index()
+
+
+def frame_to_cube(frame, group_col="Group", time_col="year"):
+    cube = frame.set_index([group_col, time_col])
+    cube.columns = pd.MultiIndex.from_tuples([tuple(col.split(CUBE_SEPARATOR)) for col in cube.columns])
+    return cube
+
+
+# --- 2. STORE ---
+
+class SharedDataLayer:
+    """File Arrow per (versi dataset, nama) dengan batas ukuran LRU di disk dan di memori proses."""
+
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=DEFAULT_MAX_BYTES, max_open=DEFAULT_MAX_OPEN):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_open = max_open
+        self.hits = 0
+        self.misses = 0
+        self._open = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _path(self, version, name):
+        return os.path.join(self.root, f"{version[:16]}-{name}.arrow")
+
+    def _map(self, path):
+        # Mapping tetap valid walau file dihapus eviksi proses lain (inode tetap hidup)
+        return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+    def _write(self, path, table):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def get_table(self, version, name, build):
+        """Tabel Arrow ter-mmap; `build()` (-> DataFrame) hanya dipanggil jika belum ada di host ini."""
+        path = self._path(version, name)
+        with self._lock:
+            table = self._open.get(path)
+            if table is not None:
+                self._open.move_to_end(path)
+                self.hits += 1
+                return table
+            try:
+                table = self._map(path)
+                self.hits += 1
+            except (OSError, pa.ArrowInvalid):
+                self.misses += 1
+                table = frame_to_arrow(build())
+                try:
+                    self._write(path, table)
+                    self.evict(keep=path)
+                    table = self._map(path)
+                except OSError:
+                    # Folder cache read-only: tetap dipakai dari memori proses ini
+                    pass
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self._open[path] = table
+            while len(self._open) > self.max_open:
+                self._open.popitem(last=False)
+            return table
+
+    def get_frame(self, version, name, build):
+        return arrow_to_frame(self.get_table(version, name, build))
+
+    def get_cube(self, version, name, build):
+        """Kubus agregat (lihat aggregates.build_group_cube) lewat lapisan bersama."""
+        table = self.get_table(version, name, lambda: cube_to_frame(build()))
+        return frame_to_cube(arrow_to_frame(table))
+
+    def _entries(self):
+        entries = []
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(".arrow"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self, keep=None):
+        """Hapus file yang paling lama tidak dipakai sampai total ukuran <= max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            with self._lock:
+                self._open.pop(path, None)
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self):
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "open_tables": len(self._open),
+            "mapped_bytes": int(sum(table.nbytes for table in self._open.values())),
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+_DEFAULT_LAYER = None
+
+
+def shared_layer():
+    """Lapisan bersama per proses; lokasi/ukuran lewat ENERGY_SHARED_CACHE(_MAX_MB)."""
+    global _DEFAULT_LAYER
+    if _DEFAULT_LAYER is None:
+        root = os.environ.get("ENERGY_SHARED_CACHE", DEFAULT_ROOT)
+        max_mb = os.environ.get("ENERGY_SHARED_CACHE_MAX_MB")
+        max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+        _DEFAULT_LAYER = SharedDataLayer(root, max_bytes)
+    return _DEFAULT_LAYER
+
+
+# --- 3. DATA DASHBOARD & WARM-UP ---
+
+DASHBOARD_GROUPS = ['G7', 'BRICS']
+
+
+def dashboard_cube(df_clean, dataset_version, layer=None):
+    layer = shared_layer() if layer is None else layer
+    return layer.get_cube(dataset_version, "group_cube", lambda: build_group_cube(df_clean))
+
+
+def warm_up(file_path, layer=None, store=None):
+    """Mengisi lapisan bersama & ModelStore (frame, kubus, crossover, forecast) untuk versi dataset saat ini.
+
+    Dijalankan sekali per host sebelum replika menerima trafik; replika berikutnya hanya me-mmap.
+    Frame bersih (urutan kanonik) hanya ditulis oleh refresh.py, satu-satunya penulis artefak "clean".
+    """
+    # Import lokal: refresh.py mengimpor modul ini
+    from refresh import clean_frame, served_version
+
+    store = default_store() if store is None else store
+    timings = {}
+    start = time.perf_counter()
+    version = served_version(file_path, background=False)
+    df_clean = clean_frame(file_path, version, layer)
+    timings["frame"] = time.perf_counter() - start
+    cube = dashboard_cube(df_clean, version, layer)
+    timings["cube"] = time.perf_counter() - start - sum(timings.values())
+    crossover_table(cube, 'fossil_fuel_consumption', 'sum', store=store)
+    forecast_many(cube_series(cube, 'fossil_share_energy', 'mean'), 'fossil_share_energy',
+                  order=(1, 1, 0), store=store)
+    timings["models"] = time.perf_counter() - start - sum(timings.values())
+    return {"dataset_version": version, "rows": len(df_clean), "seconds": timings}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm-up lapisan data bersama sebelum replika dijalankan.")
+    parser.add_argument("--data", default="data/owid-energy-data.csv")
+    args = parser.parse_args(argv)
+
+    result = warm_up(args.data)
+    layer = shared_layer()
+    print(f"versi {result['dataset_version'][:16]}: {result['rows']:,} baris, "
+          + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in result["seconds"].items()))
+    stats = layer.stats()
+    print(f"{stats['entries']} file Arrow, {stats['bytes'] / 2**20:.1f} MB di {layer.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+
+class TensorStore:
+    """Tensor float32 padat entitas x tahun x metrik dengan peta id integer.
+
+    Dibangun sekali per versi dataset; pertanyaan jendela waktu (selisih, CAGR, top-N) dijawab
+    dengan indexing murni tanpa pivot/melt pandas.
+    """
+
+    def __init__(self, values, entities, years, metrics, groups=None):
+        self.values = values
+        self.entities = list(entities)
+        self.years = np.asarray(years)
+        self.metrics = list(metrics)
+        self.groups = None if groups is None else np.asarray(groups, dtype=object)
+        self.entity_index = {entity: i for i, entity in enumerate(self.entities)}
+        self.metric_index = {metric: i for i, metric in enumerate(self.metrics)}
+        self.first_year = int(self.years[0]) if len(self.years) else 0
+
+    @classmethod
+    def from_frame(cls, df, metrics=None, entity_col='country', time_col='year', group_col='Group'):
+        """Frame long (entitas, tahun, metrik...) -> tensor; sel yang tidak ada bernilai NaN."""
+        if metrics is None:
+            metrics = [
+                col for col in df.select_dtypes(include='number').columns
+                if col != time_col
+            ]
+        entities = df[entity_col].astype('category')
+        entity_codes = entities.cat.codes.to_numpy()
+        year_values = df[time_col].to_numpy(dtype=np.int64)
+        first_year, last_year = (int(year_values.min()), int(year_values.max())) if len(df) else (0, -1)
+        years = np.arange(first_year, last_year + 1)
+
+        values = np.full((len(entities.cat.categories), len(years), len(metrics)), np.nan, dtype=np.float32)
+        values[entity_codes, year_values - first_year, :] = df[list(metrics)].to_numpy(dtype=np.float32)
+
+        groups = None
+        if group_col is not None and group_col in df.columns:
+            # Grup per entitas: kemunculan pertama di frame
+            first_rows = pd.Series(np.arange(len(df))).groupby(entity_codes).first().to_numpy()
+            groups = np.empty(len(entities.cat.categories), dtype=object)
+            groups[entity_codes[first_rows]] = df[group_col].to_numpy()[first_rows]
+        return cls(values, entities.cat.categories, years, metrics, groups)
+
+    # --- Indexing ---
+
+    def _year(self, year):
+        idx = int(year) - self.first_year
+        if not 0 <= idx < len(self.years):
+            raise KeyError(f"year {year} outside {self.years[0]}-{self.years[-1]}")
+        return idx
+
+    def _rows(self, entities):
+        if entities is None:
+            return slice(None)
+        return np.array([self.entity_index[entity] for entity in entities], dtype=np.intp)
+
+    def series(self, metric, entities=None):
+        """Matriks (entitas, tahun) untuk satu metrik (view, tanpa salinan)."""
+        return self.values[self._rows(entities), :, self.metric_index[metric]]
+
+    def value(self, entity, year, metric):
+        return float(self.values[self.entity_index[entity], self._year(year), self.metric_index[metric]])
+
+    def at_year(self, metric, year, entities=None):
+        return self.values[self._rows(entities), self._year(year), self.metric_index[metric]]
+
+    # --- Pertanyaan jendela waktu ---
+
+    def delta(self, metric, start_year, end_year, entities=None):
+        """Selisih absolut nilai `end_year` - `start_year` per entitas (NaN jika salah satu kosong)."""
+        m = self.metric_index[metric]
+        rows = self._rows(entities)
+        return self.values[rows, self._year(end_year), m] - self.values[rows, self._year(start_year), m]
+
+    def cagr(self, metric, start_year, end_year, entities=None):
+        """Compound annual growth rate (persen) antara dua tahun; NaN untuk nilai awal <= 0."""
+        m = self.metric_index[metric]
+        rows = self._rows(entities)
+        start = self.values[rows, self._year(start_year), m].astype(np.float64)
+        end = self.values[rows, self._year(end_year), m].astype(np.float64)
+        periods = int(end_year) - int(start_year)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rate = (np.power(end / start, 1.0 / periods) - 1) * 100 if periods else np.zeros_like(start)
+        rate[~(start > 0) | ~(end >= 0)] = np.nan
+        return rate
+
+    def top_n(self, metric, start_year, end_year, n=10, by='delta', entities=None):
+        """Top-N entitas berdasarkan 'delta', 'cagr' atau 'value' (nilai di end_year)."""
+        if by == 'delta':
+            scores = self.delta(metric, start_year, end_year, entities)
+        elif by == 'cagr':
+            scores = self.cagr(metric, start_year, end_year, entities)
+        elif by == 'value':
+            scores = self.at_year(metric, end_year, entities)
+        else:
+            raise ValueError(f"unknown ranking {by!r}")
+        names = np.asarray(self.entities if entities is None else list(entities), dtype=object)
+        # Entitas tanpa skor (NaN) tidak masuk peringkat
+        valid = np.flatnonzero(~np.isnan(scores))
+        order = valid[np.argsort(-scores[valid], kind='stable')[:n]]
+        return pd.DataFrame({'rank': np.arange(1, len(order) + 1), 'entity': names[order], by: scores[order]})
+
+    def growth_frame(self, metrics, start_year, end_year, label=lambda metric: metric):
+        """Selisih beberapa metrik dalam format long (country, Group, Source, Growth_TWh) untuk plot.
+
+        Entitas tanpa data di salah satu tahun tidak diikutkan.
+        """
+        rows = self.delta_matrix(metrics, start_year, end_year)
+        n_entities = len(self.entities)
+        frame = pd.DataFrame({
+            'country': np.tile(np.asarray(self.entities, dtype=object), len(metrics)),
+            'Group': np.tile(self.groups, len(metrics)) if self.groups is not None else None,
+            'Source': np.repeat([label(metric) for metric in metrics], n_entities),
+            'Growth_TWh': rows.T.ravel(),
+        })
+        return frame[frame['Growth_TWh'].notna()].reset_index(drop=True)
+
+    def delta_matrix(self, metrics, start_year, end_year):
+        """Selisih (entitas, metrik) untuk beberapa metrik sekaligus."""
+        idx = [self.metric_index[metric] for metric in metrics]
+        return self.values[:, self._year(end_year)][:, idx] - self.values[:, self._year(start_year)][:, idx]
+
+    def nbytes(self):
+        return self.values.nbytes
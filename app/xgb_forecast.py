@@ -0,0 +1,184 @@
+"""Forecaster XGBoost global: satu model untuk semua entitas, prediksi rekursif batch.
+
+Pengganti sel XGBoost di notebook (Lag_1_Share + dummy Group, predict 2023-2030 dengan lag NaN):
+fitur lag/rolling dibangun dengan shift vektor atas matriks entitas x tahun, dan setiap langkah
+horizon memanggil predict() sekali untuk semua seri.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from forecasting import FORECAST_COLUMNS
+from lazy_imports import lazy_import
+
+DEFAULT_LAGS = (1, 2, 3)
+DEFAULT_WINDOWS = (3, 5)
+DEFAULT_PARAMS = {
+    'n_estimators': 300,
+    'max_depth': 4,
+    'learning_rate': 0.05,
+    'subsample': 0.9,
+    'tree_method': 'hist',
+    'objective': 'reg:squarederror',
+    'random_state': 42,
+}
+
+xgboost = lazy_import('xgboost', section='forecast')
+
+
+# --- 1. FITUR (vektor atas matriks seri x tahun) ---
+
+def _shift(x, k):
+    """x digeser k kolom ke kanan (nilai t-k di kolom t), kolom awal diisi NaN."""
+    out = np.full_like(x, np.nan)
+    out[:, k:] = x[:, :-k]
+    return out
+
+
+def _rolling(x, window, func):
+    """Statistik jendela `window` yang berakhir di t-1 untuk setiap kolom t."""
+    out = np.full_like(x, np.nan)
+    if x.shape[1] > window:
+        view = np.lib.stride_tricks.sliding_window_view(x[:, :-1], window, axis=1)
+        out[:, window:] = func(view, axis=-1)
+    return out
+
+
+def feature_names(lags=DEFAULT_LAGS, windows=DEFAULT_WINDOWS, n_groups=0):
+    names = [f'lag_{k}' for k in lags] + ['diff_1']
+    for w in windows:
+        names += [f'roll_mean_{w}', f'roll_std_{w}']
+    return names + [f'group_{g}' for g in range(n_groups)]
+
+
+def build_features(x, lags=DEFAULT_LAGS, windows=DEFAULT_WINDOWS, group_codes=None, n_groups=0):
+    """Tensor fitur (n_seri, n_tahun, n_fitur) untuk memprediksi x[:, t] dari x[:, :t]."""
+    columns = [_shift(x, k) for k in lags]
+    columns.append(_shift(x, 1) - _shift(x, 2))
+    for w in windows:
+        columns.append(_rolling(x, w, np.mean))
+        columns.append(_rolling(x, w, np.std))
+    if n_groups:
+        onehot = np.eye(n_groups, dtype=x.dtype)[group_codes]
+        columns += [np.broadcast_to(onehot[:, g:g + 1], x.shape) for g in range(n_groups)]
+    return np.stack(columns, axis=-1)
+
+
+def _last_features(x, lags, windows, group_onehot):
+    """Fitur untuk kolom berikutnya (t = x.shape[1]) saja, dipakai saat prediksi rekursif."""
+    columns = [x[:, -k] for k in lags]
+    columns.append(x[:, -1] - x[:, -2])
+    for w in windows:
+        tail = x[:, -w:]
+        columns += [tail.mean(axis=1), tail.std(axis=1)]
+    features = np.stack(columns, axis=1)
+    if group_onehot is not None:
+        features = np.concatenate([features, group_onehot], axis=1)
+    return features
+
+
+def _align_right(values):
+    """Celah di tengah diinterpolasi; seri yang berakhir lebih awal digeser agar observasi
+    terakhirnya berada di kolom terakhir. Mengembalikan (matriks, indeks kolom observasi terakhir)."""
+    values = pd.DataFrame(values).interpolate(axis=1, limit_area='inside').to_numpy()
+    length = values.shape[1]
+    valid = ~np.isnan(values)
+    last = np.where(valid.any(axis=1), length - 1 - np.argmax(valid[:, ::-1], axis=1), length - 1)
+    source = np.arange(length)[None, :] - (length - 1 - last)[:, None]
+    aligned = np.take_along_axis(values, np.clip(source, 0, length - 1), axis=1)
+    aligned[source < 0] = np.nan
+    return aligned, last
+
+
+def _scale(values):
+    """Skala per seri (rata-rata |nilai|) agar satu model bisa dipakai lintas entitas & satuan."""
+    scale = np.nanmean(np.abs(values), axis=1)
+    return np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+
+
+# --- 2. MODEL ---
+
+def fit_global(values, group_codes=None, n_groups=0, lags=DEFAULT_LAGS, windows=DEFAULT_WINDOWS,
+               n_jobs=None, **params):
+    """Melatih satu XGBRegressor (tree_method='hist', multithread) atas semua seri sekaligus."""
+    values = np.asarray(values, dtype=np.float64)
+    x = values / _scale(values)[:, None]
+    features = build_features(x, lags, windows, group_codes, n_groups)
+
+    rows = features.reshape(-1, features.shape[-1])
+    target = x.reshape(-1)
+    valid = ~np.isnan(rows).any(axis=1) & ~np.isnan(target)
+    if valid.sum() < 10:
+        raise ValueError(f"not enough complete training rows ({int(valid.sum())})")
+
+    model = xgboost.XGBRegressor(**{**DEFAULT_PARAMS, **params}, n_jobs=n_jobs or os.cpu_count())
+    model.fit(rows[valid], target[valid])
+    return {'model': model, 'lags': tuple(lags), 'windows': tuple(windows), 'n_groups': n_groups}
+
+
+def predict_recursive(bundle, values, horizon, group_codes=None):
+    """Prediksi `horizon` langkah untuk semua seri: satu predict() per langkah, bukan per seri."""
+    values = np.asarray(values, dtype=np.float64)
+    scale = _scale(values)
+    x = values / scale[:, None]
+    lags, windows, n_groups = bundle['lags'], bundle['windows'], bundle['n_groups']
+    group_onehot = np.eye(n_groups)[group_codes] if n_groups else None
+
+    # Cukup ekor sepanjang lag/jendela terbesar yang dibawa selama rekursi
+    tail = x[:, -max(max(lags), max(windows), 2):]
+    predicted = np.full((len(values), horizon), np.nan)
+    for step in range(horizon):
+        features = _last_features(tail, lags, windows, group_onehot)
+        nxt = bundle['model'].predict(features)
+        nxt[np.isnan(features).any(axis=1)] = np.nan
+        predicted[:, step] = nxt
+        tail = np.concatenate([tail[:, 1:], nxt[:, None]], axis=1)
+    return predicted * scale[:, None]
+
+
+def predict_matrix(history, horizon, lags=DEFAULT_LAGS, windows=DEFAULT_WINDOWS, n_jobs=None, **params):
+    """Latih pada matriks histori lalu prediksi rekursif (antarmuka keluarga model di backtest.py)."""
+    try:
+        bundle = fit_global(history, lags=lags, windows=windows, n_jobs=n_jobs, **params)
+    except ValueError:
+        return np.full((len(history), horizon), np.nan)
+    return predict_recursive(bundle, history, horizon)
+
+
+# --- 3. ANTARMUKA FRAME ---
+
+def global_forecast_many(df, value_col, id_col='country', time_col='year', group_col=None,
+                         horizon=8, lags=DEFAULT_LAGS, windows=DEFAULT_WINDOWS, n_jobs=None, **params):
+    """Proyeksi semua entitas dengan satu model global; output berformat sama dengan forecast_many.
+
+    `group_col` (mis. 'Group') menambah fitur one-hot blok seperti dummy Group di notebook.
+    """
+    wide = df.pivot_table(index=id_col, columns=time_col, values=value_col, observed=True, dropna=False)
+    years = np.arange(int(wide.columns.min()), int(wide.columns.max()) + 1)
+    wide = wide.reindex(columns=years)
+    # Proyeksi tiap entitas dimulai setelah tahun observasi terakhirnya sendiri
+    values, last = _align_right(wide.to_numpy(dtype=np.float64))
+
+    group_codes, n_groups = None, 0
+    if group_col is not None:
+        groups = df.drop_duplicates(id_col).set_index(id_col)[group_col].reindex(wide.index)
+        codes = pd.Categorical(groups)
+        group_codes, n_groups = codes.codes.clip(min=0), len(codes.categories)
+
+    bundle = fit_global(values, group_codes, n_groups, lags, windows, n_jobs, **params)
+    predicted = predict_recursive(bundle, values, horizon, group_codes)
+
+    history = df[[id_col, time_col, value_col]].rename(
+        columns={id_col: 'series_id', time_col: 'year', value_col: 'value'}
+    ).assign(kind='history')
+    forecast = pd.DataFrame({
+        'series_id': np.repeat(wide.index.to_numpy(), horizon),
+        'year': (years[last][:, None] + np.arange(1, horizon + 1)).ravel(),
+        'value': predicted.ravel(),
+        'kind': 'forecast',
+    })
+    forecast_df = pd.concat([history, forecast], ignore_index=True)[FORECAST_COLUMNS]
+    forecast_df['year'] = forecast_df['year'].astype('int64')
+    forecast_df['value'] = forecast_df['value'].astype('float64')
+    return forecast_df
@@ -0,0 +1,74 @@
+"""Benchmark & cek paritas fast path ARIMA(p,d,0) NumPy terhadap statsmodels.
+
+Jalankan dari root repo:  python benchmarks/bench_forecast.py --series 300
+Keluar dengan status 1 jika selisih forecast (dibagi simpangan baku selisih seri) melebihi --tolerance.
+Uji paritas koefisien yang lebih ketat ada di tests/test_fast_arima.py.
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+from fast_arima import forecast_batch  # noqa: E402
+
+
+def make_series(n_series, length, d, seed=0):
+    """Seri acak: random walk ber-drift (d=1) atau AR(1) stasioner (d=0)."""
+    rng = np.random.default_rng(seed)
+    noise = rng.normal(0, 1, (n_series, length))
+    if d == 1:
+        return np.cumsum(noise - 0.3, axis=1) + 80
+    values = np.zeros((n_series, length))
+    for t in range(1, length):
+        values[:, t] = 0.5 * values[:, t - 1] + noise[:, t]
+    return values + 50
+
+
+def statsmodels_forecast(values, order, steps):
+    from statsmodels.tsa.arima.model import ARIMA
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return np.array([ARIMA(series, order=order).fit().forecast(steps) for series in values])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--series', type=int, default=300)
+    parser.add_argument('--length', type=int, default=23)
+    parser.add_argument('--horizon', type=int, default=8)
+    parser.add_argument('--orders', nargs='+', default=['1,1,0', '2,1,0', '1,0,0', '2,0,0'])
+    parser.add_argument('--tolerance', type=float, default=0.005, help='selisih forecast maksimum (dalam simpangan baku)')
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'order':>9} {'fast (s)':>10} {'statsmodels (s)':>16} {'speedup':>8} {'fast ok':>8} {'max gap/sd':>13}")
+    for spec in args.orders:
+        order = tuple(int(part) for part in spec.split(','))
+        values = make_series(args.series, args.length, order[1])
+
+        start = time.perf_counter()
+        fast, ok = forecast_batch(values, order, args.horizon)
+        fast_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reference = statsmodels_forecast(values, order, args.horizon)
+        ref_time = time.perf_counter() - start
+
+        # Diskalakan dengan variasi seri, bukan levelnya: level besar tidak boleh menutupi selisih
+        scale = np.std(np.diff(values, axis=1), axis=1)[:, None]
+        rel_diff = np.max(np.abs(fast[ok] - reference[ok]) / scale[ok]) if ok.any() else np.nan
+        failed |= bool(rel_diff > args.tolerance)
+        print(f"{spec:>9} {fast_time:>10.4f} {ref_time:>16.2f} {ref_time / fast_time:>7.0f}x "
+              f"{ok.mean():>8.0%} {rel_diff:>13.4f}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
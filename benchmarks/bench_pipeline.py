@@ -0,0 +1,189 @@
+"""Benchmark per tahap pipeline (ingest, cleaning, agregasi, crossover, growth, forecast, figure).
+
+Jalankan dari root repo:  python benchmarks/bench_pipeline.py --rows 22000 1000000 --output bench.json
+Hasil disimpan sebagai JSON; --compare membandingkan dengan hasil commit lain dan keluar
+dengan status 1 jika ada tahap yang melambat melebihi --max-slowdown.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_data import FIRST_YEAR, LAST_YEAR, entity_names, synthetic_registry, write_energy_csv  # noqa: E402
+
+from aggregates import build_group_cube, cube_series  # noqa: E402
+from analysis import crossover_table, crossover_year, growth_table  # noqa: E402
+from chart_payload import optimize_figure  # noqa: E402
+from cleaning import (CRITICAL_COLUMNS, END_YEAR, KEY_COLUMNS, START_YEAR, assign_groups,  # noqa: E402
+                      clean_energy_frame, countries_for)
+from figures import FIGURE_BUILDERS  # noqa: E402
+from forecasting import forecast_many  # noqa: E402
+from ingest import cache_dir_for, read_energy_columns, stream_energy_columns  # noqa: E402
+from tensor_store import TensorStore  # noqa: E402
+
+STAGES = ['ingest_cold', 'ingest_stream', 'ingest_snapshot', 'cleaning', 'aggregation', 'crossover', 'growth',
+          'forecast_groups', 'forecast_entities', 'figures']
+DASHBOARD_GROUPS = ['G7', 'BRICS']
+STREAM_CHUNK_ROWS = 100_000
+
+
+def _clear_cache(file_path):
+    cache_dir = cache_dir_for(file_path)
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            os.remove(os.path.join(cache_dir, name))
+
+
+def dataset_path(data_dir, n_rows, nan_ratio, extra_columns, seed):
+    """CSV sintetis dipakai ulang antar run dengan parameter yang sama."""
+    name = f'owid-synthetic-{n_rows}-nan{nan_ratio:g}-x{extra_columns}-s{seed}.csv'
+    return os.path.join(data_dir, name)
+
+
+def run_pipeline(file_path, registry, repeat=1):
+    """Waktu terbaik (detik) per tahap untuk satu dataset."""
+    timings = {}
+
+    def timed(stage, func):
+        best, result = float('inf'), None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - start)
+        timings[stage] = best
+        return result
+
+    groups = list(registry)
+    countries = countries_for(groups, registry)
+
+    def ingest_cold():
+        _clear_cache(file_path)
+        return read_energy_columns(file_path, KEY_COLUMNS, countries, START_YEAR, END_YEAR)
+
+    timed('ingest_cold', ingest_cold)
+    timed('ingest_stream', lambda: stream_energy_columns(file_path, KEY_COLUMNS, countries, START_YEAR, END_YEAR,
+                                                         chunksize=STREAM_CHUNK_ROWS))
+    raw = timed('ingest_snapshot', lambda: read_energy_columns(file_path, KEY_COLUMNS, countries, START_YEAR, END_YEAR))
+    df = timed('cleaning', lambda: clean_energy_frame(raw.copy(), groups, interpolate_cols=['gdp'],
+                                                      dropna_cols=CRITICAL_COLUMNS, registry=registry))
+    cube = timed('aggregation', lambda: build_group_cube(df))
+    timed('crossover', lambda: crossover_table(cube, 'fossil_fuel_consumption', 'sum').summary())
+    timed('growth', lambda: growth_table(df))
+    timed('forecast_groups', lambda: forecast_many(cube_series(cube, 'fossil_share_energy', 'mean'),
+                                                   'fossil_share_energy'))
+    timed('forecast_entities', lambda: forecast_many(df, 'fossil_share_energy', id_col='country'))
+
+    # Figure dashboard dibangun dari seleksi G7 vs BRICS seperti di app.py
+    dashboard = df[df['country'].isin(countries_for(DASHBOARD_GROUPS, registry))]
+    dashboard = dashboard.assign(Group=assign_groups(dashboard['country'], DASHBOARD_GROUPS, registry))
+    dashboard_cube = build_group_cube(dashboard)
+    forecast_df, _ = forecast_many(cube_series(dashboard_cube, 'fossil_share_energy', 'mean'), 'fossil_share_energy')
+
+    def figures():
+        crossover = crossover_year(dashboard_cube, 'BRICS', 'G7')
+        inputs = {
+            'fossil_share_trend': (dashboard_cube,),
+            'fossil_absolute_trend': (dashboard_cube, crossover),
+            'renewable_growth': (TensorStore.from_frame(dashboard), 2012),
+            'energy_efficiency': (dashboard_cube,),
+            'low_carbon_share': (dashboard_cube,),
+            'fossil_share_forecast': (forecast_df,),
+        }
+        return [optimize_figure(FIGURE_BUILDERS[view](*args)).to_json() for view, args in inputs.items()]
+
+    timed('figures', figures)
+    return timings, {'clean_rows': len(df), 'groups': len(groups), 'entities_forecast': int(df['country'].nunique())}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, max_slowdown):
+    """Rasio waktu sekarang / baseline per (rows, tahap); mengembalikan daftar regresi."""
+    previous = {(run['rows'], run['nan_ratio']): run['stages'] for run in baseline['runs']}
+    regressions = []
+    print(f"\nvs {baseline['meta'].get('commit')}:")
+    print(f"{'rows':>10} {'stage':>18} {'before (s)':>11} {'now (s)':>9} {'ratio':>7}")
+    for run in results['runs']:
+        before = previous.get((run['rows'], run['nan_ratio']))
+        if before is None:
+            continue
+        for stage, seconds in run['stages'].items():
+            if stage not in before or before[stage] <= 0:
+                continue
+            ratio = seconds / before[stage]
+            flag = ' !' if ratio > max_slowdown else ''
+            print(f"{run['rows']:>10,} {stage:>18} {before[stage]:>11.3f} {seconds:>9.3f} {ratio:>6.2f}x{flag}")
+            if ratio > max_slowdown:
+                regressions.append((run['rows'], stage, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[22_000, 1_000_000])
+    parser.add_argument('--nan-ratio', type=float, default=0.2)
+    parser.add_argument('--extra-columns', type=int, default=0)
+    parser.add_argument('--blocs', type=int, default=20, help='jumlah blok sintetis selain GROUP_REGISTRY')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'energy-bench'))
+    parser.add_argument('--output', help='file JSON hasil benchmark')
+    parser.add_argument('--compare', help='file JSON hasil commit lain sebagai pembanding')
+    parser.add_argument('--max-slowdown', type=float, default=1.25)
+    args = parser.parse_args()
+    # Sama seperti dashboard: peringatan konvergensi ARIMA tidak relevan untuk pengukuran waktu
+    warnings.filterwarnings('ignore')
+
+    results = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'runs': [],
+    }
+
+    print(f"{'rows':>10} " + ' '.join(f'{stage:>17}' for stage in STAGES))
+    for n_rows in args.rows:
+        path = dataset_path(args.data_dir, n_rows, args.nan_ratio, args.extra_columns, args.seed)
+        if not os.path.exists(path):
+            write_energy_csv(path, n_rows, nan_ratio=args.nan_ratio, extra_columns=args.extra_columns, seed=args.seed)
+        entities = entity_names(round(n_rows / (LAST_YEAR - FIRST_YEAR + 1)))
+        timings, info = run_pipeline(path, synthetic_registry(entities, args.blocs), args.repeat)
+        results['runs'].append({'rows': n_rows, 'entities': len(entities), 'nan_ratio': args.nan_ratio,
+                                'extra_columns': args.extra_columns, **info, 'stages': timings})
+        print(f"{n_rows:>10,} " + ' '.join(f'{timings[stage]:>16.3f}s' for stage in STAGES))
+
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(results, fh, indent=2)
+        print(f"\nHasil disimpan di {args.output}")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            regressions = compare(results, json.load(fh), args.max_slowdown)
+        if regressions:
+            print(f"\n{len(regressions)} tahap melambat > {args.max_slowdown:.2f}x")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Laporan waktu import per section untuk app/app.py, dicek terhadap budget (untuk CI).
+
+Jalankan dari root repo:  python benchmarks/import_budget.py [--budget benchmarks/import_budget.json]
+Setiap pengukuran dilakukan di interpreter baru agar cache sys.modules tidak memengaruhi hasil.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.join(BENCH_DIR, '..', 'app')
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {app_dir!r})
+start = time.perf_counter()
+import streamlit
+streamlit_time = time.perf_counter() - start
+start = time.perf_counter()
+import app
+app_time = time.perf_counter() - start
+from lazy_imports import import_report, load_all
+load_all()
+report = import_report()
+report['sections'] = dict(startup_streamlit=streamlit_time, startup_app=app_time, **report['sections'])
+print(json.dumps(report))
+"""
+
+
+def measure(runs):
+    """Median waktu per section dari beberapa interpreter baru."""
+    samples = {}
+    modules = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(app_dir=os.path.abspath(APP_DIR))],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        report = json.loads(output.strip().splitlines()[-1])
+        modules = report['imports']
+        for section, seconds in report['sections'].items():
+            samples.setdefault(section, []).append(seconds)
+    medians = {section: sorted(values)[len(values) // 2] for section, values in samples.items()}
+    return medians, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget', default=os.path.join(BENCH_DIR, 'import_budget.json'))
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--json', action='store_true', help='cetak laporan sebagai JSON')
+    args = parser.parse_args()
+
+    with open(args.budget) as fh:
+        budget = json.load(fh)
+    sections, modules = measure(args.runs)
+
+    over = {s: t for s, t in sections.items() if s in budget and t > budget[s]}
+    if args.json:
+        print(json.dumps({'sections': sections, 'imports': modules, 'budget': budget, 'over_budget': over}, indent=2))
+    else:
+        print(f"{'section':<20} {'seconds':>8} {'budget':>8}")
+        for section, seconds in sections.items():
+            limit = budget.get(section)
+            flag = '  OVER' if section in over else ''
+            print(f"{section:<20} {seconds:>8.3f} {limit if limit is not None else '-':>8}{flag}")
+        for row in modules:
+            print(f"  {row['section']:<18} {row['module']:<35} {row['seconds']:.3f}s")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""Load test API lokal (app/api.py): requests/detik dan latensi dengan banyak koneksi keep-alive.
+
+Jalankan dari root repo, terhadap server yang sudah berjalan:
+    python benchmarks/load_test_api.py --url http://127.0.0.1:8765 --concurrency 32 --requests 5000
+atau server dijalankan di proses yang sama (port acak):
+    python benchmarks/load_test_api.py --data data/owid-energy-data.csv --conditional --gzip
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+from api import ApiServer  # noqa: E402
+
+DEFAULT_PATHS = [
+    '/api/series?metric=fossil_share_energy&stat=mean',
+    '/api/series?metric=fossil_fuel_consumption&stat=sum&group=BRICS',
+    '/api/growth?metric=solar_consumption&start=2012&n=10',
+    '/api/growth?metric=wind_consumption&by=cagr&n=5',
+    '/api/crossovers?leader=BRICS&laggard=G7',
+    '/api/forecast?group=G7',
+    '/api/forecast?group=BRICS&kind=forecast',
+    '/api/version',
+]
+
+
+async def _request(reader, writer, host, path, headers):
+    lines = [f'GET {path} HTTP/1.1', f'Host: {host}', *[f'{k}: {v}' for k, v in headers.items()]]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    response_headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        response_headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(response_headers.get('content-length', 0)))
+    return status, response_headers, len(body)
+
+
+async def _client(host, port, paths, counter, deadline_count, headers, conditional, results):
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    try:
+        i = 0
+        while True:
+            # Satu event loop: penghitung bersama tidak perlu lock
+            if counter['sent'] >= deadline_count:
+                return
+            counter['sent'] += 1
+            path = paths[i % len(paths)]
+            i += 1
+            request_headers = dict(headers)
+            if conditional and path in etags:
+                request_headers['If-None-Match'] = etags[path]
+            start = time.perf_counter()
+            status, response_headers, size = await _request(reader, writer, host, path, request_headers)
+            results.append((time.perf_counter() - start, status, size))
+            if 'etag' in response_headers:
+                etags[path] = response_headers['etag']
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, paths, n_requests, concurrency, headers, conditional):
+    counter = {'sent': 0}
+    results = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, paths, counter, n_requests, headers, conditional, results)
+        for _ in range(concurrency)
+    ))
+    return results, time.perf_counter() - start
+
+
+def report(results, elapsed, concurrency):
+    latencies = np.array([latency for latency, _, _ in results]) * 1000
+    statuses = Counter(status for _, status, _ in results)
+    total_bytes = sum(size for _, _, size in results)
+    print(f"{len(results):,} request dalam {elapsed:.2f}s dengan {concurrency} koneksi")
+    print(f"  throughput : {len(results) / elapsed:,.0f} req/s")
+    print(f"  latensi ms : p50 {np.percentile(latencies, 50):.2f}  p95 {np.percentile(latencies, 95):.2f}  "
+          f"p99 {np.percentile(latencies, 99):.2f}  max {latencies.max():.2f}")
+    print("  status     : " + ", ".join(f"{status}: {count:,}" for status, count in sorted(statuses.items())))
+    print(f"  body       : {total_bytes / max(1, len(results)):,.0f} byte/request rata-rata")
+
+
+async def _main_async(args):
+    headers = {}
+    if args.gzip:
+        headers['Accept-Encoding'] = 'gzip'
+    if args.arrow:
+        headers['Accept'] = 'application/vnd.apache.arrow.stream'
+
+    server_task = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        bound = asyncio.get_running_loop().create_future()
+        api = ApiServer(args.data, refresh_seconds=0)
+        server_task = asyncio.create_task(api.serve('127.0.0.1', 0, lambda server: bound.set_result(server)))
+        server = await bound
+        host, port = server.sockets[0].getsockname()[:2]
+
+    try:
+        # Pemanasan: isi cache respons server sebelum diukur
+        await run_load(host, port, DEFAULT_PATHS, len(DEFAULT_PATHS), 1, headers, False)
+        results, elapsed = await run_load(host, port, DEFAULT_PATHS, args.requests, args.concurrency,
+                                          headers, args.conditional)
+        report(results, elapsed, args.concurrency)
+    finally:
+        if server_task is not None:
+            server_task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='server yang sudah berjalan; default: jalankan app/api.py di proses ini')
+    parser.add_argument('--data', default='data/owid-energy-data.csv')
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--conditional', action='store_true', help='kirim If-None-Match (mengukur jalur 304)')
+    parser.add_argument('--gzip', action='store_true')
+    parser.add_argument('--arrow', action='store_true')
+    args = parser.parse_args()
+    asyncio.run(_main_async(args))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
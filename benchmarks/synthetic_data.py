@@ -0,0 +1,117 @@
+"""Generator dataset sintetis ber-skema owid-energy-data.csv untuk benchmark.
+
+Jalankan dari root repo:  python benchmarks/synthetic_data.py --rows 1000000 --output /tmp/owid-1m.csv
+Dari ~22 ribu baris (ukuran data asli) sampai 10 juta baris / ribuan entitas, dengan NaN yang bisa diatur.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+from cleaning import GROUP_REGISTRY  # noqa: E402
+
+FIRST_YEAR = 1900
+LAST_YEAR = 2022
+# Jumlah entitas yang ditulis per potongan CSV (memori generator tetap terbatas di 10 juta baris)
+ENTITIES_PER_CHUNK = 2000
+
+
+def entity_names(n_entities):
+    """Anggota blok di GROUP_REGISTRY lebih dulu (agar pipeline dashboard punya data), lalu 'Entity i'."""
+    members = list(dict.fromkeys(c for countries in GROUP_REGISTRY.values() for c in countries))
+    extra = [f'Entity {i}' for i in range(max(0, n_entities - len(members)))]
+    return (members + extra)[:n_entities]
+
+
+def synthetic_registry(entities, n_blocs):
+    """GROUP_REGISTRY + blok sintetis 'Bloc k' (entitas dibagi round-robin) untuk benchmark skala penuh."""
+    registry = {name: list(countries) for name, countries in GROUP_REGISTRY.items()}
+    members = set(c for countries in registry.values() for c in countries)
+    others = [e for e in entities if e not in members]
+    for k in range(n_blocs):
+        bloc = others[k::n_blocs]
+        if bloc:
+            registry[f'Bloc {k}'] = bloc
+    return registry
+
+
+def make_energy_frame(entities, first_year=FIRST_YEAR, last_year=LAST_YEAR, nan_ratio=0.2,
+                      extra_columns=0, seed=0):
+    """Frame entitas x tahun dengan tren halus + noise; NaN acak sebanyak `nan_ratio` per sel metrik."""
+    rng = np.random.default_rng(seed)
+    years = np.arange(first_year, last_year + 1, dtype=np.int16)
+    n_e, n_y = len(entities), len(years)
+    t = (years - first_year)[None, :] / max(1, n_y - 1)
+
+    def trend(base, growth, noise):
+        scale = rng.lognormal(np.log(base), 1.0, (n_e, 1))
+        rate = rng.normal(growth, abs(growth) + 0.5, (n_e, 1))
+        return scale * np.exp(rate * t) * (1 + rng.normal(0, noise, (n_e, n_y)))
+
+    fossil_share = 100 / (1 + np.exp(-(rng.normal(2, 1, (n_e, 1)) - rng.normal(1.5, 1, (n_e, 1)) * t)))
+    fossil_share = np.clip(fossil_share + rng.normal(0, 1, (n_e, n_y)), 0, 100)
+    population = trend(1e7, 1.0, 0.01)
+    gdp = trend(1e11, 2.5, 0.03)
+    fossil_consumption = trend(200, 1.5, 0.05)
+    metrics = {
+        'population': population,
+        'gdp': gdp,
+        'fossil_share_energy': fossil_share,
+        'low_carbon_share_energy': np.clip(100 - fossil_share - rng.uniform(0, 5, (n_e, n_y)), 0, 100),
+        'solar_consumption': trend(0.5, 4.0, 0.1),
+        'wind_consumption': trend(1.0, 3.5, 0.1),
+        'energy_per_gdp': trend(1.5, -0.8, 0.05),
+        'fossil_fuel_consumption': fossil_consumption,
+        'renewables_consumption': trend(20, 2.0, 0.05),
+    }
+    for i in range(extra_columns):
+        metrics[f'extra_metric_{i}'] = trend(10, 0.5, 0.1)
+
+    df = pd.DataFrame({
+        'country': np.repeat(np.asarray(entities, dtype=object), n_y),
+        'year': np.tile(years, n_e),
+        'iso_code': np.repeat([f'X{i:05d}' for i in range(n_e)], n_y),
+    })
+    for name, values in metrics.items():
+        values = values.astype(np.float32).ravel()
+        values[rng.random(values.size) < nan_ratio] = np.nan
+        df[name] = values
+    return df
+
+
+def write_energy_csv(path, n_rows, first_year=FIRST_YEAR, last_year=LAST_YEAR, nan_ratio=0.2,
+                     extra_columns=0, seed=0):
+    """Menulis CSV sintetis ~n_rows baris per potongan entitas; mengembalikan (baris, entitas)."""
+    n_years = last_year - first_year + 1
+    entities = entity_names(max(1, round(n_rows / n_years)))
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.tmp-{os.getpid()}'
+    for chunk_no, start in enumerate(range(0, len(entities), ENTITIES_PER_CHUNK)):
+        chunk = make_energy_frame(entities[start:start + ENTITIES_PER_CHUNK], first_year, last_year,
+                                  nan_ratio, extra_columns, seed + chunk_no)
+        chunk.to_csv(tmp_path, mode='w' if chunk_no == 0 else 'a', header=chunk_no == 0, index=False)
+    os.replace(tmp_path, path)
+    return len(entities) * n_years, len(entities)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=22_000)
+    parser.add_argument('--nan-ratio', type=float, default=0.2)
+    parser.add_argument('--first-year', type=int, default=FIRST_YEAR)
+    parser.add_argument('--extra-columns', type=int, default=0, help='kolom metrik tambahan (OWID asli ~130 kolom)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', required=True)
+    args = parser.parse_args()
+
+    rows, entities = write_energy_csv(args.output, args.rows, args.first_year, LAST_YEAR, args.nan_ratio,
+                                      args.extra_columns, args.seed)
+    print(f"{args.output}: {rows:,} baris, {entities:,} entitas")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Modul aplikasi ada di app/ dan saling mengimpor sebagai modul top-level (seperti saat streamlit run)."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+
+from cleaning import GROUP_REGISTRY, KEY_COLUMNS  # noqa: E402
+
+
+def make_owid_frame(first_year=1995, last_year=2022, nan_ratio=0.1, seed=0):
+    """Frame kecil ber-skema owid-energy-data.csv: semua anggota G7/BRICS + satu negara lain."""
+    rng = np.random.default_rng(seed)
+    countries = GROUP_REGISTRY['G7'] + GROUP_REGISTRY['BRICS'] + ['Indonesia']
+    years = np.arange(first_year, last_year + 1)
+    df = pd.DataFrame({
+        'country': np.repeat(countries, len(years)),
+        'year': np.tile(years, len(countries)),
+    })
+    for col in KEY_COLUMNS[2:]:
+        values = rng.lognormal(3, 1, len(df)).round(3)
+        if col in ('gdp', 'solar_consumption'):
+            values[rng.random(len(df)) < nan_ratio] = np.nan
+        df[col] = values
+    return df
+
+
+def write_csv(df, path):
+    """Tulis CSV dan majukan mtime: sidecar fingerprint tidak boleh tertukar antar versi file."""
+    previous = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+    df.to_csv(path, index=False)
+    mtime = max(os.stat(path).st_mtime_ns, previous + 10**6)
+    os.utime(path, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def energy_csv(tmp_path, monkeypatch):
+    """CSV sintetis di tmp_path/data; cache model & lapisan bersama diarahkan ke tmp_path."""
+    import model_store
+    import shared_data
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('ENERGY_MODEL_CACHE', str(tmp_path / 'models'))
+    monkeypatch.setenv('ENERGY_SHARED_CACHE', str(tmp_path / 'shared'))
+    monkeypatch.setattr(model_store, '_DEFAULT_STORE', None)
+    monkeypatch.setattr(shared_data, '_DEFAULT_LAYER', None)
+    os.makedirs(tmp_path / 'data')
+    path = str(tmp_path / 'data' / 'owid-energy-data.csv')
+    write_csv(make_owid_frame(), path)
+    return path
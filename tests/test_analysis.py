@@ -0,0 +1,27 @@
+import numpy as np
+
+from analysis import GROWTH_METRICS, growth_label, growth_table
+from cleaning import assign_groups
+from conftest import make_owid_frame
+
+
+def test_growth_table_matches_pandas_reference():
+    df = make_owid_frame(first_year=2005)
+    df['Group'] = assign_groups(df['country'], ['G7', 'BRICS'])
+    keys = ['country', 'Group']
+    base = df[df['year'] == 2012].groupby(keys)[GROWTH_METRICS].mean()
+    end = df[df['year'] == 2022].groupby(keys)[GROWTH_METRICS].mean()
+    expected = ((end - base).rename(columns=growth_label).reset_index()
+                .melt(id_vars=keys, var_name='Source', value_name='Growth_TWh').dropna())
+
+    growth = growth_table(df)
+    merged = expected.merge(growth, on=['country', 'Group', 'Source'], how='outer', validate='1:1')
+    assert len(merged) == len(expected) == len(growth)
+    np.testing.assert_allclose(merged['Growth_TWh_x'], merged['Growth_TWh_y'], rtol=1e-5)
+
+
+def test_growth_table_outside_data_range_is_empty():
+    df = make_owid_frame(first_year=2015).assign(Group='G7')
+    growth = growth_table(df)
+    assert growth.empty
+    assert list(growth.columns) == ['country', 'Group', 'Source', 'Growth_TWh']
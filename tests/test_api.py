@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import pytest
+
+import api
+from api import ApiServer
+
+
+@pytest.fixture
+def server(energy_csv):
+    server = ApiServer(energy_csv, refresh_seconds=0)
+    asyncio.run(server.load())
+    return server
+
+
+def get(server, target, **headers):
+    return asyncio.run(server.respond('GET', target, {k.replace('_', '-'): v for k, v in headers.items()}))
+
+
+@pytest.mark.parametrize('target', [
+    '/api/growth?n=0',
+    '/api/growth?n=-2',
+    '/api/growth?start=2012&end=2000',
+    '/api/crossovers?leader=Nope',
+    '/api/crossovers?laggard=Nope',
+])
+def test_invalid_params_are_rejected(server, target):
+    status, _, body = get(server, target)
+    assert status == 400
+    assert json.loads(body)['error']
+
+
+def test_gzip_etag_does_not_validate_identity_response(server):
+    status, headers, _ = get(server, '/api/forecast', accept_encoding='gzip')
+    assert status == 200 and headers['ETag'].endswith('-gz"')
+    assert get(server, '/api/forecast', accept_encoding='gzip', if_none_match=headers['ETag'])[0] == 304
+    assert get(server, '/api/forecast', if_none_match=headers['ETag'])[0] == 200
+
+
+def test_unexpected_error_is_answered_with_500(server, monkeypatch):
+    def broken(results, params):
+        raise RuntimeError('boom')
+
+    monkeypatch.setitem(api.ENDPOINTS, '/api/series', broken)
+
+    async def request():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'GET /api/series HTTP/1.1\r\nConnection: close\r\n\r\n')
+        reader.feed_eof()
+        sent = []
+
+        class Writer:
+            def write(self, data):
+                sent.append(data)
+
+            async def drain(self):
+                pass
+
+            def close(self):
+                pass
+
+        await server.handle(reader, Writer())
+        return b''.join(sent)
+
+    response = asyncio.run(request())
+    assert response.startswith(b'HTTP/1.1 500 Internal Server Error\r\n')
@@ -0,0 +1,20 @@
+import warnings
+
+import numpy as np
+from statsmodels.tsa.arima.model import ARIMA
+
+from backtest import predict_arima
+
+
+def test_arima_fallback_forecast_starts_after_origin():
+    rng = np.random.default_rng(0)
+    series = 50 + np.cumsum(rng.normal(1.0, 0.5, 20))
+    history = series[None].copy()
+    # Dua tahun terakhir kosong: statsmodels dilatih pada seri terpotong
+    history[0, -2:] = np.nan
+    predicted = predict_arima(history, 3, order=(1, 1, 0))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        expected = ARIMA(series[:-2], order=(1, 1, 0)).fit().forecast(5)[2:]
+    np.testing.assert_allclose(predicted[0], expected, rtol=1e-6)
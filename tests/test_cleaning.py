@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from cleaning import add_per_capita, clean_energy_frame, interpolate_by_entity
+
+
+def make_frame():
+    return pd.DataFrame({
+        'country': ['Japan', 'Japan', 'Japan', 'China', 'China'],
+        'year': [2000, 2001, 2002, 2000, 2001],
+        'gdp': [1.0, np.nan, 3.0, np.nan, 5.0],
+    })
+
+
+def test_interpolate_matches_groupby_transform():
+    df = make_frame()
+    expected = df.groupby('country')['gdp'].transform(lambda x: x.interpolate('linear'))
+    pd.testing.assert_series_equal(interpolate_by_entity(df, ['gdp'])['gdp'], expected)
+
+
+def test_interpolate_early_return_is_a_copy():
+    df = make_frame()
+    assert interpolate_by_entity(df, []) is not df
+    assert interpolate_by_entity(df.iloc[:0], ['gdp']) is not df
+
+
+def test_clean_energy_frame_does_not_mutate_input():
+    for interpolate_cols in [('gdp',), ()]:
+        df = make_frame()
+        before = df.copy()
+        out = clean_energy_frame(df, ['G7', 'BRICS'], interpolate_cols=interpolate_cols, dropna_cols=('gdp',))
+        pd.testing.assert_frame_equal(df, before)
+        assert list(out['Group'].astype(str).unique()) == ['G7', 'BRICS']
+
+
+def test_add_per_capita_does_not_mutate_input():
+    df = make_frame().assign(population=[1e6, 2e6, 4e6, 1e9, 1e9])
+    out = add_per_capita(df, 'gdp', 'gdp_per_capita', scale=1.0)
+    assert 'gdp_per_capita' not in df.columns
+    np.testing.assert_allclose(out['gdp_per_capita'], df['gdp'] / df['population'])
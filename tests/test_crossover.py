@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from crossover import CrossoverTable, find_crossovers
+from model_store import ModelStore
+
+
+def naive_crossovers(matrix, years, entities):
+    """Referensi loop: tanda selisih terakhir yang bukan NaN/0; catat setiap pergantian tanda."""
+    events = []
+    for i in range(len(entities)):
+        for j in range(i + 1, len(entities)):
+            previous = None
+            for t in range(len(years)):
+                diff = matrix[i, t] - matrix[j, t]
+                if np.isnan(diff) or diff == 0:
+                    continue
+                sign = np.sign(diff)
+                if previous is not None and sign != previous:
+                    leader, laggard = (entities[i], entities[j]) if sign > 0 else (entities[j], entities[i])
+                    events.append((leader, laggard, int(years[t])))
+                previous = sign
+    return sorted(events, key=lambda event: (event[2], event[0], event[1]))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_matches_naive_reference(seed):
+    rng = np.random.default_rng(seed)
+    # Nilai bulat kecil: banyak seri yang sama persis (selisih 0) pada tahun tertentu
+    matrix = rng.integers(0, 6, size=(6, 30)).astype(np.float32)
+    matrix[rng.random(matrix.shape) < 0.15] = np.nan
+    years = np.arange(1990, 2020)
+    entities = [f'E{i}' for i in range(6)]
+
+    table = CrossoverTable.from_matrix(matrix, years, entities)
+    got = list(table.events[['leader', 'laggard', 'year']].itertuples(index=False, name=None))
+    assert got == naive_crossovers(matrix, years, entities)
+
+
+def test_ties_and_gaps_do_not_create_crossings():
+    years = np.arange(2000, 2006)
+    matrix = np.array([
+        [1.0, 2.0, 2.0, np.nan, 3.0, 5.0],
+        [2.0, 1.0, 2.0, 9.0, 3.0, 4.0],
+    ])
+    events = find_crossovers(matrix, years, ['A', 'B'])
+    assert events.values.tolist() == [['A', 'B', 2001]]
+
+
+def test_queries():
+    years = np.arange(2000, 2005)
+    matrix = np.array([
+        [1.0, 3.0, 1.0, 3.0, 3.0],
+        [2.0, 2.0, 2.0, 2.0, 2.0],
+        [9.0, 9.0, 9.0, 9.0, 0.0],
+    ])
+    table = CrossoverTable.from_matrix(matrix, years, ['A', 'B', 'C'], metric='m')
+    assert table.first_overtake('A', 'B') == 2001
+    assert table.last_overtake('A', 'B') == 2003
+    assert table.first_overtake('B', 'A') == 2002
+    assert table.first_overtake('C', 'A') is None
+    assert set(table.involving('C')['leader']) == {'A', 'B'}
+
+    summary = table.summary().set_index(['a', 'b'])
+    assert summary.loc[('A', 'B'), 'crossings'] == 3
+    assert summary.loc[('A', 'B'), 'current_leader'] == 'A'
+    assert summary.loc[('A', 'C'), 'first_year'] == 2004
+
+
+def test_from_pivot_and_store_reuse(tmp_path):
+    pivot = pd.DataFrame({'G7': [5.0, 4.0, 3.0], 'BRICS': [1.0, 4.5, 6.0]}, index=[2000, 2001, 2002])
+    store = ModelStore(str(tmp_path))
+    first = CrossoverTable.from_pivot(pivot, 'm', store)
+    assert first.first_overtake('BRICS', 'G7') == 2001
+    again = CrossoverTable.from_pivot(pivot, 'm', store)
+    pd.testing.assert_frame_equal(first.events, again.events)
+    assert store.hits == 1
+
+
+def test_empty_inputs():
+    assert find_crossovers(np.zeros((1, 5)), np.arange(5), ['A']).empty
+    assert find_crossovers(np.zeros((2, 1)), np.arange(1), ['A', 'B']).empty
+    assert CrossoverTable(find_crossovers(np.zeros((2, 1)), [2000], ['A', 'B'])).summary().empty
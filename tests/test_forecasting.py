@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+
+import forecasting
+
+
+def test_get_pool_is_reused_for_same_worker_count():
+    try:
+        assert forecasting.get_pool(2) is forecasting.get_pool(2)
+    finally:
+        forecasting.shutdown_pool()
+
+
+def test_get_pool_per_worker_count_keeps_existing_pools_alive():
+    try:
+        first = forecasting.get_pool(1)
+        second = forecasting.get_pool(2)
+        assert second is not first
+        assert second._max_workers == 2
+        assert list(second.map(abs, [-1, -2])) == [1, 2]
+        # Pool lama masih dipegang pemanggil lain dan harus tetap menerima pekerjaan
+        assert list(first.map(abs, [-3])) == [3]
+        assert forecasting.get_pool(1) is first
+    finally:
+        forecasting.shutdown_pool()
+
+
+def test_statsmodels_warnings_do_not_leak_on_first_fit():
+    # Proses baru: statsmodels belum ter-import, sama seperti CLI batch/report/backtest
+    code = (
+        "import numpy as np, forecasting\n"
+        "y = np.cumsum(np.cumsum(np.random.default_rng(1).normal(0, 1, 12)))\n"
+        "forecasting._fit_arima(y, (1, 1, 0), 3)\n"
+    )
+    app_dir = os.path.dirname(forecasting.__file__)
+    result = subprocess.run([sys.executable, '-c', code], cwd=app_dir, capture_output=True, text=True, check=True)
+    assert 'Warning' not in result.stderr
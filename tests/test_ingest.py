@@ -0,0 +1,98 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ingest
+from cleaning import KEY_COLUMNS, countries_for
+from conftest import make_owid_frame, write_csv
+from ingest import MissingColumnsError, _parse_csv, read_energy_columns, stream_energy_columns
+
+COUNTRIES = countries_for(['G7', 'BRICS'])
+
+
+def canonical(df):
+    df = df.assign(country=df['country'].astype(str))
+    return df.sort_values(['country', 'year']).reset_index(drop=True)
+
+
+@pytest.mark.parametrize('chunksize', [1, 7, 100_000])
+def test_stream_matches_parse_for_annual_data(energy_csv, chunksize):
+    parsed = _parse_csv(energy_csv, KEY_COLUMNS, COUNTRIES, 2000, 2022)
+    streamed = stream_energy_columns(energy_csv, KEY_COLUMNS, COUNTRIES, 2000, 2022, chunksize=chunksize)
+    assert list(streamed.columns) == KEY_COLUMNS
+    assert streamed['year'].dtype == parsed['year'].dtype
+    pd.testing.assert_frame_equal(canonical(streamed), canonical(parsed))
+
+
+def test_stream_reduces_sub_annual_rows(tmp_path):
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('1999-07-01', '2001-12-01', freq='MS')
+    df = pd.DataFrame({
+        'country': np.repeat(['Japan', 'China', 'Atlantis'], len(dates)),
+        'date': np.tile(dates.strftime('%Y-%m-%d'), 3),
+        'solar_consumption': rng.random(3 * len(dates)),
+        'gdp': rng.random(3 * len(dates)),
+    })
+    df.loc[df.index % 5 == 0, 'gdp'] = np.nan
+    df.loc[(df['country'] == 'China') & df['date'].str.startswith('2001'), 'solar_consumption'] = np.nan
+    path = tmp_path / 'monthly.csv'
+    df.to_csv(path, index=False)
+
+    columns = ['country', 'year', 'solar_consumption', 'gdp']
+    out = stream_energy_columns(str(path), columns, ['Japan', 'China'], 2000, 2001, chunksize=5, period_col='date')
+
+    df['year'] = pd.to_datetime(df['date']).dt.year
+    subset = df[df['country'].isin(['Japan', 'China']) & df['year'].between(2000, 2001)]
+    grouped = subset.groupby(['country', 'year'])
+    expected = pd.DataFrame({
+        'solar_consumption': grouped['solar_consumption'].sum(min_count=1),
+        'gdp': grouped['gdp'].mean(),
+    }).reset_index()
+    expected['year'] = expected['year'].astype('int16')
+    expected[['solar_consumption', 'gdp']] = expected[['solar_consumption', 'gdp']].astype('float32')
+    pd.testing.assert_frame_equal(canonical(out), canonical(expected[columns]))
+    assert np.isnan(out.loc[(out['country'] == 'China') & (out['year'] == 2001), 'solar_consumption']).all()
+
+
+def test_stream_reducer_override(tmp_path):
+    df = pd.DataFrame({'country': ['Japan'] * 3, 'year': [2000, 2000, 2001], 'gdp': [1.0, 3.0, 5.0]})
+    path = tmp_path / 'dupes.csv'
+    df.to_csv(path, index=False)
+    out = stream_energy_columns(str(path), ['country', 'year', 'gdp'], ['Japan'], 2000, 2001,
+                                chunksize=2, reducers={'gdp': 'sum'})
+    assert out['gdp'].tolist() == [4.0, 5.0]
+
+
+def test_stream_missing_columns(energy_csv):
+    with pytest.raises(MissingColumnsError) as excinfo:
+        stream_energy_columns(energy_csv, ['country', 'year', 'nope'], COUNTRIES, 2000, 2022)
+    assert excinfo.value.missing_cols == ['nope']
+
+
+def test_large_files_stream_automatically_and_use_own_snapshot(energy_csv, monkeypatch):
+    parsed = read_energy_columns(energy_csv, KEY_COLUMNS, COUNTRIES, 2000, 2022)
+    monkeypatch.setattr(ingest, 'STREAM_THRESHOLD_BYTES', 0)
+    monkeypatch.setattr(ingest, 'STREAM_CHUNK_ROWS', 50)
+    streamed = read_energy_columns(energy_csv, KEY_COLUMNS, COUNTRIES, 2000, 2022)
+    pd.testing.assert_frame_equal(canonical(streamed), canonical(parsed))
+
+    snapshots = sorted(name for name in os.listdir(ingest.cache_dir_for(energy_csv)) if name.endswith('.parquet'))
+    # Hasil streaming punya snapshot sendiri (spec key berakhiran 's'), terpisah dari hasil parse biasa
+    assert len(snapshots) == 2
+    assert sum(name.endswith('s.parquet') for name in snapshots) == 1
+
+    # Snapshot dipakai ulang: CSV tidak dibaca lagi
+    monkeypatch.setattr(ingest, 'stream_energy_columns', None)
+    pd.testing.assert_frame_equal(read_energy_columns(energy_csv, KEY_COLUMNS, COUNTRIES, 2000, 2022), streamed)
+
+
+def test_snapshot_follows_csv_changes(energy_csv):
+    before = read_energy_columns(energy_csv, KEY_COLUMNS, COUNTRIES, 2000, 2022)
+    changed = make_owid_frame()
+    changed.loc[changed['country'] == 'Japan', 'gdp'] = 1.0
+    write_csv(changed, energy_csv)
+    after = read_energy_columns(energy_csv, KEY_COLUMNS, COUNTRIES, 2000, 2022)
+    assert (after.loc[after['country'] == 'Japan', 'gdp'] == 1.0).all()
+    assert not before.equals(after)
@@ -0,0 +1,50 @@
+import os
+import pickle
+import sys
+
+import numpy as np
+import pytest
+
+from model_store import ModelStore, model_key
+
+
+class _Gone:
+    pass
+
+
+def test_put_get_roundtrip(tmp_path):
+    store = ModelStore(str(tmp_path))
+    key = model_key('arima', {'order': [1, 1, 0]}, np.arange(5.0))
+    assert store.get(key) is None
+    store.put(key, {'mape': 1.5})
+    assert store.get(key) == {'mape': 1.5}
+    assert (store.hits, store.misses) == (1, 1)
+
+
+def test_key_depends_on_series_content():
+    params = {'order': [1, 1, 0]}
+    assert model_key('arima', params, np.arange(5.0)) != model_key('arima', params, np.arange(1.0, 6.0))
+
+
+@pytest.mark.parametrize('payload', [b'not a pickle', b''])
+def test_corrupt_entry_is_a_miss_and_removed(tmp_path, payload):
+    store = ModelStore(str(tmp_path))
+    path = store._path('ab' * 32)
+    os.makedirs(os.path.dirname(path))
+    with open(path, 'wb') as fh:
+        fh.write(payload)
+    assert store.get('ab' * 32, 'default') == 'default'
+    assert store.misses == 1
+    assert not os.path.exists(path)
+
+
+def test_entry_from_older_code_is_a_miss(tmp_path, monkeypatch):
+    store = ModelStore(str(tmp_path))
+    store.put('cd' * 32, _Gone())
+    # Kelas yang dipickle sudah tidak ada lagi -> AttributeError saat unpickle
+    monkeypatch.delattr(sys.modules[__name__], '_Gone')
+    with pytest.raises(AttributeError):
+        with open(store._path('cd' * 32), 'rb') as fh:
+            pickle.load(fh)
+    assert store.get('cd' * 32) is None
+    assert not os.path.exists(store._path('cd' * 32))
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cleaning import assign_groups
+from conftest import make_owid_frame
+from moments import CORR_METRICS, Moments, YearMoments, rolling_mean_std, rolling_moments
+from tensor_store import TensorStore
+
+METRICS = ['a', 'b', 'c']
+ATOL = 1e-9
+
+
+def random_values(n_batch=4, n_years=30, seed=0, nan_ratio=0.2):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0, 1, (n_batch, n_years, len(METRICS)))
+    values[..., 1] += 2 * values[..., 0]
+    # Level besar (seperti population): shift per metrik harus menjaga presisi selisih jumlah kuadrat
+    values[..., 2] = values[..., 2] * 10 + 1e6
+    values[rng.random(values.shape) < nan_ratio] = np.nan
+    return values
+
+
+def frame(values):
+    return pd.DataFrame(values.reshape(-1, values.shape[-1]), columns=METRICS)
+
+
+def test_single_batch_matches_pandas():
+    values = random_values(n_batch=1)
+    state = Moments.from_values(values, METRICS)
+    df = frame(values)
+    np.testing.assert_allclose(state.corr()[0], df.corr().to_numpy(), atol=ATOL)
+    np.testing.assert_allclose(state.cov()[0], df.cov().to_numpy(), rtol=1e-7, atol=ATOL)
+    np.testing.assert_allclose(state.mean()[0], df.mean().to_numpy(), rtol=1e-12)
+    np.testing.assert_allclose(state.std()[0], df.std().to_numpy(), rtol=1e-7)
+    pd.testing.assert_frame_equal(state.corr_frame(), df.corr(), atol=ATOL)
+
+
+def test_min_periods_and_empty_pairs():
+    values = np.array([[[1.0, np.nan], [2.0, 5.0], [4.0, np.nan]]])
+    state = Moments.from_values(values, ['x', 'y'])
+    corr = state.corr()[0]
+    assert np.isnan(corr[0, 1]) and np.isnan(corr[1, 1])
+    assert corr[0, 0] == pytest.approx(1.0)
+    np.testing.assert_array_equal(np.isnan(state.corr(min_periods=4)[0]), np.ones((2, 2), dtype=bool))
+
+
+def test_grouped_and_total_equal_pooled_data():
+    values = random_values(n_batch=6, seed=1)
+    groups = ['G7', 'BRICS', 'G7', 'BRICS', 'G7', 'G7']
+    state = Moments.from_values(values, METRICS)
+    grouped = state.grouped(groups)
+    assert grouped.labels == ['G7', 'BRICS']
+    for label in grouped.labels:
+        rows = [i for i, group in enumerate(groups) if group == label]
+        np.testing.assert_allclose(grouped.corr_frame(label).to_numpy(), frame(values[rows]).corr().to_numpy(), atol=ATOL)
+    np.testing.assert_allclose(state.total().corr()[0], frame(values).corr().to_numpy(), atol=ATOL)
+
+
+def test_add_then_remove_restores_state():
+    values = random_values(seed=2)
+    state = Moments.from_values(values[:, :20], METRICS)
+    reference = state.copy()
+    state.add(values[:, 20:]).remove(values[:, 20:])
+    for got, expected in zip(state.parts, reference.parts):
+        np.testing.assert_allclose(got, expected, atol=1e-8)
+
+
+def test_rolling_moments_match_window_corr():
+    values = random_values(n_batch=2, seed=3)
+    window = 8
+    ends = []
+    # Objek Moments yang sama diperbarui in-place: dibandingkan di setiap langkah
+    for end, state in rolling_moments(values, window, METRICS):
+        ends.append(end)
+        for b in range(values.shape[0]):
+            expected = frame(values[b:b + 1, end - window + 1:end + 1]).corr().to_numpy()
+            np.testing.assert_allclose(state.corr()[b], expected, atol=1e-7)
+    assert ends == list(range(window - 1, values.shape[1]))
+
+
+def test_rolling_mean_std_matches_pandas():
+    values = random_values(n_batch=2, seed=4)
+    window = 5
+    mean, std = rolling_mean_std(values, window)
+    for b in range(values.shape[0]):
+        rolling = frame(values[b:b + 1]).rolling(window, min_periods=1)
+        expected_mean, expected_std = rolling.mean().to_numpy(), rolling.std().to_numpy()
+        assert np.isnan(mean[b, :window - 1]).all()
+        np.testing.assert_allclose(mean[b, window - 1:], expected_mean[window - 1:], rtol=1e-9)
+        np.testing.assert_allclose(std[b, window - 1:], expected_std[window - 1:], rtol=1e-6, atol=1e-9)
+
+
+@pytest.fixture
+def store():
+    df = make_owid_frame(first_year=2000)
+    df['Group'] = assign_groups(df['country'], ['G7', 'BRICS'])
+    df = df[df['Group'] != 'Other'].reset_index(drop=True)
+    return TensorStore.from_frame(df)
+
+
+def store_frame(store, rows=slice(None), years=slice(None)):
+    values = store.values[rows, years][:, :, [store.metric_index[m] for m in CORR_METRICS]].astype(np.float64)
+    return pd.DataFrame(values.reshape(-1, len(CORR_METRICS)), columns=CORR_METRICS)
+
+
+@pytest.mark.parametrize('start, end', [(None, None), (2005, 2015), (2010, 2010), (2021, 2022)])
+def test_year_moments_window_matches_corr(store, start, end):
+    year_moments = YearMoments.from_store(store, CORR_METRICS)
+    years = slice(None if start is None else start - 2000, None if end is None else end - 2000 + 1)
+    window = year_moments.window(start, end)
+    for label in year_moments.labels:
+        rows = np.flatnonzero(store.groups == label)
+        expected = store_frame(store, rows, years).corr(min_periods=2).to_numpy()
+        np.testing.assert_allclose(window.corr_frame(label).to_numpy(), expected, atol=1e-7)
+    pooled = window.total().corr()[0]
+    np.testing.assert_allclose(pooled, store_frame(store, years=years).corr().to_numpy(), atol=1e-7)
+
+
+def test_year_moments_append_year_equals_rebuild(store):
+    last = len(store.years) - 1
+    head = TensorStore(store.values[:, :last], store.entities, store.years[:last], store.metrics, store.groups)
+    year_moments = YearMoments.from_store(head, CORR_METRICS)
+
+    codes = pd.factorize(pd.Series(store.groups, dtype=object))[0]
+    latest = store.values[:, last][:, [store.metric_index[m] for m in CORR_METRICS]].astype(np.float64)
+    year_moments.append_year(int(store.years[last]), latest, codes)
+    rebuilt = YearMoments.from_store(store, CORR_METRICS)
+
+    assert list(year_moments.years) == list(rebuilt.years)
+    np.testing.assert_allclose(year_moments.window(2010, 2022).corr(), rebuilt.window(2010, 2022).corr(), atol=1e-7)
+
+
+def test_year_moments_append_year_to_empty_prefix(store):
+    empty = TensorStore(store.values[:, :0], store.entities, store.years[:0], store.metrics, store.groups)
+    year_moments = YearMoments.from_store(empty, CORR_METRICS)
+    codes = pd.factorize(pd.Series(store.groups, dtype=object))[0]
+    for t, year in enumerate(store.years):
+        latest = store.values[:, t][:, [store.metric_index[m] for m in CORR_METRICS]].astype(np.float64)
+        year_moments.append_year(int(year), latest, codes)
+    rebuilt = YearMoments.from_store(store, CORR_METRICS)
+    assert list(year_moments.years) == list(rebuilt.years)
+    # Shift berbeda (0 untuk store kosong): bandingkan statistik, bukan jumlah mentah
+    np.testing.assert_allclose(year_moments.window(2005, 2022).corr(), rebuilt.window(2005, 2022).corr(), atol=1e-6)
+
+
+def test_year_moments_skip_entities_without_group(store):
+    groups = np.asarray(store.groups, dtype=object).copy()
+    groups[0] = None
+    year_moments = YearMoments.from_store(store, CORR_METRICS, groups=groups)
+    assert year_moments.labels == [g for g in pd.unique(pd.Series(groups, dtype=object)) if g is not None]
+    for label in year_moments.labels:
+        rows = np.flatnonzero(groups == label)
+        expected = store_frame(store, rows).corr(min_periods=2).to_numpy()
+        np.testing.assert_allclose(year_moments.window().corr_frame(label).to_numpy(), expected, atol=1e-7)
+
+
+@pytest.mark.parametrize('start, end', [(2015, 2010), (2030, 2035), (1980, 1990)])
+def test_year_moments_window_rejects_invalid_range(store, start, end):
+    with pytest.raises(ValueError):
+        YearMoments.from_store(store, CORR_METRICS).window(start, end)
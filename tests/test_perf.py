@@ -0,0 +1,82 @@
+import threading
+import tracemalloc
+
+import pytest
+
+import perf
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(perf, '_ENABLED', True)
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    perf.reset()
+    yield
+    perf.reset()
+    if started:
+        tracemalloc.stop()
+
+
+def by_stage():
+    return {record['stage']: record for record in perf.records()}
+
+
+def test_disabled_stage_is_shared_null_context(monkeypatch):
+    monkeypatch.setattr(perf, '_ENABLED', False)
+    assert perf.stage('a') is perf.stage('b')
+    assert not hasattr(perf, 'enable')
+
+
+def test_nested_peak_and_cache_miss(enabled):
+    with perf.stage('outer', cached=True):
+        with perf.stage('inner'):
+            block = bytearray(4 * 2**20)
+            del block
+        perf.note_cache_miss()
+    records = by_stage()
+    assert records['inner']['peak_bytes'] >= 3 * 2**20
+    assert records['outer']['peak_bytes'] >= records['inner']['peak_bytes']
+    assert records['outer']['cache'] == 'miss'
+    assert records['inner']['cache'] is None
+    assert not records['outer']['overlap'] and not records['inner']['overlap']
+
+
+def test_concurrent_stages_are_flagged_and_keep_their_peak(enabled):
+    entered, release = threading.Event(), threading.Event()
+
+    def other_session():
+        with perf.stage('other'):
+            block = bytearray(8 * 2**20)
+            entered.set()
+            release.wait(5)
+            del block
+
+    thread = threading.Thread(target=other_session)
+    thread.start()
+    entered.wait(5)
+    # Tahap di thread ini tidak boleh me-reset puncak milik tahap yang sedang berjalan di thread lain
+    with perf.stage('mine'):
+        pass
+    release.set()
+    thread.join()
+
+    records = by_stage()
+    assert records['mine']['overlap'] and records['other']['overlap']
+    assert records['other']['peak_bytes'] >= 7 * 2**20
+    summary = {row['stage']: row for row in perf.summary()}
+    assert summary['mine']['overlapped'] == 1
+
+    with perf.stage('alone'):
+        pass
+    assert not by_stage()['alone']['overlap']
+
+
+def test_openmetrics_lists_each_stage(enabled):
+    with perf.stage('load', cached=True):
+        pass
+    text = perf.openmetrics({'energy_extra': 3})
+    assert 'energy_stage_seconds_count{stage="load"} 1' in text
+    assert 'energy_stage_cache_total{stage="load",result="hit"} 1' in text
+    assert text.endswith('# EOF\n')
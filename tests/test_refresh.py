@@ -0,0 +1,152 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import refresh as refresh_module
+from aggregates import build_group_cube
+from analysis import load_clean_data
+from conftest import make_owid_frame, write_csv
+from refresh import (DatasetDiff, canonical, clean_frame, read_manifest, refresh, refresh_status,
+                     served_version)
+from shared_data import DASHBOARD_GROUPS, frame_to_cube, shared_layer, warm_up
+
+
+@pytest.fixture(autouse=True)
+def background_state(monkeypatch):
+    monkeypatch.setattr(refresh_module, '_BACKGROUND', {
+        'thread': None, 'last_report': None, 'error': None, 'failed_version': None, 'failed_at': None,
+    })
+
+
+def wait_for_background(timeout=60):
+    thread = refresh_module._BACKGROUND['thread']
+    if thread is not None:
+        thread.join(timeout)
+        assert not thread.is_alive()
+
+
+def assert_matches_full_rebuild(file_path, version):
+    full = canonical(load_clean_data(file_path, DASHBOARD_GROUPS))
+    incremental = clean_frame(file_path, version)
+    pd.testing.assert_frame_equal(incremental.reset_index(drop=True), full, check_categorical=False)
+    cube = frame_to_cube(shared_layer().get_frame(version, 'group_cube', None))
+    pd.testing.assert_frame_equal(cube, build_group_cube(full), check_index_type=False)
+
+
+def edit_cells(df):
+    df = df.copy()
+    df.loc[(df['country'] == 'China') & (df['year'] >= 2021), 'fossil_fuel_consumption'] *= 1.1
+    # NaN di tengah seri gdp: interpolasi Japan berubah untuk tahun-tahun di sekitarnya
+    df.loc[(df['country'] == 'Japan') & (df['year'] == 2010), 'gdp'] = np.nan
+    return df
+
+
+def drop_row(df):
+    return df[~((df['country'] == 'Canada') & (df['year'] == 2022))]
+
+
+def test_dataset_diff_cells_and_rows():
+    old = make_owid_frame(first_year=2020)
+    new = drop_row(edit_cells(old))
+    new = pd.concat([new, old.iloc[:1].assign(country='Mexico')], ignore_index=True)
+    diff = DatasetDiff.between(old, new)
+    # Japan 2010 di luar rentang frame (2020-2022); hanya sel China yang berubah
+    assert set(diff.cells['column']) == {'fossil_fuel_consumption'}
+    assert len(diff.cells) == 2
+    assert diff.removed.values.tolist() == [['Canada', 2022]]
+    assert diff.added.values.tolist() == [['Mexico', 2020]]
+    assert diff.entities() == ['Canada', 'China', 'Mexico']
+    assert DatasetDiff.between(old, old).empty()
+
+
+@pytest.mark.parametrize('modify', [edit_cells, drop_row, lambda df: drop_row(edit_cells(df))])
+def test_incremental_refresh_matches_full_rebuild(energy_csv, modify):
+    first = served_version(energy_csv)
+    assert refresh(energy_csv)['status'] == 'unchanged'
+
+    write_csv(modify(make_owid_frame()), energy_csv)
+    report = refresh(energy_csv)
+    assert report['status'] == 'incremental'
+    assert report['old_version'] == first[:16]
+    assert report['cube_cells_recomputed'] < report['cube_cells_total']
+
+    version = read_manifest(energy_csv)['version']
+    assert version != first
+    assert_matches_full_rebuild(energy_csv, version)
+
+
+def test_warm_up_publishes_through_refresh(energy_csv):
+    result = warm_up(energy_csv)
+    version = read_manifest(energy_csv)['version']
+    assert result['dataset_version'] == version
+    # Satu penulis untuk artefak (versi, "clean"): urutan kanonik seperti refresh
+    assert_matches_full_rebuild(energy_csv, version)
+
+
+def test_removed_rows_can_be_added_back(energy_csv):
+    write_csv(drop_row(make_owid_frame()), energy_csv)
+    served_version(energy_csv)
+    write_csv(make_owid_frame(), energy_csv)
+    report = refresh(energy_csv)
+    assert report['rows_added'] == 1 and report['entities'] == ['Canada']
+    assert_matches_full_rebuild(energy_csv, read_manifest(energy_csv)['version'])
+
+
+def test_background_refresh_serves_old_version_until_swap(energy_csv):
+    first = served_version(energy_csv)
+    write_csv(edit_cells(make_owid_frame()), energy_csv)
+    assert served_version(energy_csv) == first
+    wait_for_background()
+    status = refresh_status()
+    assert status['error'] is None and status['last_report']['status'] == 'incremental'
+    assert served_version(energy_csv) != first
+
+
+def test_failed_background_refresh_is_retried_when_file_changes(energy_csv):
+    first = served_version(energy_csv)
+    # CSV tersalin setengah: kolom wajib hilang
+    write_csv(make_owid_frame().drop(columns=['gdp']), energy_csv)
+    assert served_version(energy_csv) == first
+    wait_for_background()
+    assert 'MissingColumnsError' in refresh_status()['error']
+
+    # File yang sama tidak dicoba ulang sebelum RETRY_SECONDS
+    served_version(energy_csv)
+    assert not refresh_status()['running']
+    assert 'MissingColumnsError' in refresh_status()['error']
+
+    write_csv(edit_cells(make_owid_frame()), energy_csv)
+    assert served_version(energy_csv) == first
+    wait_for_background()
+    assert refresh_status()['error'] is None
+    assert served_version(energy_csv) != first
+    assert_matches_full_rebuild(energy_csv, read_manifest(energy_csv)['version'])
+
+
+def test_failed_refresh_is_retried_after_backoff(energy_csv, monkeypatch):
+    served_version(energy_csv)
+    write_csv(make_owid_frame().drop(columns=['gdp']), energy_csv)
+    served_version(energy_csv)
+    wait_for_background()
+    failed_at = refresh_module._BACKGROUND['failed_at']
+
+    monkeypatch.setattr(refresh_module, 'RETRY_SECONDS', 0)
+    time.sleep(0.01)
+    served_version(energy_csv)
+    wait_for_background()
+    assert refresh_module._BACKGROUND['failed_at'] > failed_at
+
+
+def test_reverting_the_file_clears_the_error(energy_csv):
+    original = make_owid_frame()
+    first = served_version(energy_csv)
+    write_csv(original.drop(columns=['gdp']), energy_csv)
+    served_version(energy_csv)
+    wait_for_background()
+    assert refresh_status()['error']
+
+    write_csv(original, energy_csv)
+    assert served_version(energy_csv) == first
+    assert refresh_status()['error'] is None
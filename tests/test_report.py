@@ -0,0 +1,15 @@
+import report
+
+
+def test_raster_pool_honours_max_workers_per_call():
+    try:
+        first = report._get_raster_pool(1)
+        second = report._get_raster_pool(2)
+        assert second is not first
+        assert (first._max_workers, second._max_workers) == (1, 2)
+        assert report._get_raster_pool(1) is first
+        report._reset_raster_pool(2)
+        assert report._get_raster_pool(1) is first
+        assert report._get_raster_pool(2) is not second
+    finally:
+        report._reset_raster_pool()